@@ -27,6 +27,23 @@ class EnvLoader:
     def llm_model(self) -> str:
         return os.getenv("LLM_MODEL", "gpt-4o-mini")
 
+    @property
+    def llm_fast_model(self) -> str:
+        # Cheaper model for simple edits; defaults to the main model
+        return os.getenv("LLM_FAST_MODEL", self.llm_model)
+
+    # Resource allocation similarity cache (disabled unless a threshold is set)
+    @property
+    def resource_semantic_cache_threshold(self) -> float:
+        try:
+            return float(os.getenv("RESOURCE_SEMANTIC_CACHE_THRESHOLD", "0") or 0)
+        except ValueError:
+            return 0.0
+
+    @property
+    def resource_semantic_cache_path(self) -> str:
+        return os.getenv("RESOURCE_SEMANTIC_CACHE_PATH", "")
+
     # LangSmith / LangChain tracing
     @property
     def langsmith_api_key(self) -> str:
@@ -1,17 +1,33 @@
 """Centralized LLM configuration for the agents package (no Django).
 
 Reads config via `agents.config.EnvLoader` and exposes a shared `llm` instance
-plus a `get_llm` constructor.
+plus a `get_llm` constructor. All clients share pooled HTTP/2 connections so
+parallel agent calls reuse warm TCP/TLS sessions.
 """
 
 import os
 from typing import Optional
 
+import httpx
 from langchain_openai import ChatOpenAI
 from agents.config import env
 
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+_HTTP_TIMEOUT = 180.0
 
-def get_llm(model: Optional[str] = None, temperature: float = 0.3, max_tokens: int = 4000) -> ChatOpenAI:
+# Shared connection pools for every ChatOpenAI instance in the process
+http_client = httpx.Client(limits=_HTTP_LIMITS, http2=True, timeout=_HTTP_TIMEOUT)
+http_async_client = httpx.AsyncClient(
+    limits=_HTTP_LIMITS, http2=True, timeout=_HTTP_TIMEOUT
+)
+
+
+def get_llm(
+    model: Optional[str] = None,
+    temperature: float = 0.3,
+    max_tokens: int = 4000,
+    streaming: bool = False,
+) -> ChatOpenAI:
     api_key = env.openai_api_key
     # We intentionally allow empty key here; downstream calls will fail with a
     # clearer OpenAI error if not set. Tests validate presence earlier.
@@ -19,13 +35,23 @@ def get_llm(model: Optional[str] = None, temperature: float = 0.3, max_tokens: i
         model=model or env.llm_model,
         api_key=api_key,
         temperature=temperature,
-        streaming=False,
+        # Enable to receive per-token callbacks (on_llm_new_token)
+        streaming=streaming,
         max_tokens=max_tokens,
         request_timeout=180,
+        http_client=http_client,
+        http_async_client=http_async_client,
     )
 
 
 # Default shared instance used by handlers when not overridden
 llm = get_llm()
 
+# Cheaper instance for simple edits (same as `llm` unless LLM_FAST_MODEL is set)
+llm_fast = (
+    get_llm(model=env.llm_fast_model)
+    if env.llm_fast_model != env.llm_model
+    else llm
+)
+
 
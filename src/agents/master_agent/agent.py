@@ -7,6 +7,7 @@ The Master Agent is the central orchestrator that:
 - Coordinates sub-agent execution
 """
 
+import asyncio
 import json
 import re
 from typing import Any, Dict, List, Optional
@@ -43,6 +44,12 @@ class MasterAgent:
     display_name: str = "Master Agent"
     # Section identifiers this agent produces in the state
     section_ids: List[str] = []  # Master agent doesn't produce sections directly
+    # Bump when prompts/handlers change so cached outputs are invalidated
+    version: str = "1"
+    # State keys that never influence an agent's output
+    volatile_state_keys: tuple = ("llm", "llm_fast", "session", "cache_bust")
+    # State keys this agent reads; None means "everything but volatile keys"
+    cache_input_keys: Optional[tuple] = None
 
     def __init__(
         self, llm: Any = None, settings: Optional[Dict] = None, session: Any = None
@@ -135,6 +142,70 @@ class MasterAgent:
 
         return new_state
 
+    def get_cache_inputs(self, state: Dict) -> Dict:
+        """Get the part of state that determines this agent's output.
+
+        Used to build the pipeline's output cache key. Sub-agents narrow the
+        key by setting ``cache_input_keys`` to the state keys they read.
+
+        Args:
+            state: Prepared state dictionary
+
+        Returns:
+            State subset used as the cache key input
+        """
+        if self.cache_input_keys is not None:
+            return {key: state.get(key) for key in self.cache_input_keys}
+        return {
+            key: value
+            for key, value in state.items()
+            if key not in self.volatile_state_keys
+        }
+
+    def build_prompt(self, state: Dict) -> Any:
+        """Build the single LLM input for this agent, for batched execution.
+
+        Agents whose work is one prompt -> one LLM call can implement this
+        together with ``parse_response`` so pipelines can batch their calls;
+        pipelines only batch agents that override both (see
+        ``supports_batching``).
+
+        Args:
+            state: Prepared state dictionary
+
+        Returns:
+            Prompt value to send to the LLM, or None if batching is unsupported
+        """
+        return None
+
+    def parse_response(self, state: Dict, response: Any) -> Dict:
+        """Turn the LLM response for ``build_prompt`` into the updated state.
+
+        Args:
+            state: Prepared state dictionary the prompt was built from
+            response: LLM response message
+
+        The default ignores the response and runs the agent normally, so an
+        agent that overrides only ``build_prompt`` still produces a correct
+        result instead of failing after the batched call.
+
+        Returns:
+            Updated state dictionary
+        """
+        return self.run(state)
+
+    def supports_batching(self) -> bool:
+        """Check whether this agent overrides both batching hooks.
+
+        Returns:
+            True if ``build_prompt`` and ``parse_response`` are both overridden
+        """
+        cls = type(self)
+        return (
+            cls.build_prompt is not MasterAgent.build_prompt
+            and cls.parse_response is not MasterAgent.parse_response
+        )
+
     def plan(self, state: Dict) -> Dict:
         """Plan steps prior to execution.
 
@@ -168,7 +239,7 @@ class MasterAgent:
         """
         return state
 
-    def run(self, state: Dict) -> Dict:
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:
         """Execute the agent and return an updated state.
 
         The master agent routes requests but doesn't directly produce content.
@@ -176,6 +247,8 @@ class MasterAgent:
 
         Args:
             state: Current state dictionary
+            config: Optional runnable config forwarded to LLM calls
+                (e.g. callbacks for token streaming)
 
         Returns:
             Updated state dictionary
@@ -184,6 +257,21 @@ class MasterAgent:
         # This run method can be used for batch processing or initialization
         return state
 
+    async def arun(self, state: Dict, config: Optional[Dict] = None) -> Dict:
+        """Async variant of ``run`` for callers running on an event loop.
+
+        The default runs ``run`` in a worker thread; agents with a native
+        async LLM path override this.
+
+        Args:
+            state: Current state dictionary
+            config: Optional runnable config forwarded to LLM calls
+
+        Returns:
+            Updated state dictionary
+        """
+        return await asyncio.to_thread(self.run, state, config)
+
     # Sub-agent responsibilities for routing decisions
     AGENT_RESPONSIBILITIES = {
         "scope_refinement": {
@@ -0,0 +1,98 @@
+"""Content-addressed cache for agent outputs.
+
+Agents are deterministic with respect to the state they read, the user settings
+and the model they run on. A pipeline re-run with unchanged inputs can therefore
+reuse the state delta produced by a previous run instead of calling the LLM.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+import xxhash
+
+# In-memory LRU: key -> (state delta, timestamp)
+_agent_cache: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_AGENT_CACHE_MAX_ENTRIES = 256
+_agent_cache_lock = threading.Lock()
+AGENT_CACHE_DURATION = 3600  # 1 hour in seconds
+
+
+def _state_hash(obj: Any) -> str:
+    """Hash a JSON-like object via a canonical (sorted-key) orjson encoding."""
+    encoded = orjson.dumps(
+        obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return xxhash.xxh3_128_hexdigest(encoded)
+
+
+def make_agent_cache_key(
+    agent_name: str,
+    version: str,
+    inputs: Dict[str, Any],
+    settings: Dict[str, Any],
+    model: str,
+) -> Optional[str]:
+    """Build a cache key for an agent invocation.
+
+    Args:
+        agent_name: Registry name of the agent
+        version: Agent version (bumped when prompts/handlers change)
+        inputs: State subset the agent reads
+        settings: Pipeline settings passed to the agent
+        model: Model identifier of the LLM in use
+
+    Returns:
+        Hex digest key, or None if the inputs cannot be serialized
+    """
+    payload = {
+        "agent": agent_name,
+        "version": version,
+        "input": inputs,
+        "settings": settings,
+        "model": model,
+    }
+    try:
+        return _state_hash(payload)
+    except TypeError:
+        return None
+
+
+def get_cached_agent_output(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached state delta for a key, if present and fresh."""
+    with _agent_cache_lock:
+        entry = _agent_cache.get(key)
+        if entry is None:
+            return None
+
+        delta, timestamp = entry
+        if time.time() - timestamp >= AGENT_CACHE_DURATION:
+            del _agent_cache[key]
+            return None
+        _agent_cache.move_to_end(key)
+    return dict(delta)
+
+
+def set_cached_agent_output(key: str, delta: Dict[str, Any]) -> None:
+    """Store the state delta produced by an agent run, evicting the oldest entry."""
+    with _agent_cache_lock:
+        _agent_cache[key] = (dict(delta), time.time())
+        _agent_cache.move_to_end(key)
+        if len(_agent_cache) > _AGENT_CACHE_MAX_ENTRIES:
+            _agent_cache.popitem(last=False)
+
+
+def state_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the keys of ``after`` that are new or changed relative to ``before``."""
+    return {
+        key: value
+        for key, value in after.items()
+        if key not in before or (before[key] is not value and before[key] != value)
+    }
+
+
+def estimate_tokens(delta: Dict[str, Any]) -> int:
+    """Roughly estimate the number of tokens in a state delta (~4 chars/token)."""
+    return len(orjson.dumps(delta, default=str, option=orjson.OPT_NON_STR_KEYS)) // 4
@@ -1,7 +1,54 @@
 """Base pipeline class for orchestrating agent execution."""
 
+import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from agents.pipeline.agent_cache import (
+    estimate_tokens,
+    get_cached_agent_output,
+    make_agent_cache_key,
+    set_cached_agent_output,
+    state_delta,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pre-formatted separators for pipeline progress logs
+BANNER = "=" * 80
+THIN = "─" * 80
+
+
+class _PipelineStreamingHandler(BaseCallbackHandler):
+    """Forward LLM tokens of one agent to the pipeline's streaming callback.
+
+    Tokens are only produced by LLMs created with streaming enabled
+    (e.g. ``get_llm(streaming=True)``).
+    """
+
+    def __init__(self, agent_name: str, streaming_callback: Any):
+        """Initialize the handler.
+
+        Args:
+            agent_name: Agent whose tokens are forwarded
+            streaming_callback: Pipeline streaming callback
+        """
+        self.agent_name = agent_name
+        self.streaming_callback = streaming_callback
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        """Emit a "token" event for each new LLM token."""
+        self.streaming_callback(self.agent_name, "token", token)
+
+
+def _streaming_config(agent_name: str, streaming_callback: Optional[Any]) -> Optional[Dict]:
+    """Build the runnable config that streams an agent's tokens, if requested."""
+    if not streaming_callback:
+        return None
+    return {"callbacks": [_PipelineStreamingHandler(agent_name, streaming_callback)]}
 
 
 class BasePipeline(ABC):
@@ -34,6 +81,8 @@ class BasePipeline(ABC):
         self.session = session
         self.llm = llm
         self.settings = settings or {}
+        # Agent instances are reusable: llm/settings/session are fixed per pipeline
+        self._agent_instances: Dict[str, Any] = {}
 
     @abstractmethod
     def get_agent_sequence(self) -> List[str]:
@@ -85,3 +134,253 @@ class BasePipeline(ABC):
         """
         # Default: all agents run sequentially
         return [[agent] for agent in self.get_agent_sequence()]
+
+    def _snapshot_state(self, state: Dict) -> Mapping:
+        """Take one read-only snapshot of state to share across a parallel group.
+
+        Agents copy state in prepare_state before modifying it, so a single
+        snapshot replaces a copy per submitted agent. The snapshot is detached
+        from ``state`` so merging results does not affect agents still running.
+
+        Args:
+            state: Current proposal state
+
+        Returns:
+            Read-only view of a shallow copy of state
+        """
+        return MappingProxyType(dict(state))
+
+    def _get_agent(self, agent_name: str) -> Any:
+        """Get (creating once per pipeline) the agent instance for a name.
+
+        Args:
+            agent_name: Name of agent
+
+        Returns:
+            Agent instance
+        """
+        from agents.registry import AGENT_REGISTRY
+
+        agent = self._agent_instances.get(agent_name)
+        if agent is None:
+            # Get agent class from registry
+            agent_class = AGENT_REGISTRY.get(agent_name)
+            if not agent_class:
+                raise ValueError(f"Agent '{agent_name}' not found in registry")
+
+            # Create agent instance once per pipeline
+            agent = self._agent_instances.setdefault(
+                agent_name,
+                agent_class(
+                    llm=self.llm,
+                    settings=self.settings,
+                    session=self.session,
+                ),
+            )
+        return agent
+
+    def _agent_cache_key(
+        self, agent_name: str, agent: Any, prepared_state: Dict
+    ) -> Optional[str]:
+        """Build the output cache key for an agent run (None when busting)."""
+        if prepared_state.get("cache_bust"):
+            return None
+        return make_agent_cache_key(
+            agent_name=agent_name,
+            version=agent.version,
+            inputs=agent.get_cache_inputs(prepared_state),
+            settings=self.settings,
+            model=getattr(agent.get_llm(prepared_state), "model_name", ""),
+        )
+
+    def _complete_agent(
+        self,
+        agent_name: str,
+        cache_key: Optional[str],
+        prepared_state: Dict,
+        updated_state: Dict,
+        streaming_callback: Optional[Any] = None,
+    ) -> Dict:
+        """Cache a finished agent's output and notify the streaming callback."""
+        # Never cache failures - the next run should retry
+        if cache_key and updated_state.get("current_stage") != "failed":
+            set_cached_agent_output(cache_key, state_delta(prepared_state, updated_state))
+        logger.info(f"✅ Completed: {agent_name}")
+
+        # Notify streaming callback
+        if streaming_callback:
+            streaming_callback(agent_name, "completed", updated_state)
+
+        return updated_state
+
+    def _run_agent(self, agent_name: str, state: Mapping, streaming_callback: Optional[Any] = None) -> Dict:
+        """Run a single agent and return its state updates.
+
+        Agent outputs are cached by (agent, version, inputs, settings, model).
+        Set ``state["cache_bust"]`` to force a fresh LLM call.
+
+        Args:
+            agent_name: Name of agent to run
+            state: Read-only state snapshot (must not be mutated)
+            streaming_callback: Optional callback for streaming updates
+
+        Returns:
+            Dictionary of state updates from this agent
+        """
+        try:
+            logger.info(f"🤖 Executing: {agent_name}")
+
+            agent = self._get_agent(agent_name)
+
+            # Prepare state with agent's settings merged in
+            prepared_state = agent.prepare_state(state)
+            cache_key = self._agent_cache_key(agent_name, agent, prepared_state)
+
+            cached_delta = get_cached_agent_output(cache_key) if cache_key else None
+            if cached_delta is not None:
+                updated_state = {**prepared_state, **cached_delta}
+                cache_key = None  # Already cached
+                logger.info(
+                    f"⚡ Cache hit: {agent_name} "
+                    f"(saved ~{estimate_tokens(cached_delta)} tokens)"
+                )
+            else:
+                if streaming_callback:
+                    streaming_callback(agent_name, "started", None)
+                # Execute agent with prepared state, streaming tokens to the callback
+                updated_state = agent.run(
+                    prepared_state, config=_streaming_config(agent_name, streaming_callback)
+                )
+
+            return self._complete_agent(
+                agent_name, cache_key, prepared_state, updated_state, streaming_callback
+            )
+        except Exception as e:
+            logger.error(f"❌ Error executing {agent_name}: {e}")
+            # Notify streaming callback of error
+            if streaming_callback:
+                streaming_callback(agent_name, "error", str(e))
+            raise
+
+    def _run_agent_batch(
+        self, llm: Any, batch: List[Tuple], streaming_callback: Optional[Any] = None
+    ) -> Dict[str, Dict]:
+        """Run several single-call agents that share an LLM with one batch call.
+
+        Args:
+            llm: Language model shared by every agent in the batch
+            batch: (agent_name, agent, prepared_state, prompt, cache_key) tuples
+            streaming_callback: Optional callback for streaming updates
+
+        Returns:
+            Dictionary mapping agent name to its updated state
+        """
+        agent_names = [item[0] for item in batch]
+        logger.info(f"🤖 Executing batch: {', '.join(agent_names)}")
+
+        if streaming_callback:
+            for agent_name in agent_names:
+                streaming_callback(agent_name, "started", None)
+
+        try:
+            responses = llm.batch(
+                [item[3] for item in batch],
+                config=[
+                    _streaming_config(agent_name, streaming_callback) or {}
+                    for agent_name in agent_names
+                ],
+            )
+        except Exception as e:
+            for agent_name in agent_names:
+                logger.error(f"❌ Error executing {agent_name}: {e}")
+                if streaming_callback:
+                    streaming_callback(agent_name, "error", str(e))
+            raise
+
+        results = {}
+        for (agent_name, agent, prepared_state, _, cache_key), response in zip(
+            batch, responses
+        ):
+            try:
+                updated_state = agent.parse_response(prepared_state, response)
+                results[agent_name] = self._complete_agent(
+                    agent_name, cache_key, prepared_state, updated_state, streaming_callback
+                )
+            except Exception as e:
+                logger.error(f"❌ Error executing {agent_name}: {e}")
+                if streaming_callback:
+                    streaming_callback(agent_name, "error", str(e))
+                raise
+        return results
+
+    def _submit_group(
+        self,
+        executor: Any,
+        agent_names: List[str],
+        state: Mapping,
+        streaming_callback: Optional[Any] = None,
+    ) -> Dict[Any, List[str]]:
+        """Submit a parallel group, batching LLM calls where agents allow it.
+
+        Agents that implement both ``build_prompt`` and ``parse_response`` and
+        use the same LLM are sent in a single ``llm.batch`` call. Every other
+        agent (multi-step agents, cache hits) runs through ``_run_agent``.
+
+        Args:
+            executor: AgentWorkerPool to submit work to
+            agent_names: Agents in the group
+            state: Read-only state snapshot shared by the group
+            streaming_callback: Optional callback for streaming updates
+
+        Returns:
+            Dictionary mapping each future to the agent names it covers.
+            Every future resolves to a {agent_name: updated_state} dict.
+        """
+        from agents.llm import llm as default_llm
+
+        buckets: Dict[int, List[Tuple]] = {}
+        bucket_llms: Dict[int, Any] = {}
+        single_agents = []
+
+        for agent_name in agent_names:
+            try:
+                agent = self._get_agent(agent_name)
+                prepared_state = agent.prepare_state(state)
+                cache_key = self._agent_cache_key(agent_name, agent, prepared_state)
+                cached = cache_key and get_cached_agent_output(cache_key) is not None
+                batchable = not cached and agent.supports_batching()
+                prompt = agent.build_prompt(prepared_state) if batchable else None
+            except Exception:
+                # Let the regular path surface (and report) the error
+                prompt = None
+            if prompt is None:
+                single_agents.append(agent_name)
+                continue
+
+            agent_llm = agent.get_llm(prepared_state) or default_llm
+            buckets.setdefault(id(agent_llm), []).append(
+                (agent_name, agent, prepared_state, prompt, cache_key)
+            )
+            bucket_llms[id(agent_llm)] = agent_llm
+
+        future_to_agents = {}
+        for bucket_id, batch in buckets.items():
+            future = executor.submit(
+                "+".join(item[0] for item in batch),
+                self._run_agent_batch,
+                bucket_llms[bucket_id],
+                batch,
+                streaming_callback,
+            )
+            future_to_agents[future] = [item[0] for item in batch]
+
+        for agent_name in single_agents:
+            future = executor.submit(
+                agent_name,
+                lambda name=agent_name: {
+                    name: self._run_agent(name, state, streaming_callback)
+                },
+            )
+            future_to_agents[future] = [agent_name]
+
+        return future_to_agents
@@ -4,9 +4,13 @@ This pipeline executes only the agents that need to be updated based on user edi
 """
 
 import concurrent.futures
+import logging
 from typing import Any, Dict, List, Optional
 
-from agents.pipeline.base_pipeline import BasePipeline
+from agents.pipeline.base_pipeline import BANNER, BasePipeline
+from agents.pipeline.worker_pool import AgentWorkerPool
+
+logger = logging.getLogger(__name__)
 
 
 class EditPipeline(BasePipeline):
@@ -78,7 +82,7 @@ class EditPipeline(BasePipeline):
         # CRITICAL: For explicit single-agent requests, NEVER expand dependencies
         # User wants ONLY that specific agent to run, not its dependents
         if len(primary_agents) == 1:
-            print(f"   🎯 Single-agent request: {primary_agents[0]} - skipping dependency expansion")
+            logger.info(f"   🎯 Single-agent request: {primary_agents[0]} - skipping dependency expansion")
             return primary_agents
         
         # If proposal not generated yet, don't expand dependencies
@@ -199,53 +203,6 @@ class EditPipeline(BasePipeline):
         # For example, running title agent before full proposal is generated
         return True
 
-    def _run_agent(self, agent_name: str, state: Dict, streaming_callback: Optional[Any] = None) -> Dict:
-        """Run a single agent and return its state updates.
-
-        Args:
-            agent_name: Name of agent to run
-            state: Current state (copy)
-            streaming_callback: Optional callback for streaming updates
-
-        Returns:
-            Dictionary of state updates from this agent
-        """
-        from agents.registry import AGENT_REGISTRY
-
-        try:
-            print(f"\n🤖 Executing: {agent_name}")
-            
-            # Get agent class from registry
-            agent_class = AGENT_REGISTRY.get(agent_name)
-            if not agent_class:
-                raise ValueError(f"Agent '{agent_name}' not found in registry")
-
-            # Create agent instance
-            agent = agent_class(
-                llm=self.llm,
-                settings=self.settings,
-                session=self.session,
-            )
-
-            # Prepare state with agent's settings merged in
-            prepared_state = agent.prepare_state(state)
-            
-            # Execute agent with prepared state
-            updated_state = agent.run(prepared_state)
-            print(f"✅ Completed: {agent_name}")
-            
-            # Notify streaming callback
-            if streaming_callback:
-                streaming_callback(agent_name, "completed", updated_state)
-            
-            return updated_state
-        except Exception as e:
-            print(f"❌ Error executing {agent_name}: {e}")
-            # Notify streaming callback of error
-            if streaming_callback:
-                streaming_callback(agent_name, "error", str(e))
-            raise
-
     def execute(self, state: Dict, streaming_callback: Optional[Any] = None) -> Dict:
         """Execute the edit pipeline.
 
@@ -256,11 +213,11 @@ class EditPipeline(BasePipeline):
         Returns:
             Updated state dictionary
         """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import as_completed
 
-        print("\n" + "=" * 80)
-        print("🔧 Executing Edit Pipeline (Parallel)")
-        print("=" * 80)
+        logger.info(BANNER)
+        logger.info("🔧 Executing Edit Pipeline (Parallel)")
+        logger.info(BANNER)
 
         if not self.validate_prerequisites(state):
             raise ValueError(
@@ -271,32 +228,32 @@ class EditPipeline(BasePipeline):
         # Get expanded agent sequence
         agent_sequence = self.get_agent_sequence()
 
-        print(f"📋 Agents to update: {', '.join(agent_sequence)}")
+        logger.info(f"📋 Agents to update: {', '.join(agent_sequence)}")
 
         # Execute all agents in parallel
         # Note: In edit pipeline, we assume dependencies are handled by the user's request
         # or that agents can handle missing dependencies gracefully
-        with ThreadPoolExecutor(max_workers=len(agent_sequence)) as executor:
-            # Submit all tasks
-            future_to_agent = {
-                executor.submit(self._run_agent, agent_name, state.copy(), streaming_callback): agent_name
-                for agent_name in agent_sequence
-            }
-            
+        snapshot = self._snapshot_state(state)
+        with AgentWorkerPool(len(agent_sequence)) as executor:
+            # Submit all tasks (LLM calls batched where possible)
+            future_to_agents = self._submit_group(
+                executor, agent_sequence, snapshot, streaming_callback
+            )
+
             # Wait for completion and merge results
-            for future in as_completed(future_to_agent):
-                agent_name = future_to_agent[future]
+            for future in as_completed(future_to_agents):
                 try:
-                    updated_state = future.result()
-                    # Merge updates into main state
-                    state.update(updated_state)
+                    results = future.result()
                 except Exception as e:
-                    print(f"❌ Pipeline failed at {agent_name}: {e}")
+                    logger.error(f"❌ Pipeline failed at {', '.join(future_to_agents[future])}: {e}")
                     raise
+                # Merge updates into main state
+                for updated_state in results.values():
+                    state.update(updated_state)
 
-        print("\n" + "=" * 80)
-        print("✅ Edit Pipeline Completed")
-        print("=" * 80)
+        logger.info(BANNER)
+        logger.info("✅ Edit Pipeline Completed")
+        logger.info(BANNER)
 
         # Note: HTML update is handled by master agent after pipeline execution
         # This ensures all updated agent responses are properly integrated into the document
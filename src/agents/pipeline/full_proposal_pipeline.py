@@ -3,9 +3,13 @@
 This pipeline executes all agents in the correct order to generate a complete proposal.
 """
 
+import logging
 from typing import Any, Dict, List, Optional
 
-from agents.pipeline.base_pipeline import BasePipeline
+from agents.pipeline.base_pipeline import BANNER, THIN, BasePipeline
+from agents.pipeline.worker_pool import AgentWorkerPool
+
+logger = logging.getLogger(__name__)
 
 
 class FullProposalPipeline(BasePipeline):
@@ -87,55 +91,6 @@ class FullProposalPipeline(BasePipeline):
             ["final_compilation"],  # Final compilation runs last
         ]
 
-    def _run_agent(self, agent_name: str, state: Dict, streaming_callback: Optional[Any] = None) -> Dict:
-        """Run a single agent and return its state updates.
-
-        Args:
-            agent_name: Name of agent to run
-            state: Current state (copy)
-            streaming_callback: Optional callback for streaming updates
-
-        Returns:
-            Dictionary of state updates from this agent
-        """
-        from agents.registry import AGENT_REGISTRY
-
-        try:
-            print(f"\n🤖 Executing: {agent_name}")
-            
-            # Get agent class from registry
-            agent_class = AGENT_REGISTRY.get(agent_name)
-            if not agent_class:
-                raise ValueError(f"Agent '{agent_name}' not found in registry")
-
-            # Create agent instance
-            agent = agent_class(
-                llm=self.llm,
-                settings=self.settings,
-                session=self.session,
-            )
-
-            # Prepare state with agent's settings merged in
-            prepared_state = agent.prepare_state(state)
-            
-            # Execute agent with prepared state
-            updated_state = agent.run(prepared_state)
-            print(f"✅ Completed: {agent_name}")
-            
-            # Notify streaming callback
-            if streaming_callback:
-                streaming_callback(agent_name, "completed", updated_state)
-            
-            # Return ONLY the new/updated keys to avoid overwriting other agents' work
-            # This is a simplified approach; ideally we'd diff the state
-            return updated_state
-        except Exception as e:
-            print(f"❌ Error executing {agent_name}: {e}")
-            # Notify streaming callback of error
-            if streaming_callback:
-                streaming_callback(agent_name, "error", str(e))
-            raise
-
     def execute(self, state: Dict, streaming_callback: Optional[Any] = None) -> Dict:
         """Execute the full proposal pipeline.
 
@@ -146,11 +101,11 @@ class FullProposalPipeline(BasePipeline):
         Returns:
             Updated state dictionary
         """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import as_completed
 
-        print("\n" + "=" * 80)
-        print("🚀 Executing Full Proposal Pipeline (Parallel)")
-        print("=" * 80)
+        logger.info(BANNER)
+        logger.info("🚀 Executing Full Proposal Pipeline (Parallel)")
+        logger.info(BANNER)
 
         if not self.validate_prerequisites(state):
             raise ValueError(
@@ -168,9 +123,16 @@ class FullProposalPipeline(BasePipeline):
             agent_sequence = [
                 agent for agent in agent_sequence if agent in enabled_agents
             ]
-            print(f"🔧 Filtered to enabled agents: {', '.join(agent_sequence)}")
+            logger.info(f"🔧 Filtered to enabled agents: {', '.join(agent_sequence)}")
 
-        print(f"📋 Agent sequence: {', '.join(agent_sequence)}")
+        # Combined mode: the project manager also produces the resource plan
+        if state.get("skip_pm_standalone") and "project_manager" in agent_sequence:
+            agent_sequence = [
+                agent for agent in agent_sequence if agent != "resource_allocation"
+            ]
+            logger.info("🔗 Project plan and resource allocation combined in one call")
+
+        logger.info(f"📋 Agent sequence: {', '.join(agent_sequence)}")
 
         # Execute agents in groups
         parallel_groups = self.get_parallel_groups()
@@ -184,11 +146,11 @@ class FullProposalPipeline(BasePipeline):
         parallel_groups = filtered_parallel_groups
 
         for group_idx, agent_group in enumerate(parallel_groups):
-            print(f"\n{'─'*80}")
-            print(
+            logger.info(THIN)
+            logger.info(
                 f"📦 Group {group_idx + 1}/{len(parallel_groups)}: {', '.join(agent_group)}"
             )
-            print(f"{'─'*80}")
+            logger.info(THIN)
 
             # Filter agents that should run
             agents_to_run = [a for a in agent_group if a in agent_sequence]
@@ -196,23 +158,29 @@ class FullProposalPipeline(BasePipeline):
             if not agents_to_run:
                 continue
 
-            # Execute agents in this group in parallel
-            with ThreadPoolExecutor(max_workers=len(agents_to_run)) as executor:
+            # All agents in the group read the same snapshot of state
+            snapshot = self._snapshot_state(state)
+
+            # Execute agents in this group in parallel (LLM calls batched where possible)
+            with AgentWorkerPool(len(agents_to_run)) as executor:
                 # Submit all tasks
-                future_to_agent = {
-                    executor.submit(self._run_agent, agent_name, state.copy(), streaming_callback): agent_name
-                    for agent_name in agents_to_run
-                }
-                
+                future_to_agents = self._submit_group(
+                    executor, agents_to_run, snapshot, streaming_callback
+                )
+
                 # Wait for completion and merge results
-                for future in as_completed(future_to_agent):
-                    agent_name = future_to_agent[future]
+                for future in as_completed(future_to_agents):
                     try:
-                        updated_state = future.result()
+                        results = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Pipeline failed at {', '.join(future_to_agents[future])}: {e}")
+                        raise
+
+                    for agent_name, updated_state in results.items():
                         # Merge updates into main state
                         # Note: This is thread-safe because we're in the main thread here
                         state.update(updated_state)
-                        
+
                         # CRITICAL: If title agent just completed, save title to session immediately
                         # This ensures title is available for other agents and final compilation
                         if agent_name == "title" and "proposal_title" in updated_state:
@@ -223,17 +191,14 @@ class FullProposalPipeline(BasePipeline):
                                 if hasattr(self.session, "save"):
                                     try:
                                         self.session.save()
-                                        print(f"   ✅ Saved proposal title to session: {title}")
+                                        logger.info(f"   ✅ Saved proposal title to session: {title}")
                                     except Exception as save_error:
-                                        print(f"   ⚠️ Could not save title to session: {save_error}")
+                                        logger.warning(f"   ⚠️ Could not save title to session: {save_error}")
                                         # Continue - title is still in state for other agents
-                    except Exception as e:
-                        print(f"❌ Pipeline failed at {agent_name}: {e}")
-                        raise
 
-        print("\n" + "=" * 80)
-        print("✅ Full Proposal Pipeline Completed")
-        print("=" * 80)
+        logger.info(BANNER)
+        logger.info("✅ Full Proposal Pipeline Completed")
+        logger.info(BANNER)
 
         # Mark session as proposal generated (no database save needed)
         if hasattr(self.session, "is_proposal_generated"):
@@ -1,9 +1,12 @@
 """Pipeline executor for running pipelines with progress tracking."""
 
+import logging
 from typing import Any, Dict, Optional
 
 from agents.pipeline.base_pipeline import BasePipeline
 
+logger = logging.getLogger(__name__)
+
 
 class PipelineExecutor:
     """Executes pipelines and tracks progress."""
@@ -35,7 +38,7 @@ class PipelineExecutor:
         if self.progress_callback:
             self.progress_callback(stage, message)
         else:
-            print(f"[{stage}] {message}")
+            logger.info(f"[{stage}] {message}")
 
     def execute(self, state: Dict, streaming_callback: Optional[Any] = None) -> Dict:
         """Execute the pipeline.
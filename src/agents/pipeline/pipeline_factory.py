@@ -9,6 +9,35 @@ from agents.pipeline.full_proposal_pipeline import (
 )
 
 
+def _full_proposal_from_instruction(
+    instruction: Dict, session: Any, llm: Any, settings: Optional[Dict]
+) -> BasePipeline:
+    """Build the pipeline for a "generate_proposal" instruction."""
+    return FullProposalPipeline(session=session, llm=llm, settings=settings)
+
+
+def _edit_from_instruction(
+    instruction: Dict, session: Any, llm: Any, settings: Optional[Dict]
+) -> BasePipeline:
+    """Build the pipeline for an "edit" instruction."""
+    agents_to_rerun = instruction.get("agents_to_rerun")
+    if not agents_to_rerun:
+        raise ValueError("Edit action requires agents_to_rerun to be specified")
+    return EditPipeline(
+        session=session,
+        llm=llm,
+        settings=settings,
+        agents_to_update=agents_to_rerun,
+    )
+
+
+# Master agent action -> pipeline builder
+_DISPATCH = {
+    "generate_proposal": _full_proposal_from_instruction,
+    "edit": _edit_from_instruction,
+}
+
+
 class PipelineFactory:
     """Factory for creating appropriate pipelines."""
 
@@ -77,26 +106,11 @@ class PipelineFactory:
             ValueError: If instruction is invalid
         """
         action = instruction.get("action", "conversation")
-        agents_to_rerun = instruction.get("agents_to_rerun", [])
-
-        if action == "generate_proposal":
-            return PipelineFactory.create_pipeline(
-                "full_proposal", session=session, llm=llm, settings=settings
-            )
-
-        elif action == "edit":
-            if not agents_to_rerun:
-                raise ValueError("Edit action requires agents_to_rerun to be specified")
-            return PipelineFactory.create_pipeline(
-                "edit",
-                session=session,
-                llm=llm,
-                settings=settings,
-                agents_to_update=agents_to_rerun,
-            )
-
-        else:
+        try:
+            build = _DISPATCH[action]
+        except KeyError:
             raise ValueError(
                 f"Action '{action}' does not require a pipeline. "
                 "Use conversation handler instead."
-            )
+            ) from None
+        return build(instruction, session, llm, settings)
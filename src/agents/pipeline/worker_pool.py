@@ -0,0 +1,118 @@
+"""Worker pool that gives each agent its own worker thread and task queue.
+
+Unlike ``ThreadPoolExecutor`` there is no shared work queue: every worker owns a
+``queue.SimpleQueue`` and the dispatcher places each distinct agent on a distinct
+worker. This trades load balancing (workers never steal) for submission without
+a shared lock, and names worker threads after the agent they run.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+class AgentWorkerPool:
+    """Fixed-size pool of per-agent worker threads.
+
+    ``submit`` is meant to be called from a single dispatcher thread (the
+    pipeline's main thread), so agent-to-worker assignment needs no locking.
+    """
+
+    def __init__(self, num_workers: int, thread_name_prefix: str = "agent-worker"):
+        """Start the worker threads.
+
+        Args:
+            num_workers: Number of workers (at most one per distinct agent is useful)
+            thread_name_prefix: Prefix for worker thread names
+        """
+        num_workers = max(1, num_workers)
+        self._queues: List[queue.SimpleQueue] = [
+            queue.SimpleQueue() for _ in range(num_workers)
+        ]
+        self._assigned: Dict[str, int] = {}
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(
+                target=self._work,
+                args=(tasks,),
+                name=f"{thread_name_prefix}-{index}",
+                daemon=True,
+            )
+            for index, tasks in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _worker_for(self, key: str) -> int:
+        """Return the worker index for a key, giving new keys a free worker."""
+        index = self._assigned.get(key)
+        if index is None:
+            if len(self._assigned) < len(self._queues):
+                index = len(self._assigned)
+                # Name the thread after its agent for profilers/debuggers
+                self._threads[index].name = f"agent-{key}"
+            else:
+                index = hash(key) % len(self._queues)
+            self._assigned[key] = index
+        return index
+
+    def submit(self, key: str, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Schedule ``fn(*args, **kwargs)`` on the worker assigned to ``key``.
+
+        Args:
+            key: Routing key, normally the agent name
+            fn: Callable to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Future resolving to fn's result
+        """
+        if self._shutdown:
+            raise RuntimeError("cannot submit to a pool that has been shut down")
+
+        future: Future = Future()
+        self._queues[self._worker_for(key)].put((future, fn, args, kwargs))
+        return future
+
+    @staticmethod
+    def _work(tasks: queue.SimpleQueue) -> None:
+        """Run tasks from this worker's own queue until a None sentinel arrives."""
+        while True:
+            item = tasks.get()
+            if item is None:
+                return
+
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers once their queued tasks are done.
+
+        Args:
+            wait: Block until every worker thread has exited
+        """
+        if self._shutdown:
+            return
+        self._shutdown = True
+        for tasks in self._queues:
+            tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> "AgentWorkerPool":
+        """Use the pool as a context manager."""
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc: Optional[BaseException], tb: Any) -> None:
+        """Shut the pool down, waiting for queued tasks."""
+        self.shutdown(wait=True)
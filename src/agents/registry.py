@@ -1,30 +1,104 @@
 """Central registry for class-based agents.
 
-Imports concrete agent classes directly to avoid side effects from the
-`agents.subagents` package import.
+Agent classes are imported lazily on first lookup, so importing the registry
+does not pull in every agent module (and LangChain) up front. Modules are
+imported directly to avoid side effects from the `agents.subagents` package
+import.
 """
 
-from typing import Dict, Type
+import importlib
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING, Dict, Type
 
-from agents.master_agent.agent import MasterAgent
-from agents.subagents.title.agent import TitleAgent
-from agents.subagents.scope_refinement.agent import ScopeRefinementAgent
-from agents.subagents.business_analyst.agent import BusinessAnalystAgent
-from agents.subagents.technical_architect.agent import TechnicalArchitectAgent
-from agents.subagents.project_manager.agent import ProjectManagerAgent
-from agents.subagents.resource_allocation.agent import ResourceAllocationAgent
-from agents.subagents.final_compilation.agent import FinalCompilationAgent
+if TYPE_CHECKING:
+    from agents.master_agent.agent import MasterAgent
 
 
-AGENT_REGISTRY: Dict[str, Type[MasterAgent]] = {
+# Identical opening of every section agent's prompt. Keeping it byte-identical
+# (and first) lets the provider reuse its cached prefill across agents. The
+# parts are exported for prompts with a different output format (e.g. JSON),
+# which swap TOON_OUTPUT_RULES and keep the rest.
+SHARED_PREAMBLE_INTRO = """You are one of several specialist agents that together write a business proposal for a client. Each agent writes one part of the proposal; the parts are compiled into a single document shown to the client.
+
+**GENERAL RULES FOR ALL AGENTS:**
+- Base everything on the CLIENT'S SPECIFIC project, not on generic assumptions
+- Treat any budget or timeline stated by the client as a hard constraint
+"""
+
+TOON_OUTPUT_RULES = """- Respond in TOON (Token-Oriented Object Notation) format, NOT HTML, JSON or markdown
+- Do NOT wrap your response in code blocks
+- End your complete response with a single <<<END_BLOCK>>> delimiter
+"""
+
+TOON_FORMATTING_RULES = """
+**TOON Formatting Rules:**
+- Use indentation (2 spaces) for nesting
+- Arrays use [N] to indicate count
+- Object arrays use {field1,field2}: to declare fields
+- Data rows follow with comma-separated values
+- No quotes, braces, or brackets except in declarations
+- Use colons : after keys and array declarations
+
+**Canonical TOON Example:**
+```
+name: John Doe
+age: 30
+active: true
+tags[2]: developer,designer
+address:
+  city: New York
+  zip: "10001"
+```"""
+
+SHARED_SYSTEM_PREAMBLE = SHARED_PREAMBLE_INTRO + TOON_OUTPUT_RULES + TOON_FORMATTING_RULES
+
+
+AGENT_PATHS: Dict[str, str] = {
     # Master Agent (handles conversation and routing)
-    MasterAgent.name: MasterAgent,
+    "master_agent": "agents.master_agent.agent:MasterAgent",
     # Sub-agents (each handles a specific section, all inherit from MasterAgent)
-    TitleAgent.name: TitleAgent,
-    ScopeRefinementAgent.name: ScopeRefinementAgent,
-    BusinessAnalystAgent.name: BusinessAnalystAgent,
-    TechnicalArchitectAgent.name: TechnicalArchitectAgent,
-    ProjectManagerAgent.name: ProjectManagerAgent,
-    ResourceAllocationAgent.name: ResourceAllocationAgent,
-    FinalCompilationAgent.name: FinalCompilationAgent,
+    "title": "agents.subagents.title.agent:TitleAgent",
+    "scope_refinement": "agents.subagents.scope_refinement.agent:ScopeRefinementAgent",
+    "business_analyst": "agents.subagents.business_analyst.agent:BusinessAnalystAgent",
+    "technical_architect": "agents.subagents.technical_architect.agent:TechnicalArchitectAgent",
+    "project_manager": "agents.subagents.project_manager.agent:ProjectManagerAgent",
+    "resource_allocation": "agents.subagents.resource_allocation.agent:ResourceAllocationAgent",
+    "final_compilation": "agents.subagents.final_compilation.agent:FinalCompilationAgent",
 }
+
+
+class _LazyRegistry(Mapping):
+    """Read-only mapping of agent name to class that imports on first access."""
+
+    def __init__(self, paths: Dict[str, str]):
+        """Initialize the registry.
+
+        Args:
+            paths: Mapping of agent name to "module:ClassName"
+        """
+        self._paths = paths
+        self._classes: Dict[str, Type["MasterAgent"]] = {}
+
+    def __getitem__(self, name: str) -> Type["MasterAgent"]:
+        """Import (once) and return the agent class registered under name."""
+        agent_class = self._classes.get(name)
+        if agent_class is None:
+            module_path, class_name = self._paths[name].split(":")
+            agent_class = getattr(importlib.import_module(module_path), class_name)
+            self._classes[name] = agent_class
+        return agent_class
+
+    def __contains__(self, name: object) -> bool:
+        """Check registration without importing the agent module."""
+        return name in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over registered agent names."""
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        """Return the number of registered agents."""
+        return len(self._paths)
+
+
+AGENT_REGISTRY: Mapping[str, Type["MasterAgent"]] = _LazyRegistry(AGENT_PATHS)
@@ -4,22 +4,248 @@ import base64
 import hashlib
 import io
 import logging
-from typing import Dict, Tuple
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
 
 import pdfplumber
+import pypdfium2 as pdfium
 import PyPDF2
+import tiktoken
+import xxhash
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 
+from agents.llm import http_async_client, http_client
+
 logger = logging.getLogger(__name__)
 
+# Below this page count, process start-up/IPC costs more than it saves
+PARALLEL_MIN_PAGES = 8
+# Most extraction worker processes (each holds a full copy of the PDF)
+EXTRACTION_MAX_WORKERS = 4
+
+# PDFium output shorter than this per page suggests a scanned/complex layout
+MIN_CHARS_PER_PAGE = 100
+
+# From this page count on, summarization of early pages overlaps extraction
+STREAMING_SUMMARY_MIN_PAGES = 40
+# Pages per map-step summary, and the most partial summaries to reduce
+SUMMARY_PAGES_PER_CHUNK = 20
+SUMMARY_MAX_CHUNKS = 4
+
+# Token budget for document content in the summary prompt (the template and
+# the 2000-token response fit comfortably alongside it)
+SUMMARY_MAX_CONTENT_TOKENS = 6000
+# Character cap used when no tokenizer is available
+SUMMARY_MAX_CONTENT_CHARS = 8000
+
+
+def _load_summary_encoding():
+    """Load the tokenizer for the summary model, or None if unavailable."""
+    try:
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, truncating summaries by characters: {e}")
+        return None
+
+
+# Encodings are immutable and thread-safe, so one shared instance is enough
+_summary_encoding = _load_summary_encoding()
+
+
+def _truncate_for_summary(content: str) -> str:
+    """Truncate content to the summary token budget.
+
+    Args:
+        content: Extracted text content
+
+    Returns:
+        Content that fits the budget, with a marker if it was cut
+    """
+    if _summary_encoding is None:
+        if len(content) <= SUMMARY_MAX_CONTENT_CHARS:
+            return content
+        return content[:SUMMARY_MAX_CONTENT_CHARS] + "\n\n[Content truncated due to length...]"
+
+    tokens = _summary_encoding.encode(content, disallowed_special=())
+    if len(tokens) <= SUMMARY_MAX_CONTENT_TOKENS:
+        return content
+    return (
+        _summary_encoding.decode(tokens[:SUMMARY_MAX_CONTENT_TOKENS])
+        + "\n\n[Content truncated due to length...]"
+    )
+
+
+# Bump when summary_template changes so cached summaries are invalidated
+SUMMARY_PROMPT_VERSION = "v1"
+SUMMARY_CACHE_DURATION = 7 * 86400  # 7 days in seconds
+
+_extraction_executor: ProcessPoolExecutor | None = None
+_extraction_executor_lock = threading.Lock()
+
+
+def _extraction_workers() -> int:
+    """Return the number of extraction worker processes to use."""
+    return max(1, min(os.cpu_count() or 1, EXTRACTION_MAX_WORKERS))
+
+
+def _get_extraction_executor() -> ProcessPoolExecutor:
+    """Return the shared process pool used for page extraction.
+
+    Workers are not forked: this process runs HTTP client and worker pool
+    threads, and a forked child can deadlock on locks they held.
+    """
+    global _extraction_executor
+    with _extraction_executor_lock:
+        if _extraction_executor is None:
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            _extraction_executor = ProcessPoolExecutor(
+                max_workers=_extraction_workers(),
+                mp_context=multiprocessing.get_context(start_method),
+            )
+        return _extraction_executor
+
+
+# PDFium is not thread-safe, even across documents: every call into it
+# (opening, page/text access, closing) is made while holding this lock
+_pdfium_lock = threading.Lock()
+
+
+def iter_page_texts(pdf_content: bytes) -> Iterator[str]:
+    """Yield the text of each page (possibly empty) in page order using PDFium.
+
+    The PDFium lock is taken per page, not for the whole document, so other
+    threads can interleave their own PDFium calls between pages.
+
+    Args:
+        pdf_content: PDF file content as bytes
+
+    Yields:
+        Text of each page
+    """
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(pdf_content)
+        page_count = len(pdf)
+    try:
+        for index in range(page_count):
+            with _pdfium_lock:
+                page = pdf[index]
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        text = textpage.get_text_range() or ""
+                    finally:
+                        textpage.close()
+                finally:
+                    page.close()
+            yield text
+    finally:
+        with _pdfium_lock:
+            pdf.close()
+
+
+def _pdfium_page_count(pdf_content: bytes) -> int:
+    """Return the page count of a PDF, or 0 if PDFium cannot open it."""
+    with _pdfium_lock:
+        try:
+            pdf = pdfium.PdfDocument(pdf_content)
+        except Exception:
+            return 0
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+
+def _extract_page_range(
+    pdf_content: bytes, start: int, end: int
+) -> Tuple[int, List[str]]:
+    """Extract text from pages [start, end) with pdfplumber.
+
+    Runs in a worker process, so it re-opens the PDF from bytes.
+
+    Args:
+        pdf_content: PDF file content as bytes
+        start: First page index (inclusive)
+        end: Last page index (exclusive)
+
+    Returns:
+        Tuple of (start, non-empty page texts)
+    """
+    parts = []
+    with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+        for page in pdf.pages[start:end]:
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(page_text)
+    return start, parts
+
+
+def _extract_pages_parallel(pdf_content: bytes, page_count: int) -> List[str]:
+    """Extract page texts using the process pool, one page range per worker.
+
+    Args:
+        pdf_content: PDF file content as bytes
+        page_count: Number of pages in the PDF
+
+    Returns:
+        Non-empty page texts in page order
+    """
+    workers = _extraction_workers()
+    chunk_size = -(-page_count // workers)  # ceil division
+    try:
+        executor = _get_extraction_executor()
+        futures = [
+            executor.submit(
+                _extract_page_range,
+                pdf_content,
+                start,
+                min(start + chunk_size, page_count),
+            )
+            for start in range(0, page_count, chunk_size)
+        ]
+        results = sorted(future.result() for future in futures)
+    except Exception as e:
+        logger.warning(f"Parallel page extraction failed, running sequentially: {e}")
+        return _extract_page_range(pdf_content, 0, page_count)[1]
+
+    return [text for _, parts in results for text in parts]
+
 
 class PDFProcessor:
     """Service for processing PDF files and generating AI summaries."""
 
+    # Processed results keyed by content hash (LRU), shared across instances
+    _result_cache: "OrderedDict[str, Dict]" = OrderedDict()
+    _result_cache_size = 256
+    # Futures for PDFs currently being processed, keyed by content hash
+    _inflight: Dict[str, Future] = {}
+    _cache_lock = threading.Lock()
+    # Most summaries kept per instance (LRU)
+    _summary_cache_size = 256
+
     def __init__(self):
         """Initialize the PDF processor."""
-        self.llm = ChatOpenAI(temperature=0.3, max_tokens=2000)
+        self.llm = ChatOpenAI(
+            temperature=0.3,
+            max_tokens=2000,
+            http_client=http_client,
+            http_async_client=http_async_client,
+        )
+        # Summaries keyed by content hash/filename/model/prompt version (LRU):
+        # (summary, timestamp)
+        self._summary_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._summary_cache_lock = threading.Lock()
 
         # Template for summarizing PDF content
         self.summary_template = PromptTemplate(
@@ -60,19 +286,44 @@ Summary:
         Returns:
             Tuple of (extracted_text, extraction_method, page_count)
         """
+        # Try PDFium first (native, much faster for plain text)
+        try:
+            page_texts = list(iter_page_texts(pdf_content))
+            page_count = len(page_texts)
+            parts = [text for text in page_texts if text.strip()]
+
+            extracted_text = "\n\n".join(parts).strip()
+            if extracted_text and len(extracted_text) >= MIN_CHARS_PER_PAGE * page_count:
+                logger.info(f"Successfully extracted text from {filename} using pdfium")
+                return extracted_text, "pdfium", page_count
+
+            logger.info(
+                f"pdfium extracted too little text from {filename}, trying pdfplumber"
+            )
+
+        except Exception as e:
+            logger.warning(f"pdfium failed for {filename}: {e}")
+
         pdf_file = io.BytesIO(pdf_content)
 
-        # Try pdfplumber first (better for complex layouts)
+        # Fall back to pdfplumber (better for complex layouts)
         try:
-            extracted_text = ""
+            parts: list[str] = []
             page_count = 0
 
             with pdfplumber.open(pdf_file) as pdf:
                 page_count = len(pdf.pages)
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        extracted_text += page_text + "\n\n"
+                if page_count < PARALLEL_MIN_PAGES:
+                    for page in pdf.pages:
+                        page_text = page.extract_text()
+                        if page_text:
+                            parts.append(page_text)
+
+            # Page extraction is CPU-bound, so spread large PDFs across cores
+            if page_count >= PARALLEL_MIN_PAGES:
+                parts = _extract_pages_parallel(pdf_content, page_count)
+
+            extracted_text = "\n\n".join(parts)
 
             if extracted_text.strip():
                 logger.info(
@@ -87,13 +338,15 @@ Summary:
         try:
             pdf_file.seek(0)  # Reset file pointer
             pdf_reader = PyPDF2.PdfReader(pdf_file)
-            extracted_text = ""
+            parts = []
             page_count = len(pdf_reader.pages)
 
             for page in pdf_reader.pages:
                 page_text = page.extract_text()
                 if page_text:
-                    extracted_text += page_text + "\n\n"
+                    parts.append(page_text)
+
+            extracted_text = "\n\n".join(parts)
 
             if extracted_text.strip():
                 logger.info(f"Successfully extracted text from {filename} using PyPDF2")
@@ -104,10 +357,123 @@ Summary:
 
         # If both methods fail
         raise Exception(
-            f"Failed to extract text from {filename} using both pdfplumber and PyPDF2"
+            f"Failed to extract text from {filename} using pdfium, pdfplumber and PyPDF2"
         )
 
-    def generate_summary(self, content: str, filename: str) -> str:
+    def extract_and_summarize(
+        self, pdf_content: bytes, filename: str, page_count: int
+    ) -> Tuple[str, str, int, str, bool]:
+        """Extract text and summarize it, overlapping the two for large PDFs.
+
+        A background thread extracts pages with PDFium while this thread
+        summarizes each finished chunk of pages (map step). The partial
+        summaries are then combined into one summary (reduce step). If PDFium
+        fails or finds too little text, extraction falls back to
+        ``extract_text_from_pdf`` and the full text is summarized instead.
+
+        Args:
+            pdf_content: PDF file content as bytes
+            filename: Original filename
+            page_count: Number of pages in the PDF
+
+        Returns:
+            Tuple of (extracted_text, extraction_method, page_count, summary,
+            summary_succeeded)
+        """
+        pages_per_chunk = max(
+            SUMMARY_PAGES_PER_CHUNK, -(-page_count // SUMMARY_MAX_CHUNKS)
+        )
+        chunks: queue.SimpleQueue = queue.SimpleQueue()
+
+        def produce_chunks():
+            try:
+                chunk = []
+                for page_text in iter_page_texts(pdf_content):
+                    chunk.append(page_text)
+                    if len(chunk) == pages_per_chunk:
+                        chunks.put(chunk)
+                        chunk = []
+                if chunk:
+                    chunks.put(chunk)
+                chunks.put(None)
+            except Exception as e:
+                chunks.put(e)
+
+        page_texts: List[str] = []
+        partial_summaries: List[str] = []
+        summaries_succeeded = True
+        producer_error = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(produce_chunks)
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    producer_error = chunk
+                    break
+
+                page_texts.extend(chunk)
+                chunk_text = "\n\n".join(text for text in chunk if text.strip())
+                # Skip near-empty (scanned) chunks; the fallback below handles them
+                if len(chunk_text) >= MIN_CHARS_PER_PAGE * len(chunk):
+                    summary, succeeded = self.generate_summary(chunk_text, filename)
+                    partial_summaries.append(summary)
+                    summaries_succeeded = summaries_succeeded and succeeded
+
+        extracted_text = "\n\n".join(text for text in page_texts if text.strip()).strip()
+        too_little_text = not extracted_text or len(
+            extracted_text
+        ) < MIN_CHARS_PER_PAGE * len(page_texts)
+        if producer_error is not None or too_little_text:
+            # Same fallback chain as small PDFs (pdfplumber, then PyPDF2)
+            if producer_error is not None:
+                logger.warning(
+                    f"pdfium failed for {filename}: {producer_error}, "
+                    "falling back to sequential extraction"
+                )
+            else:
+                logger.info(
+                    f"pdfium extracted too little text from {filename}, "
+                    "falling back to sequential extraction"
+                )
+            extracted_text, method, page_count = self.extract_text_from_pdf(
+                pdf_content, filename
+            )
+            return (
+                extracted_text,
+                method,
+                page_count,
+                *self.generate_summary(extracted_text, filename),
+            )
+
+        logger.info(
+            f"Extracted {filename} using pdfium with {len(partial_summaries)} "
+            "overlapped chunk summaries"
+        )
+        if len(partial_summaries) == 1:
+            return (
+                extracted_text,
+                "pdfium",
+                len(page_texts),
+                partial_summaries[0],
+                summaries_succeeded,
+            )
+
+        combined = "\n\n".join(
+            f"Summary of part {index + 1}:\n{summary}"
+            for index, summary in enumerate(partial_summaries)
+        )
+        summary, succeeded = self.generate_summary(combined, filename)
+        return (
+            extracted_text,
+            "pdfium",
+            len(page_texts),
+            summary,
+            summaries_succeeded and succeeded,
+        )
+
+    def generate_summary(self, content: str, filename: str) -> Tuple[str, bool]:
         """Generate AI summary of PDF content.
 
         Args:
@@ -115,16 +481,34 @@ Summary:
             filename: Original filename
 
         Returns:
-            AI-generated summary
+            Tuple of (summary, succeeded); if the LLM call fails the summary
+            is a raw content preview and succeeded is False
         """
         try:
             # Limit content length to avoid token limits
-            max_content_length = 8000  # Leave room for prompt and response
-            if len(content) > max_content_length:
-                content = (
-                    content[:max_content_length]
-                    + "\n\n[Content truncated due to length...]"
-                )
+            content = _truncate_for_summary(content)
+
+            # The prompt embeds the filename, so it is part of the key
+            cache_key = (
+                self._content_key(content.encode())
+                + ":"
+                + filename
+                + ":"
+                + str(getattr(self.llm, "model_name", ""))
+                + ":"
+                + SUMMARY_PROMPT_VERSION
+            )
+            with self._summary_cache_lock:
+                cached = self._summary_cache.get(cache_key)
+                if cached is not None:
+                    if time.time() - cached[1] < SUMMARY_CACHE_DURATION:
+                        self._summary_cache.move_to_end(cache_key)
+                    else:
+                        del self._summary_cache[cache_key]
+                        cached = None
+            if cached is not None:
+                logger.info(f"Using cached summary for {filename}")
+                return cached[0], True
 
             # Generate summary using LangChain
             chain = self.summary_template | self.llm
@@ -136,7 +520,13 @@ Summary:
             elif hasattr(summary, "text"):
                 summary = summary.text
 
-            return str(summary).strip()
+            summary = str(summary).strip()
+            with self._summary_cache_lock:
+                self._summary_cache[cache_key] = (summary, time.time())
+                self._summary_cache.move_to_end(cache_key)
+                if len(self._summary_cache) > self._summary_cache_size:
+                    self._summary_cache.popitem(last=False)
+            return summary, True
 
         except Exception as e:
             logger.error(f"Failed to generate summary for {filename}: {e}")
@@ -151,15 +541,35 @@ This document contains project requirements and specifications. Key content incl
 
 Note: AI summarization failed, showing raw content preview instead.
 Please review the full document content for complete details.
-"""
+""", False
 
     def calculate_file_hash(self, content: bytes) -> str:
-        """Calculate SHA-256 hash of file content."""
-        return hashlib.sha256(content).hexdigest()
+        """Calculate SHA-256 hash of file content.
+
+        Hashes in large blocks without copying the buffer.
+        """
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(io.BytesIO(content), "sha256").hexdigest()
+
+        digest = hashlib.sha256()
+        view = memoryview(content)
+        chunk_size = 1 << 20  # 1 MiB
+        for start in range(0, len(view), chunk_size):
+            digest.update(view[start : start + chunk_size])
+        return digest.hexdigest()
+
+    def _content_key(self, content: bytes) -> str:
+        """Calculate a fast non-cryptographic hash for internal cache keys."""
+        return xxhash.xxh3_128_hexdigest(content)
 
     def process_pdf_file(self, pdf_content: bytes, filename: str) -> Dict:
         """Process a PDF file completely - extract text and generate summary.
 
+        Results are memoized by file hash and filename (the summary names the
+        file), and concurrent calls for the same file wait on the in-flight
+        result instead of processing it again. Results whose extraction or
+        summarization failed are not cached, so a re-upload retries them.
+
         Args:
             pdf_content: PDF file content as bytes
             filename: Original filename
@@ -167,18 +577,85 @@ Please review the full document content for complete details.
         Returns:
             Dict with processing results
         """
+        if not pdf_content:
+            return self._process_uncached(pdf_content, filename, None)[0]
+
+        # Cache lookups use a fast hash; SHA-256 is only computed on a miss
+        content_key = self._content_key(pdf_content) + ":" + filename
+
+        with self._cache_lock:
+            cached = self._result_cache.get(content_key)
+            if cached is not None:
+                self._result_cache.move_to_end(content_key)
+                logger.info(f"Using cached PDF result for {filename}")
+                return dict(cached)
+
+            future = self._inflight.get(content_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[content_key] = future
+
+        if not owner:
+            logger.info(f"Waiting for in-flight processing of {filename}")
+            return dict(future.result())
+
         try:
-            # Calculate file hash
             file_hash = self.calculate_file_hash(pdf_content)
+            result, cacheable = self._process_uncached(pdf_content, filename, file_hash)
+        except BaseException as e:
+            with self._cache_lock:
+                self._inflight.pop(content_key, None)
+            future.set_exception(e)
+            raise
+
+        with self._cache_lock:
+            # Only cache successful results so failures are retried
+            if cacheable:
+                self._result_cache[content_key] = result
+                if len(self._result_cache) > self._result_cache_size:
+                    self._result_cache.popitem(last=False)
+            self._inflight.pop(content_key, None)
+        future.set_result(result)
+        return dict(result)
+
+    def _process_uncached(
+        self, pdf_content: bytes, filename: str, file_hash: str | None
+    ) -> Tuple[Dict, bool]:
+        """Extract text and generate a summary without consulting the cache.
+
+        Args:
+            pdf_content: PDF file content as bytes
+            filename: Original filename
+            file_hash: Precomputed SHA-256 of the content, if any
+
+        Returns:
+            Tuple of (processing results, whether they may be cached); a
+            fallback summary after a failed LLM call is returned but not cached
+        """
+        try:
             file_size = len(pdf_content)
 
-            # Extract text
-            raw_content, extraction_method, page_count = self.extract_text_from_pdf(
-                pdf_content, filename
-            )
+            page_count = _pdfium_page_count(pdf_content)
+            if page_count >= STREAMING_SUMMARY_MIN_PAGES:
+                # Large PDF: summarize early pages while later ones are extracted
+                (
+                    raw_content,
+                    extraction_method,
+                    page_count,
+                    content_summary,
+                    summary_succeeded,
+                ) = self.extract_and_summarize(pdf_content, filename, page_count)
+            else:
+                # Extract text
+                raw_content, extraction_method, page_count = self.extract_text_from_pdf(
+                    pdf_content, filename
+                )
 
-            # Generate summary
-            content_summary = self.generate_summary(raw_content, filename)
+                # Generate summary
+                content_summary, summary_succeeded = self.generate_summary(
+                    raw_content, filename
+                )
 
             return {
                 "success": True,
@@ -189,22 +666,20 @@ Please review the full document content for complete details.
                 "extraction_method": extraction_method,
                 "page_count": page_count,
                 "error": None,
-            }
+            }, summary_succeeded
 
         except Exception as e:
             logger.error(f"Failed to process PDF {filename}: {e}")
             return {
                 "success": False,
-                "file_hash": (
-                    self.calculate_file_hash(pdf_content) if pdf_content else None
-                ),
+                "file_hash": file_hash,
                 "file_size": len(pdf_content) if pdf_content else 0,
                 "raw_content": "",
                 "content_summary": "",
                 "extraction_method": "manual",
                 "page_count": 0,
                 "error": str(e),
-            }
+            }, False
 
     def process_base64_pdf(self, base64_content: str, filename: str) -> Dict:
         """Process a base64-encoded PDF file.
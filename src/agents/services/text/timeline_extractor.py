@@ -1,76 +1,285 @@
 """Timeline and budget extraction utilities for proposal generation."""
 
 import re
-from typing import Any, Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple, Union
+
+try:
+    import ahocorasick
+except ImportError:  # optional speedup, see _find_complexity_keywords
+    ahocorasick = None
+
+# Any "[within|in] N <unit>[s]" mention in lowercased text
+_TIMELINE_RE = re.compile(r"(?:\b(?:within|in)\s+)?(\d+)\s*(day|week|month|year)s?\b")
+
+# Every timeline match contains one of these substrings
+_TIMELINE_HINTS = ("day", "week", "month", "year")
+
+# Words that ask for the fastest possible delivery
+_URGENT_WORDS = frozenset({"asap", "urgent", "urgently"})
+
+# Working hours per timeline unit
+_UNIT_HOURS = {"day": 8, "week": 40, "month": 160, "year": 1920}
+
+# Amount right after a "$" (e.g. "$10,000", "$ 10,000.00", "$10" in "$10k")
+_DOLLAR_AMOUNT_RE = re.compile(r"\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)")
+
+# Budget patterns for amounts without a "$", matched against lowercased text
+# (no re.IGNORECASE needed). Each entry is (pattern, has 'k' suffix)
+_BUDGET_RES = (
+    (re.compile(r"(\d+)k\s*(?:dollars?|usd)"), True),  # 10k dollars
+    (re.compile(r"budget\s*(?:of|is)?\s*\$?\s*(\d{1,3}(?:,\d{3})*)"), False),  # budget of 10,000
+    (re.compile(r"spend\s*\$?\s*(\d{1,3}(?:,\d{3})*)"), False),  # spend 10,000
+    (re.compile(r"afford\s*\$?\s*(\d{1,3}(?:,\d{3})*)"), False),  # afford 10,000
+)
+# Every budget or range match contains one of these substrings (lowercased)
+_BUDGET_HINTS = ("$", "dollar", "usd", "budget", "spend", "afford")
+_RANGE_RE = re.compile(r"\$\s*(\d{1,3}(?:,\d{3})*)\s*(?:to|-)\s*\$?\s*(\d{1,3}(?:,\d{3})*)")
+
+
+# Phase distribution ratios based on complexity, as (phase, ratio) pairs
+_DISTRIBUTIONS = {
+    "low": (
+        ("setup", 0.10),
+        ("backend", 0.25),
+        ("frontend", 0.30),
+        ("advanced", 0.15),
+        ("testing", 0.10),
+        ("deployment", 0.10),
+    ),
+    "medium": (
+        ("setup", 0.15),
+        ("backend", 0.30),
+        ("frontend", 0.25),
+        ("advanced", 0.15),
+        ("testing", 0.10),
+        ("deployment", 0.05),
+    ),
+    "high": (
+        ("setup", 0.12),
+        ("backend", 0.32),
+        ("frontend", 0.22),
+        ("advanced", 0.20),
+        ("testing", 0.10),
+        ("deployment", 0.04),
+    ),
+}
+
+# Complexity level -> keywords that suggest it
+_COMPLEXITY_KEYWORDS = {
+    "high": [
+        "machine learning",
+        "ai",
+        "artificial intelligence",
+        "real-time",
+        "scalability",
+        "blockchain",
+        "distributed",
+        "microservices",
+        "high traffic",
+        "enterprise",
+        "complex",
+        "advanced",
+        "sophisticated",
+        "multi-tenant",
+        "payment processing",
+    ],
+    "medium": [
+        "authentication",
+        "api",
+        "database",
+        "responsive",
+        "mobile",
+        "dashboard",
+        "reporting",
+        "notifications",
+        "search",
+        "filtering",
+        "user management",
+    ],
+    "low": [
+        "simple",
+        "basic",
+        "landing page",
+        "static",
+        "portfolio",
+        "blog",
+        "minimal",
+        "straightforward",
+        "crud",
+        "form",
+    ],
+}
+
+
+# Single-word keywords as per-level sets, and the few multi-word or hyphenated
+# keywords ("real-time" is two words once split on hyphens), which need a
+# substring check
+_KEYWORD_SETS = {
+    level: frozenset(
+        keyword for keyword in keywords if " " not in keyword and "-" not in keyword
+    )
+    for level, keywords in _COMPLEXITY_KEYWORDS.items()
+}
+_MULTIWORD_KEYWORDS = tuple(
+    (keyword, level)
+    for level, keywords in _COMPLEXITY_KEYWORDS.items()
+    for keyword in keywords
+    if " " in keyword or "-" in keyword
+)
 
+# Words are runs of letters/digits; hyphens separate words, so "ai-powered"
+# contains the keyword "ai"
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def _word_set(text: str) -> set:
+    """Split text into its distinct words, as _WORD_RE defines them."""
+    return set(_WORD_RE.findall(text))
+
+
+def _build_keyword_automaton():
+    """Build an Aho-Corasick automaton over all complexity keywords."""
+    automaton = ahocorasick.Automaton()
+    for level, keywords in _COMPLEXITY_KEYWORDS.items():
+        for keyword in keywords:
+            automaton.add_word(keyword, (keyword, level))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick else None
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] is a whole word (as _WORD_RE splits words),
+    allowing a plural "s".
+    """
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end] == "s":
+        end += 1
+    return end == len(text) or not text[end].isalnum()
 
-def extract_timeline_from_conversation(conversation_history: list) -> Dict[str, Any]:
-    """Extract timeline information from conversation history.
+
+def _find_complexity_keywords(
+    text: str, words: Optional[FrozenSet[str]] = None
+) -> Set[tuple]:
+    """Find the distinct complexity keywords in text.
+
+    Keywords match whole words only (so "ai" does not match "email"),
+    optionally followed by a plural "s".
 
     Args:
-        conversation_history: List of conversation messages
+        text: Lowercased text to scan
+        words: Precomputed _word_set(text), if available
 
     Returns:
-        Dict with timeline, timeline_hours, and confidence
+        Set of (keyword, level) pairs
     """
-    # Combine all user messages
-    user_messages = " ".join(
-        [
-            msg.get("message", "").lower()
+    if _KEYWORD_AUTOMATON is not None:
+        # Single linear pass over the text for all keywords
+        return {
+            value
+            for end, value in _KEYWORD_AUTOMATON.iter(text)
+            if _is_whole_word(text, end - len(value[0]) + 1, end + 1)
+        }
+
+    # Hash lookups per distinct word instead of a substring scan per keyword
+    words = set(_word_set(text) if words is None else words)
+    words.update([word[:-1] for word in words if word.endswith("s")])
+    found = {
+        (keyword, level)
+        for level, keywords in _KEYWORD_SETS.items()
+        for keyword in keywords & words
+    }
+
+    for keyword, level in _MULTIWORD_KEYWORDS:
+        start = text.find(keyword)
+        while start != -1:
+            if _is_whole_word(text, start, start + len(keyword)):
+                found.add((keyword, level))
+                break
+            start = text.find(keyword, start + 1)
+    return found
+
+
+@dataclass(frozen=True)
+class ConversationText:
+    """User side of a conversation, joined once and shared by the extractors.
+
+    Build it with ``ConversationText.from_history`` and pass it to the
+    extractors below in place of the conversation history.
+    """
+
+    raw: str
+    lower: str
+    words: FrozenSet[str]
+
+    @classmethod
+    def from_history(cls, conversation_history: list) -> "ConversationText":
+        """Join all user messages in a conversation.
+
+        Args:
+            conversation_history: List of conversation messages
+
+        Returns:
+            ConversationText with the joined, lowercased and tokenized text
+        """
+        raw = " ".join(
+            msg.get("message", "")
             for msg in conversation_history
             if msg.get("role") == "user"
-        ]
-    )
+        )
+        lower = raw.lower()
+        return cls(raw=raw, lower=lower, words=frozenset(_word_set(lower)))
 
-    timeline_info = {"timeline": "", "timeline_hours": 0, "confidence": "low"}
 
-    # Timeline patterns to match
-    patterns = {
-        # Days
-        r"(\d+)\s*(?:day|days)": lambda days: int(days) * 8,  # 8 hours per day
-        r"within\s+(\d+)\s*(?:day|days)": lambda days: int(days) * 8,
-        r"in\s+(\d+)\s*(?:day|days)": lambda days: int(days) * 8,
-        # Weeks
-        r"(\d+)\s*(?:week|weeks)": lambda weeks: int(weeks) * 40,  # 40 hours per week
-        r"within\s+(\d+)\s*(?:week|weeks)": lambda weeks: int(weeks) * 40,
-        r"in\s+(\d+)\s*(?:week|weeks)": lambda weeks: int(weeks) * 40,
-        # Months
-        r"(\d+)\s*(?:month|months)": lambda months: int(months)
-        * 160,  # 160 hours per month
-        r"within\s+(\d+)\s*(?:month|months)": lambda months: int(months) * 160,
-        r"in\s+(\d+)\s*(?:month|months)": lambda months: int(months) * 160,
-        # Years
-        r"(\d+)\s*(?:year|years)": lambda years: int(years)
-        * 1920,  # 1920 hours per year
-        r"within\s+(\d+)\s*(?:year|years)": lambda years: int(years) * 1920,
-        r"in\s+(\d+)\s*(?:year|years)": lambda years: int(years) * 1920,
-    }
+ConversationInput = Union[list, ConversationText]
 
-    for pattern, hours_calc in patterns.items():
-        matches = re.findall(pattern, user_messages)
-        if matches:
-            # Use the last mentioned timeline (most recent)
-            value = matches[-1]
-            timeline_hours = hours_calc(value)
-
-            # Extract the timeline string for display
-            timeline_match = re.search(pattern, user_messages)
-            if timeline_match:
-                timeline_text = timeline_match.group(0)
-                timeline_info = {
-                    "timeline": timeline_text,
-                    "timeline_hours": timeline_hours,
-                    "confidence": "high",
-                }
-                break
+
+def _as_conversation_text(conversation: ConversationInput) -> ConversationText:
+    """Return conversation as ConversationText, joining a raw history if needed."""
+    if isinstance(conversation, ConversationText):
+        return conversation
+    return ConversationText.from_history(conversation)
+
+
+def extract_timeline_from_conversation(conversation: ConversationInput) -> Dict[str, Any]:
+    """Extract timeline information from conversation history.
+
+    Args:
+        conversation: List of conversation messages, or its ConversationText
+
+    Returns:
+        Dict with timeline, timeline_hours, and confidence
+    """
+    conversation_text = _as_conversation_text(conversation)
+    user_messages = conversation_text.lower
+
+    timeline_info = {"timeline": "", "timeline_hours": 0, "confidence": "low"}
+
+    # Use the last mentioned timeline (most recent), in a single scan.
+    # Cheap substring check first; most messages never mention a timeline
+    timeline_match = None
+    if any(hint in user_messages for hint in _TIMELINE_HINTS):
+        for match in _TIMELINE_RE.finditer(user_messages):
+            timeline_match = match
+    if timeline_match:
+        value, unit = timeline_match.groups()
+        timeline_info = {
+            "timeline": timeline_match.group(0),
+            "timeline_hours": int(value) * _UNIT_HOURS[unit],
+            "confidence": "high",
+        }
 
     # Look for "ASAP" or "as soon as possible"
-    if (
-        "asap" in user_messages
-        or "as soon as possible" in user_messages
-        or "urgently" in user_messages
-    ):
-        if not timeline_info["timeline"]:
+    if not timeline_info["timeline"]:
+        words = conversation_text.words
+        if _URGENT_WORDS & words or (
+            "possible" in words and "as soon as possible" in user_messages
+        ):
             timeline_info = {
                 "timeline": "ASAP (2 weeks estimated)",
                 "timeline_hours": 80,  # 2 weeks
@@ -88,56 +297,63 @@ def extract_timeline_from_conversation(conversation_history: list) -> Dict[str,
     return timeline_info
 
 
-def extract_budget_from_conversation(conversation_history: list) -> Dict[str, Any]:
+def _last_dollar_budget(text: str) -> str:
+    """Return the last "$" amount in text as a budget string, or "" if none.
+
+    Walks "$" positions from the end with str.rfind and matches the amount in
+    place, instead of running a regex over the whole text.
+    """
+    index = text.rfind("$")
+    while index != -1:
+        match = _DOLLAR_AMOUNT_RE.match(text, index + 1)
+        if match:
+            suffix = "k" if text.startswith("k", match.end()) else ""
+            return f"${match.group(1)}{suffix}"
+        index = text.rfind("$", 0, index)
+    return ""
+
+
+def extract_budget_from_conversation(conversation: ConversationInput) -> Dict[str, Any]:
     """Extract budget information from conversation history.
 
     Args:
-        conversation_history: List of conversation messages
+        conversation: List of conversation messages, or its ConversationText
 
     Returns:
         Dict with budget and confidence
     """
-    # Combine all user messages
-    user_messages = " ".join(
-        [
-            msg.get("message", "")
-            for msg in conversation_history
-            if msg.get("role") == "user"
-        ]
-    )
+    user_messages = _as_conversation_text(conversation).lower
 
     budget_info = {"budget": "", "confidence": "low"}
 
-    # Budget patterns
-    # Match patterns like: $10,000, $10000, $10k, 10k, 10000 dollars, etc.
-    budget_patterns = [
-        r"\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)",  # $10,000 or $10,000.00
-        r"\$\s*(\d+)k",  # $10k
-        r"(\d+)k\s*(?:dollars?|usd)",  # 10k dollars
-        r"budget\s*(?:of|is)?\s*\$?\s*(\d{1,3}(?:,\d{3})*)",  # budget of $10,000
-        r"spend\s*\$?\s*(\d{1,3}(?:,\d{3})*)",  # spend $10,000
-        r"afford\s*\$?\s*(\d{1,3}(?:,\d{3})*)",  # afford $10,000
-    ]
-
-    for pattern in budget_patterns:
-        matches = re.findall(pattern, user_messages, re.IGNORECASE)
+    # Cheap substring check first; most conversations never mention a budget
+    if not any(hint in user_messages for hint in _BUDGET_HINTS):
+        return budget_info
+
+    # Fast path: the last "$" amount (use the last mentioned budget)
+    dollar_budget = _last_dollar_budget(user_messages)
+    if dollar_budget:
+        budget_info = {"budget": dollar_budget, "confidence": "high"}
+
+        # Look for budget range (only possible with a "$" amount)
+        range_matches = _RANGE_RE.findall(user_messages)
+        if range_matches:
+            low, high = range_matches[-1]
+            budget_info = {"budget": f"${low} - ${high}", "confidence": "high"}
+        return budget_info
+
+    for pattern, has_k_suffix in _BUDGET_RES:
+        matches = pattern.findall(user_messages)
         if matches:
             budget_value = matches[-1]  # Use the last mentioned budget
 
             # Handle 'k' suffix
-            if "k" in pattern.lower():
+            if has_k_suffix:
                 budget_info = {"budget": f"${budget_value}k", "confidence": "high"}
             else:
                 budget_info = {"budget": f"${budget_value}", "confidence": "high"}
             break
 
-    # Look for budget range
-    range_pattern = r"\$\s*(\d{1,3}(?:,\d{3})*)\s*(?:to|-)\s*\$?\s*(\d{1,3}(?:,\d{3})*)"
-    range_matches = re.findall(range_pattern, user_messages, re.IGNORECASE)
-    if range_matches:
-        low, high = range_matches[-1]
-        budget_info = {"budget": f"${low} - ${high}", "confidence": "high"}
-
     return budget_info
 
 
@@ -148,32 +364,38 @@ def parse_timeline_to_hours(timeline: str) -> int:
         timeline: Timeline string (e.g., "3 months", "2 weeks")
 
     Returns:
-        Total hours
+        Total hours for the first duration in the string (480 if none)
     """
-    timeline_lower = timeline.lower()
+    timeline_match = _TIMELINE_RE.search(timeline.lower())
+    if timeline_match:
+        value, unit = timeline_match.groups()
+        return int(value) * _UNIT_HOURS[unit]
 
-    # Day patterns
-    day_match = re.search(r"(\d+)\s*(?:day|days)", timeline_lower)
-    if day_match:
-        return int(day_match.group(1)) * 8
+    # Default to 3 months if unable to parse
+    return 480
 
-    # Week patterns
-    week_match = re.search(r"(\d+)\s*(?:week|weeks)", timeline_lower)
-    if week_match:
-        return int(week_match.group(1)) * 40
 
-    # Month patterns
-    month_match = re.search(r"(\d+)\s*(?:month|months)", timeline_lower)
-    if month_match:
-        return int(month_match.group(1)) * 160
+@lru_cache(maxsize=256)
+def _phase_hours(total_hours: int, complexity: str) -> Tuple[Tuple[str, int], ...]:
+    """Compute the (phase, hours) split; cached since few totals recur."""
+    distribution = _DISTRIBUTIONS.get(complexity, _DISTRIBUTIONS["medium"])
 
-    # Year patterns
-    year_match = re.search(r"(\d+)\s*(?:year|years)", timeline_lower)
-    if year_match:
-        return int(year_match.group(1)) * 1920
+    phase_hours = {}
+    total_distributed = 0
+    largest_phase, largest_hours = None, -1
+    for phase, ratio in distribution:
+        hours = int(total_hours * ratio)
+        phase_hours[phase] = hours
+        total_distributed += hours
+        if hours > largest_hours:
+            largest_phase, largest_hours = phase, hours
 
-    # Default to 3 months if unable to parse
-    return 480
+    # Ensure we use all hours (adjust for rounding)
+    if total_distributed < total_hours:
+        # Add remaining hours to the largest phase
+        phase_hours[largest_phase] += total_hours - total_distributed
+
+    return tuple(phase_hours.items())
 
 
 def distribute_timeline_across_phases(
@@ -188,127 +410,31 @@ def distribute_timeline_across_phases(
     Returns:
         Dict mapping phase names to hours
     """
-    # Distribution ratios based on complexity
-    distributions = {
-        "low": {
-            "setup": 0.10,
-            "backend": 0.25,
-            "frontend": 0.30,
-            "advanced": 0.15,
-            "testing": 0.10,
-            "deployment": 0.10,
-        },
-        "medium": {
-            "setup": 0.15,
-            "backend": 0.30,
-            "frontend": 0.25,
-            "advanced": 0.15,
-            "testing": 0.10,
-            "deployment": 0.05,
-        },
-        "high": {
-            "setup": 0.12,
-            "backend": 0.32,
-            "frontend": 0.22,
-            "advanced": 0.20,
-            "testing": 0.10,
-            "deployment": 0.04,
-        },
-    }
-
-    distribution = distributions.get(complexity, distributions["medium"])
-
-    phase_hours = {}
-    for phase, ratio in distribution.items():
-        phase_hours[phase] = int(total_hours * ratio)
-
-    # Ensure we use all hours (adjust for rounding)
-    total_distributed = sum(phase_hours.values())
-    if total_distributed < total_hours:
-        # Add remaining hours to the largest phase
-        largest_phase = max(phase_hours, key=phase_hours.get)
-        phase_hours[largest_phase] += total_hours - total_distributed
-
-    return phase_hours
+    return dict(_phase_hours(total_hours, complexity))
 
 
 def estimate_project_complexity(
-    conversation_history: list, refined_scope: str = ""
+    conversation: ConversationInput, refined_scope: str = ""
 ) -> str:
     """Estimate project complexity based on conversation and scope.
 
     Args:
-        conversation_history: List of conversation messages
+        conversation: List of conversation messages, or its ConversationText
         refined_scope: Refined project scope (if available)
 
     Returns:
         Complexity level: "low", "medium", or "high"
     """
-    complexity_keywords = {
-        "high": [
-            "machine learning",
-            "ai",
-            "artificial intelligence",
-            "real-time",
-            "scalability",
-            "blockchain",
-            "distributed",
-            "microservices",
-            "high traffic",
-            "enterprise",
-            "complex",
-            "advanced",
-            "sophisticated",
-            "multi-tenant",
-            "payment processing",
-        ],
-        "medium": [
-            "authentication",
-            "api",
-            "database",
-            "responsive",
-            "mobile",
-            "dashboard",
-            "reporting",
-            "notifications",
-            "search",
-            "filtering",
-            "user management",
-        ],
-        "low": [
-            "simple",
-            "basic",
-            "landing page",
-            "static",
-            "portfolio",
-            "blog",
-            "minimal",
-            "straightforward",
-            "crud",
-            "form",
-        ],
-    }
+    # Scan conversation and scope separately rather than concatenating them
+    conversation_text = _as_conversation_text(conversation)
+    found = _find_complexity_keywords(conversation_text.lower, conversation_text.words)
+    if refined_scope:
+        found |= _find_complexity_keywords(refined_scope.lower())
 
-    # Combine conversation and scope
-    text = (
-        " ".join(
-            [
-                msg.get("message", "").lower()
-                for msg in conversation_history
-                if msg.get("role") == "user"
-            ]
-        )
-        + " "
-        + refined_scope.lower()
-    )
-
-    # Count keyword matches
+    # Count distinct keyword matches per level
     scores = {"high": 0, "medium": 0, "low": 0}
-
-    for level, keywords in complexity_keywords.items():
-        for keyword in keywords:
-            if keyword in text:
-                scores[level] += 1
+    for _, level in found:
+        scores[level] += 1
 
     # Determine complexity
     if scores["high"] >= 3:
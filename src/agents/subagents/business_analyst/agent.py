@@ -21,7 +21,9 @@ class BusinessAnalystAgent(MasterAgent):
         """Initialize business analyst agent."""
         super().__init__(llm=llm, settings=settings, session=session)
 
-    def run(self, state: Dict) -> Dict:  # type: ignore[override]
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:  # type: ignore[override]
         """Execute business analysis and return updated state."""
         prepared = self.prepare_state(state)
-        return business_analyst_agent(prepared, llm_instance=self.get_llm(prepared))
+        return business_analyst_agent(
+            prepared, llm_instance=self.get_llm(prepared), config=config
+        )
@@ -3,6 +3,7 @@
 from langchain_core.prompts import PromptTemplate
 from langsmith import traceable
 
+from agents.registry import SHARED_SYSTEM_PREAMBLE
 from agents.subagents.business_analyst.prompts import (
     BUSINESS_ANALYST_PROMPT,
 )
@@ -14,12 +15,15 @@ from agents.utils.utils import (
 
 
 @traceable(name="business_analyst_agent")
-def business_analyst_agent(state: ProposalState, llm_instance=None) -> ProposalState:
+def business_analyst_agent(
+    state: ProposalState, llm_instance=None, config=None
+) -> ProposalState:
     """Create a comprehensive business analysis based on scope and market research.
 
     Args:
         state: The current proposal state with refined scope
         llm_instance: Optional LLM instance (uses default if not provided)
+        config: Optional runnable config (e.g. streaming callbacks)
 
     Returns:
         Updated state with business analysis
@@ -114,7 +118,9 @@ You MUST:
 """
             print(f"   📝 User requested to add new section: {user_input}")
 
-    prompt = PromptTemplate.from_template(BUSINESS_ANALYST_PROMPT)
+    prompt = PromptTemplate.from_template(BUSINESS_ANALYST_PROMPT).partial(
+        shared_preamble=SHARED_SYSTEM_PREAMBLE
+    )
     _llm = llm_instance or state.get("llm") or llm
     chain = prompt | _llm
 
@@ -123,7 +129,7 @@ You MUST:
         "context": "",
         "previous_content": previous_content_section,
         "user_instructions": user_instructions,
-    })
+    }, config=config)
 
     # Clean the response to remove newlines and HTML code blocks
     cleaned_response = clean_agent_response(business_analysis.content)
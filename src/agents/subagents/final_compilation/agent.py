@@ -21,7 +21,7 @@ class FinalCompilationAgent(MasterAgent):
         """Initialize final compilation agent."""
         super().__init__(llm=llm, settings=settings, session=session)
 
-    def run(self, state: Dict) -> Dict:  # type: ignore[override]
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:  # type: ignore[override]
         """Compile the final proposal and return updated state."""
         prepared = self.prepare_state(state)
         return final_compilation_agent(prepared)
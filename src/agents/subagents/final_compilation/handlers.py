@@ -1,9 +1,40 @@
 """Function-based handler for final compilation agent."""
 
+import logging
+import threading
+from collections import OrderedDict
+
+import xxhash
 from langsmith import traceable
 
 from agents.utils.utils import ProposalState
 
+logger = logging.getLogger(__name__)
+
+# Sections that must be present, as (state key, display name) pairs
+_REQUIRED = (
+    ("refined_scope", "refined scope"),
+    ("business_analysis", "business analysis"),
+    ("technical_spec", "technical specification"),
+    ("project_plan", "project plan"),
+    ("resource_plan", "resource plan"),
+)
+
+# Recently compiled proposals keyed by a hash of their sections, so that
+# re-entering compilation with unchanged sections skips rebuilding
+_COMPILED_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+_COMPILED_CACHE_MAX_ENTRIES = 32
+_compiled_cache_lock = threading.Lock()
+
+
+def _sections_key(*sections) -> str:
+    """Hash the proposal sections into a cache key."""
+    hasher = xxhash.xxh3_128()
+    for section in sections:
+        hasher.update(str(section).encode("utf-8"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
 
 @traceable(name="final_compilation_agent")
 def final_compilation_agent(state: ProposalState) -> ProposalState:
@@ -11,6 +42,9 @@ def final_compilation_agent(state: ProposalState) -> ProposalState:
     
     No HTML generation - frontend handles TOON to HTML conversion.
 
+    The state is updated in place (callers pass a state they own, e.g. the
+    copy made by MasterAgent.prepare_state) and returned.
+
     Args:
         state: The current proposal state with all sections generated
 
@@ -20,24 +54,17 @@ def final_compilation_agent(state: ProposalState) -> ProposalState:
     print("\n📄 FINAL COMPILATION: Compiling final proposal (TOON format)...")
 
     # Validate that all required components are present
-    required_components = {
-        "refined_scope": "refined scope",
-        "business_analysis": "business analysis",
-        "technical_spec": "technical specification",
-        "project_plan": "project plan",
-        "resource_plan": "resource plan",
-    }
-
     missing_components = []
-    for key, name in required_components.items():
-        component = state.get(key, "")
-        if not component or str(component).strip() == "":
+    for key, name in _REQUIRED:
+        component = state.get(key)
+        if not component or (isinstance(component, str) and not component.strip()):
             missing_components.append(name)
 
     if missing_components:
         error_msg = f"Missing required components: {', '.join(missing_components)}"
         print(f"❌ FINAL COMPILATION ERROR: {error_msg}")
-        return {**state, "current_stage": "failed", "error": error_msg}
+        state |= {"current_stage": "failed", "error": error_msg}
+        return state
 
     # Get all TOON responses from agents (no HTML conversion)
     refined_scope = state.get("refined_scope", "")
@@ -49,10 +76,35 @@ def final_compilation_agent(state: ProposalState) -> ProposalState:
     similar_products = state.get("similar_products", "")
     proposal_title = state.get("proposal_title", "Project Proposal")
 
-    print(
-        f"📊 Component lengths - Scope: {len(refined_scope)}, Business: {len(business_analysis)}, "
-        f"Technical: {len(technical_spec)}, Project: {len(project_plan)}, Resource: {len(resource_plan)}"
+    key = _sections_key(
+        proposal_title,
+        initial_idea,
+        similar_products,
+        refined_scope,
+        business_analysis,
+        technical_spec,
+        project_plan,
+        resource_plan,
     )
+    with _compiled_cache_lock:
+        cached = _COMPILED_CACHE.get(key)
+        if cached is not None:
+            _COMPILED_CACHE.move_to_end(key)
+    if cached is not None:
+        logger.debug("✅ FINAL COMPILATION: Sections unchanged, reusing compiled proposal")
+        state |= {"final_proposal": dict(cached), "current_stage": "completed"}
+        return state
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Component lengths - Scope: %d, Business: %d, Technical: %d, "
+            "Project: %d, Resource: %d",
+            len(refined_scope),
+            len(business_analysis),
+            len(technical_spec),
+            len(project_plan),
+            len(resource_plan),
+        )
 
     # Compile final proposal dictionary with TOON sections
     # Frontend will handle TOON to HTML conversion
@@ -67,7 +119,13 @@ def final_compilation_agent(state: ProposalState) -> ProposalState:
         "resource_plan": resource_plan,
     }
 
+    with _compiled_cache_lock:
+        _COMPILED_CACHE[key] = final_proposal
+        if len(_COMPILED_CACHE) > _COMPILED_CACHE_MAX_ENTRIES:
+            _COMPILED_CACHE.popitem(last=False)
+
     print("✅ FINAL COMPILATION: Complete!")
     print("📄 Proposal sections compiled in TOON format (frontend will handle HTML conversion)")
 
-    return {**state, "final_proposal": final_proposal, "current_stage": "completed"}
+    state |= {"final_proposal": dict(final_proposal), "current_stage": "completed"}
+    return state
@@ -3,7 +3,12 @@
 from typing import Any, Dict, Optional
 
 from agents.master_agent.agent import MasterAgent
+from agents.subagents.resource_allocation.agent import ResourceAllocationAgent
 from agents.subagents.project_manager.handlers import (
+    aproject_manager_agent,
+    build_batched_project_manager_prompt,
+    combined_planning_agent,
+    parse_batched_project_manager_response,
     project_manager_agent,
 )
 
@@ -14,6 +19,17 @@ class ProjectManagerAgent(MasterAgent):
     name = "project_manager"
     display_name = "Project Manager"
     section_ids = ["project_plan"]
+    cache_input_keys = (
+        "technical_spec",
+        "refined_scope",
+        "business_analysis",
+        "timeline",
+        "timeline_hours",
+        "budget",
+        "project_plan",
+        "project_plan_inputs",
+        "user_input",
+    )
 
     def __init__(
         self, llm: Any = None, settings: Optional[Dict] = None, session: Any = None
@@ -21,7 +37,51 @@ class ProjectManagerAgent(MasterAgent):
         """Initialize project manager agent."""
         super().__init__(llm=llm, settings=settings, session=session)
 
-    def run(self, state: Dict) -> Dict:  # type: ignore[override]
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:  # type: ignore[override]
         """Execute project planning and return updated state."""
         prepared = self.prepare_state(state)
-        return project_manager_agent(prepared, llm_instance=self.get_llm(prepared))
+        if prepared.get("skip_pm_standalone"):
+            return combined_planning_agent(
+                prepared, llm_instance=self.get_llm(prepared), config=config
+            )
+        return project_manager_agent(
+            prepared, llm_instance=self.get_llm(prepared), config=config
+        )
+
+    async def arun(self, state: Dict, config: Optional[Dict] = None) -> Dict:
+        """Execute project planning, awaiting the LLM call."""
+        prepared = self.prepare_state(state)
+        if prepared.get("skip_pm_standalone"):
+            # Combined planning has no async path; run it in a worker thread
+            return await super().arun(state, config)
+        return await aproject_manager_agent(
+            prepared, llm_instance=self.get_llm(prepared), config=config
+        )
+
+    def get_cache_inputs(self, state: Dict) -> Dict:
+        """Get the state subset this agent's output depends on.
+
+        In combined mode the output also holds the resource plan, so the
+        resource allocation inputs are part of the key.
+        """
+        inputs = super().get_cache_inputs(state)
+        if state.get("skip_pm_standalone"):
+            inputs["skip_pm_standalone"] = True
+            for key in ResourceAllocationAgent.cache_input_keys:
+                inputs.setdefault(key, state.get(key))
+        return inputs
+
+    def build_prompt(self, state: Dict) -> Any:
+        """Build the LLM input from prepared state (for batched execution).
+
+        Returns None when run() needs no plain call on this agent's LLM: it
+        keeps or reuses a plan, plans resources too, uses structured output
+        or the fast model.
+        """
+        return build_batched_project_manager_prompt(state, self.get_llm(state))
+
+    def parse_response(self, state: Dict, response: Any) -> Dict:
+        """Turn the batched LLM response into updated state (and cache it)."""
+        return parse_batched_project_manager_response(
+            state, response, self.get_llm(state)
+        )
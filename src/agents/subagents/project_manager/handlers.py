@@ -1,30 +1,377 @@
 """Function-based handler for project manager agent."""
 
-from langchain_core.prompts import PromptTemplate
+import logging
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+import orjson
+import xxhash
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.prompt_values import ChatPromptValue, PromptValue
 from langsmith import traceable
 
+from agents.config import env
+from agents.registry import (
+    SHARED_PREAMBLE_INTRO,
+    SHARED_SYSTEM_PREAMBLE,
+    TOON_FORMATTING_RULES,
+)
 from agents.subagents.project_manager.prompts import (
+    ADD_SECTION_INSTRUCTIONS,
+    BUDGET_CONSTRAINT_TEMPLATE,
+    COMBINED_OUTPUT_RULES,
+    COMBINED_PLANNING_INSTRUCTIONS,
+    PREVIOUS_CONTENT_TEMPLATE,
+    PROJECT_MANAGER_COMBINED_FORMAT,
+    PROJECT_MANAGER_DYNAMIC_SUFFIX,
     PROJECT_MANAGER_PROMPT,
+    PROJECT_MANAGER_SIMPLE_EDIT_PROMPT,
+    PROJECT_MANAGER_STRUCTURED_FORMAT,
+    PROJECT_MANAGER_TOON_FORMAT,
+    REMOVE_SECTION_INSTRUCTIONS,
+    RESOURCE_ALLOCATION_COMBINED_FORMAT,
+    STRUCTURED_OUTPUT_RULES,
+    TIMELINE_CONSTRAINT_TEMPLATE,
+)
+from agents.subagents.project_manager.schema import ProjectPlan
+from agents.subagents.resource_allocation.handlers import (
+    build_resource_allocation_human_message,
+    build_resource_allocation_prompt,
+    parse_resource_allocation_response,
 )
+from agents.subagents.resource_allocation.prompts import RESOURCE_ALLOCATION_INSTRUCTIONS
 from agents.utils.utils import (
     ProposalState,
     clean_agent_response,
     llm,
+    llm_fast,
 )
 
+logger = logging.getLogger(__name__)
+
+# First run of digits in a budget string once thousands separators are removed
+_BUDGET_NUMBER_RE = re.compile(r"\d+")
+
+# User requests to remove or add proposal sections, as whole words (so that
+# e.g. "address" or "dropdown" do not count)
+_REMOVE_SECTION_RE = re.compile(
+    r"\b(?:remov(?:e|es|ed|ing)|delet(?:e|es|ed|ing)|drop(?:s|ped|ping)?"
+    r"|exclud(?:e|es|ed|ing))\b"
+)
+_ADD_SECTION_RE = re.compile(r"\b(?:add(?:s|ed|ing)?|includ(?:e|es|ed|ing)|new section)\b")
+
+# Terms that make a removal request more than dropping a section: changed
+# constraints ("drop the timeline to 4 weeks"), figures, or replacements
+_EDIT_CONSTRAINT_RE = re.compile(
+    r"\b(?:timeline|deadline|budget|cost|price|rates?|hours?|days?|weeks?|months?"
+    r"|years?|instead|replac(?:e|es|ed|ing)|switch|swap|chang(?:e|es|ed|ing)"
+    r"|reduc(?:e|es|ed|ing)|increas(?:e|es|ed|ing)|extend|shorten)\b|\$|\d"
+)
+
+
+# Cleaned project plans keyed by a hash of model + full prompt text
+_RESPONSE_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_RESPONSE_CACHE_MAX_ENTRIES = 256
+_response_cache_lock = threading.Lock()
+
+
+def _response_cache_key(prompt_value: PromptValue, llm_instance: Any) -> str:
+    """Hash the model name and prompt text into a response cache key."""
+    hasher = xxhash.xxh3_128()
+    hasher.update(str(getattr(llm_instance, "model_name", "")).encode("utf-8"))
+    hasher.update(b"\x00")
+    hasher.update(prompt_value.to_string().encode("utf-8"))
+    return hasher.hexdigest()
+
+
+# State keys the project plan is derived from (besides user requests)
+_PLAN_INPUT_KEYS = (
+    "technical_spec",
+    "refined_scope",
+    "business_analysis",
+    "timeline",
+    "timeline_hours",
+    "budget",
+)
+
+
+def _plan_inputs_hash(state: ProposalState) -> str:
+    """Hash the state fields a project plan is generated from."""
+    hasher = xxhash.xxh3_128()
+    for key in _PLAN_INPUT_KEYS:
+        hasher.update(str(state.get(key, "")).encode("utf-8"))
+        hasher.update(b"\x00")
+    return hasher.hexdigest()
+
+
+def project_plan_is_current(state: ProposalState) -> bool:
+    """Check whether the existing project plan can be kept as is.
+
+    True when a plan exists, the user asked for no change, and the plan was
+    generated from the same upstream sections and constraints.
+
+    Args:
+        state: The current proposal state
+
+    Returns:
+        Whether re-running the project manager would be a no-op
+    """
+    return bool(
+        state.get("project_plan")
+        and not (state.get("user_input") or "").strip()
+        and state.get("project_plan_inputs") == _plan_inputs_hash(state)
+    )
 
-@traceable(name="project_manager_agent")
-def project_manager_agent(state: ProposalState, llm_instance=None) -> ProposalState:
-    """Develop a detailed project plan with phases, tables, and realistic timelines.
+
+# Previous plans longer than this are sent as head + tail windows, so repeated
+# edits cannot grow the prompt without bound
+MAX_PREVIOUS_CONTENT_CHARS = 16000
+PREVIOUS_CONTENT_HEAD_CHARS = 4000
+PREVIOUS_CONTENT_TAIL_CHARS = 10000
+
+
+def _bound_previous_content(previous_content: str) -> str:
+    """Keep the head and tail of an over-long previous plan, marking the gap."""
+    if len(previous_content) <= MAX_PREVIOUS_CONTENT_CHARS:
+        return previous_content
+
+    omitted = (
+        len(previous_content) - PREVIOUS_CONTENT_HEAD_CHARS - PREVIOUS_CONTENT_TAIL_CHARS
+    )
+    logger.debug("✂️ Truncated previous content: %d chars omitted", omitted)
+    return (
+        previous_content[:PREVIOUS_CONTENT_HEAD_CHARS]
+        + f"\n... [{omitted} characters of the previous plan omitted here; "
+        "keep the corresponding sections, regenerating them consistently] ...\n"
+        + previous_content[-PREVIOUS_CONTENT_TAIL_CHARS:]
+    )
+
+
+@lru_cache(maxsize=32)
+def _format_previous_content(previous_content: str) -> str:
+    """Build the previous-plan prompt section (cached across retries/re-runs)."""
+    return PREVIOUS_CONTENT_TEMPLATE.format(
+        previous_content=_bound_previous_content(previous_content)
+    )
+
+
+def uses_structured_output(state: ProposalState) -> bool:
+    """Check whether this run generates a fresh plan via structured output.
+
+    Edits of an existing plan and add/remove section requests stay on TOON
+    text, since they may add sections the ProjectPlan schema has no field
+    for; combined planning has its own JSON response format.
+    """
+    user_lower = (state.get("user_input") or "").lower()
+    return bool(
+        not state.get("project_plan")
+        and not state.get("skip_pm_standalone")
+        and not _REMOVE_SECTION_RE.search(user_lower)
+        and not _ADD_SECTION_RE.search(user_lower)
+    )
+
+
+# Static instructions rendered once at import, per response format:
+# formatting scans the whole ~20KB prompt, which is wasted work per call.
+# Structured output and combined planning do not answer in TOON text, so their
+# preamble and format block replace the TOON-only output rules instead of
+# contradicting them.
+_PROJECT_MANAGER_STATIC_PROMPTS = {
+    "toon": PROJECT_MANAGER_PROMPT.format(
+        shared_preamble=SHARED_SYSTEM_PREAMBLE,
+        response_format=PROJECT_MANAGER_TOON_FORMAT,
+    ),
+    "structured": PROJECT_MANAGER_PROMPT.format(
+        shared_preamble=SHARED_PREAMBLE_INTRO + STRUCTURED_OUTPUT_RULES,
+        response_format=PROJECT_MANAGER_STRUCTURED_FORMAT,
+    ),
+    "combined": PROJECT_MANAGER_PROMPT.format(
+        shared_preamble=SHARED_PREAMBLE_INTRO + COMBINED_OUTPUT_RULES + TOON_FORMATTING_RULES,
+        response_format=PROJECT_MANAGER_COMBINED_FORMAT,
+    ),
+}
+
+# Resource allocation rules of the combined system prompt (its per-call part
+# goes in the human message), sent after the project manager constraints
+_COMBINED_PLANNING_SUFFIX = (
+    "\n\n**RESOURCE ALLOCATION INSTRUCTIONS:**\n"
+    + RESOURCE_ALLOCATION_INSTRUCTIONS
+    + RESOURCE_ALLOCATION_COMBINED_FORMAT
+    + COMBINED_PLANNING_INSTRUCTIONS
+)
+
+# Minimal prompt for simple edits: no planning instructions or upstream sections
+_SIMPLE_EDIT_SYSTEM_PROMPT = PROJECT_MANAGER_SIMPLE_EDIT_PROMPT.format(
+    shared_preamble=SHARED_SYSTEM_PREAMBLE
+)
+_SIMPLE_EDIT_HUMAN_TEMPLATE = "{previous_content}\n\n{user_instructions}"
+
+
+@lru_cache(maxsize=64)
+def _project_manager_system_prompt(
+    mode: str,
+    timeline: str,
+    timeline_hours: int,
+    budget: str,
+    budget_numeric: Optional[float],
+) -> str:
+    """Render the project manager system prompt for a set of constraints.
+
+    Args:
+        mode: Response format: "toon", "structured" (ProjectPlan schema) or
+            "combined" (plan and resources in one JSON response)
+        timeline: Client's timeline ("" if not constrained)
+        timeline_hours: Maximum total hours (0 if not constrained)
+        budget: Client's budget ("" if not constrained)
+        budget_numeric: Numeric value parsed from budget
+
+    Returns:
+        System prompt text with the shared preamble and constraints filled in
+    """
+    # Add constraint information to the prompt
+    constraint_parts = []
+    if timeline and timeline_hours:
+        constraint_parts.append(
+            TIMELINE_CONSTRAINT_TEMPLATE.format(
+                timeline=timeline, timeline_hours=timeline_hours
+            )
+        )
+    if budget:
+        max_budget = f"${budget_numeric:,.0f}" if budget_numeric is not None else budget
+        constraint_parts.append(
+            BUDGET_CONSTRAINT_TEMPLATE.format(budget=budget, max_budget=max_budget)
+        )
+
+    # Static instructions first, then constraints, in the system message: it
+    # stays byte-identical between calls with the same constraints, so the
+    # provider can serve it from its prompt cache. Everything that changes per
+    # call goes strictly after it, in the human message.
+    suffix = _COMBINED_PLANNING_SUFFIX if mode == "combined" else ""
+    return _PROJECT_MANAGER_STATIC_PROMPTS[mode] + "".join(constraint_parts) + suffix
+
+
+@lru_cache(maxsize=64)
+def _format_human_message(human_template: str, values: Tuple[Tuple[str, str], ...]) -> str:
+    """Fill the human template (cached: replays and retries resend the same state)."""
+    return human_template.format_map(defaultdict(str, values))
+
+
+def _render_prompt(system_prompt: str, human_template: str, **values: str) -> PromptValue:
+    """Fill the human template via str.format_map and pair it with the system prompt.
+
+    Values are substituted verbatim (TOON curly braces in state content are
+    never parsed as placeholders) and missing variables render as "".
+    """
+    return ChatPromptValue(
+        messages=[
+            SystemMessage(content=system_prompt),
+            HumanMessage(
+                content=_format_human_message(human_template, tuple(values.items()))
+            ),
+        ]
+    )
+
+
+def _user_instructions(user_input: str) -> str:
+    """Build the prompt instructions for a user request to add/remove sections.
+
+    Args:
+        user_input: The user's edit request ("" if none)
+
+    Returns:
+        Instructions to append to the prompt ("" if not an add/remove request)
+    """
+    user_instructions = ""
+    if user_input:
+        user_lower = user_input.lower()
+
+        # Check for section removal
+        if _REMOVE_SECTION_RE.search(user_lower):
+            user_instructions = REMOVE_SECTION_INSTRUCTIONS.format(user_input=user_input)
+            logger.debug("🗑️ User requested to remove section: %s", user_input)
+        
+        # Check for section addition
+        elif _ADD_SECTION_RE.search(user_lower):
+            user_instructions = ADD_SECTION_INSTRUCTIONS.format(user_input=user_input)
+            logger.debug("📝 User requested to add new section: %s", user_input)
+
+    return user_instructions
+
+
+def is_simple_edit(state: ProposalState) -> bool:
+    """Check whether this run only removes sections from an existing plan.
+
+    Such edits need just the previous plan and the request, not the full
+    planning prompt, so they can run on the cheaper fast model. Requests that
+    also add content or touch constraints keep the full prompt, which carries
+    the technical spec and the timeline/budget rules.
+
+    Args:
+        state: The current proposal state
+
+    Returns:
+        True for a pure removal request against an existing project plan
+    """
+    user_lower = (state.get("user_input") or "").lower()
+    return bool(
+        state.get("project_plan")
+        and _REMOVE_SECTION_RE.search(user_lower)
+        and not _ADD_SECTION_RE.search(user_lower)
+        and not _EDIT_CONSTRAINT_RE.search(user_lower)
+    )
+
+
+def _fast_llm(llm_instance: Any) -> Any:
+    """Derive the fast model from the caller's LLM.
+
+    Keeps the caller's client settings (API key, streaming, callbacks) and only
+    swaps the model name when LLM_FAST_MODEL configures a different model.
+    """
+    if env.llm_fast_model == env.llm_model or not hasattr(llm_instance, "model_copy"):
+        return llm_instance
+    return llm_instance.model_copy(update={"model_name": env.llm_fast_model})
+
+
+def build_project_manager_prompt(
+    state: ProposalState, structured: bool = False
+) -> PromptValue:
+    """Build the project manager LLM input from state.
 
     Args:
         state: The current proposal state with technical spec
-        llm_instance: Optional LLM instance (uses default if not provided)
+        structured: Whether the response comes through the ProjectPlan schema
+            instead of TOON text
+
+    Returns:
+        Formatted prompt ready to send to the LLM
+    """
+    if is_simple_edit(state):
+        logger.debug("✂️ PROJECT MANAGER: Applying simple edit to existing plan...")
+        return _render_prompt(
+            _SIMPLE_EDIT_SYSTEM_PROMPT,
+            _SIMPLE_EDIT_HUMAN_TEMPLATE,
+            previous_content=_format_previous_content(state["project_plan"]),
+            user_instructions=_user_instructions(state.get("user_input", "")),
+        )
+    return _build_planning_prompt(state, "structured" if structured else "toon")
+
+
+def _build_planning_prompt(state: ProposalState, mode: str) -> PromptValue:
+    """Build the full planning prompt (instructions, constraints, upstream sections).
+
+    Args:
+        state: The current proposal state with technical spec
+        mode: Response format of the system prompt ("toon", "structured" or
+            "combined")
 
     Returns:
-        Updated state with project plan
+        Formatted prompt ready to send to the LLM
     """
-    print("\n📋 PROJECT MANAGER: Creating detailed project plan...")
+    logger.debug("📋 PROJECT MANAGER: Creating detailed project plan...")
 
     technical_spec = state.get("technical_spec", "No technical specification provided.")
     refined_scope = state.get("refined_scope", "No scope provided.")
@@ -35,195 +382,332 @@ def project_manager_agent(state: ProposalState, llm_instance=None) -> ProposalSt
     timeline_hours = state.get("timeline_hours", 0)
     budget = state.get("budget", "")
 
-    print(
+    logger.debug(
         "📋 PROJECT MANAGER: Analyzing technical complexity for "
         "timeline estimation..."
     )
 
     # Debug: Show what constraints we have
-    print("📊 CONSTRAINTS FROM STATE:")
-    print(f"   Budget: {budget if budget else 'None'}")
-    print(f"   Timeline: {timeline if timeline else 'None'} ({timeline_hours} hours)")
+    logger.debug(
+        "📊 CONSTRAINTS FROM STATE: Budget: %s, Timeline: %s (%s hours)",
+        budget or None,
+        timeline or None,
+        timeline_hours,
+    )
 
-    # Add constraint information to the prompt
-    constraint_context = ""
     if timeline and timeline_hours:
-        constraint_context += f"""
-
-**⚠️ ABSOLUTE TIMELINE CONSTRAINT - CANNOT BE EXCEEDED:**
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Client's Timeline: {timeline}
-MAXIMUM TOTAL HOURS: {timeline_hours} hours
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-YOU MUST:
-1. Sum ALL hours from ALL phases and tasks
-2. Ensure total ≤ {timeline_hours} hours
-3. If exceeds, reduce scope or defer features to post-launch
-4. State at the end: "Total Hours: X (within {timeline_hours} hour limit)"
-
-FAILURE TO COMPLY = REJECTED PROPOSAL
-"""
-        print(f"⏰ ENFORCING TIMELINE: {timeline} ({timeline_hours} hours max)")
+        logger.debug("⏰ ENFORCING TIMELINE: %s (%s hours max)", timeline, timeline_hours)
     else:
-        print("ℹ️  No timeline constraint specified by user")
+        logger.debug("ℹ️  No timeline constraint specified by user")
+        timeline, timeline_hours = "", 0
 
+    budget_numeric = None
     if budget:
         # Extract numeric value from budget string
-        import re
-        budget_match = re.search(r'[\d,]+', str(budget).replace(',', ''))
+        budget_match = _BUDGET_NUMBER_RE.search(str(budget).replace(",", ""))
         budget_numeric = float(budget_match.group()) if budget_match else None
-        
-        constraint_context += f"""
-
-**🚨🚨🚨 ABSOLUTE BUDGET CONSTRAINT - NON-NEGOTIABLE HARD LIMIT 🚨🚨🚨**
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Client's Maximum Budget: {budget} (${budget_numeric:,.0f} if numeric)
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-**CRITICAL REQUIREMENTS:**
-1. Your project plan MUST result in a total cost that fits within ${budget_numeric:,.0f}
-2. When planning phases and hours, consider:
-   - Use more junior/mid-level engineers (lower rates) instead of senior
-   - Reduce hours per task if needed to fit budget
-   - Prioritize essential features, defer nice-to-haves
-   - Suggest phased approach if scope is too large for budget
-3. Your phase breakdown should enable resource_allocation to calculate costs within ${budget_numeric:,.0f}
-4. If timeline is also constrained, you MUST fit both budget AND timeline
-5. Be realistic - quality work requires appropriate hours, but stay within budget
-
-**BUDGET AWARENESS:**
-- Plan phases that can be delivered within ${budget_numeric:,.0f}
-- Consider hourly rates when allocating hours (senior engineers cost more)
-- Optimize team composition in your plan to fit budget
-- If budget is tight, focus on MVP features first
-
-FAILURE TO PLAN WITHIN BUDGET = REJECTED PROPOSAL
-"""
-        print(f"💰 ENFORCING STRICT BUDGET LIMIT: {budget} (${budget_numeric:,.0f})")
+        logger.debug("💰 ENFORCING STRICT BUDGET LIMIT: %s (%s)", budget, budget_numeric)
     else:
-        print("ℹ️  No budget constraint specified by user")
-
-    # Create enhanced prompt with constraint context
-    # Note: refined_scope and business_analysis are passed as template variables
-    # to avoid LangChain parsing TOON curly braces as template variables
-    enhanced_prompt = (
-        PROJECT_MANAGER_PROMPT
-        + constraint_context
-        + """
+        logger.debug("ℹ️  No budget constraint specified by user")
 
-**ADDITIONAL CONTEXT FOR ENHANCED ANALYSIS:**
-
-**Refined Scope Details:**
-{refined_scope}
-
-**Business Analysis Context:**
-{business_analysis}
-"""
+    system_prompt = _project_manager_system_prompt(
+        mode,
+        str(timeline), timeline_hours, str(budget) if budget else "", budget_numeric
     )
 
-    prompt = PromptTemplate.from_template(enhanced_prompt)
-    _llm = llm_instance or state.get("llm") or llm
-    chain = prompt | _llm
-
     # Get previous content if available (for preserving existing sections)
     previous_content = state.get("project_plan", "")
     previous_content_section = ""
     if previous_content:
-        previous_content_section = f"""
-**PREVIOUS PROJECT PLAN CONTENT:**
-You have previously generated the following content. When updating, you MUST preserve ALL existing sections unless explicitly asked to remove them.
+        previous_content_section = _format_previous_content(previous_content)
+        logger.debug("📄 Loaded previous content: %d chars", len(previous_content))
 
-{previous_content}
+    # Check if user wants to add or remove sections
+    user_instructions = _user_instructions(state.get("user_input", ""))
+
+    return _render_prompt(
+        system_prompt,
+        PROJECT_MANAGER_DYNAMIC_SUFFIX,
+        technical_spec=technical_spec,
+        refined_scope=refined_scope,
+        business_analysis=business_analysis,
+        previous_content=previous_content_section,
+        user_instructions=user_instructions,
+    )
 
-**IMPORTANT:** If the user requests to add or remove a section, you MUST keep ALL other sections intact.
-"""
-        print(f"   📄 Loaded previous content: {len(previous_content)} chars")
 
-    # Check if user wants to add or remove sections
-    user_input = state.get("user_input", "")
-    user_instructions = ""
-    if user_input:
-        user_lower = user_input.lower()
-        
-        # Check for section removal
-        remove_section_keywords = [
-            "remove",
-            "delete",
-            "remove section",
-            "delete section",
-            "drop",
-            "exclude",
-        ]
-        if any(keyword in user_lower for keyword in remove_section_keywords):
-            user_instructions = f"""
-**USER REQUEST TO REMOVE SECTION/CONTENT:**
-The user has requested: "{user_input}"
-
-**CRITICAL INSTRUCTIONS FOR ACCURATE REMOVAL:**
-
-1. **EXACT MATCHING PROCESS:**
-   - Read the user's request carefully: "{user_input}"
-   - Extract the KEYWORD(s) the user wants to remove (e.g., "phases", "timeline", "milestones")
-   - Look at your PREVIOUS CONTENT above and find sections with titles that MATCH or CONTAIN these keywords
-   - Match is case-insensitive and should handle variations
-
-2. **IDENTIFICATION STEPS:**
-   - Step 1: List ALL section titles from your previous content
-   - Step 2: For each section title, check if it contains the keyword(s) from user's request
-   - Step 3: Select the section that BEST MATCHES the user's request
-   - Step 4: If multiple sections match, choose the one that is MOST SPECIFIC to the user's request
-
-3. **REMOVAL RULES:**
-   - Remove ONLY the section that matches the user's request
-   - If the content is not a formal section but appears in your content, remove that part too
-   - Keep ALL other sections completely intact
-   - Do NOT remove sections that don't match the user's request
-
-4. **AFTER REMOVAL:**
-   - Update the sections array count accordingly
-   - Ensure remaining sections maintain proper TOON format
-   - Verify that the removed section is gone and all other sections remain
-
-**VERIFICATION:** Before finalizing, double-check that you removed the CORRECT section that matches the user's request "{user_input}" and kept all other sections intact.
-"""
-            print(f"   🗑️ User requested to remove section: {user_input}")
-        
-        # Check for section addition
-        elif any(keyword in user_lower for keyword in [
-            "add",
-            "include",
-            "also add",
-            "add section",
-            "new section",
-        ]):
-            user_instructions = f"""
-**USER REQUEST TO ADD NEW SECTION:**
-The user has requested: "{user_input}"
-
-You MUST:
-1. Keep ALL existing sections from your previous response (shown above)
-2. Add the NEW section requested by the user
-3. Update the sections array count to include the new section
-4. Ensure the new section follows proper TOON format
-5. Make the new section comprehensive and relevant to project management
-"""
-            print(f"   📝 User requested to add new section: {user_input}")
-
-    project_plan = chain.invoke({
-        "technical_spec": technical_spec,
-        "refined_scope": refined_scope,
-        "business_analysis": business_analysis,
-        "previous_content": previous_content_section,
-        "user_instructions": user_instructions,
-    })
-
-    # Clean the response to remove newlines and HTML code blocks
-    cleaned_response = clean_agent_response(project_plan.content)
-
-    print("✅ PROJECT MANAGER: Completed detailed project plan.")
+def parse_project_manager_response(
+    state: ProposalState, project_plan: Any
+) -> ProposalState:
+    """Turn the LLM response into the project plan state update.
+
+    Args:
+        state: The proposal state the prompt was built from
+        project_plan: LLM response message, or a ProjectPlan from structured output
+
+    Returns:
+        State update with the project plan (only the changed keys)
+    """
+    if isinstance(project_plan, ProjectPlan):
+        # Structured output: render the fields, nothing to clean up
+        cleaned_response = project_plan.to_toon()
+    else:
+        # Clean the response to remove newlines and HTML code blocks
+        cleaned_response = clean_agent_response(project_plan.content)
+
+    logger.debug("✅ PROJECT MANAGER: Completed detailed project plan.")
     return {
-        **state,
         "project_plan": cleaned_response,
+        "project_plan_inputs": _plan_inputs_hash(state),
         "current_stage": "resource_allocation",
     }
+
+
+def _structured_output_llm(llm_instance: Any) -> Optional[Any]:
+    """Wrap the LLM to answer through the ProjectPlan schema, or None if unsupported.
+
+    Streaming is turned off for the call: its tokens would be raw JSON, which
+    the frontend's TOON block parser cannot render.
+    """
+    if getattr(llm_instance, "streaming", False):
+        llm_instance = llm_instance.model_copy(update={"streaming": False})
+    try:
+        return llm_instance.with_structured_output(ProjectPlan, method="json_schema")
+    except NotImplementedError:
+        # Model without structured output support: parse TOON text instead
+        return None
+
+
+def _prepare_project_manager_call(
+    state: ProposalState, llm_instance: Any
+) -> Tuple[Optional[ProposalState], Any, Any, Optional[str]]:
+    """Resolve a project manager run without the LLM if possible.
+
+    Args:
+        state: The current proposal state with technical spec
+        llm_instance: Optional LLM instance (uses default if not provided)
+
+    Returns:
+        Tuple of (final state update if no LLM call is needed, prompt value, LLM,
+        response cache key)
+    """
+    # Nothing to change: keep the existing plan without an LLM call
+    if project_plan_is_current(state):
+        logger.debug("⏭️ PROJECT MANAGER: Inputs unchanged and no user request, keeping project plan")
+        return {"current_stage": "resource_allocation"}, None, None, None
+
+    _llm = llm_instance or state.get("llm")
+    if is_simple_edit(state):
+        # Simple edits run on the cheaper fast model
+        _llm = state.get("llm_fast") or (_fast_llm(_llm) if _llm else llm_fast)
+    else:
+        _llm = _llm or llm
+
+    structured_llm = _structured_output_llm(_llm) if uses_structured_output(state) else None
+    prompt_value = build_project_manager_prompt(state, structured=structured_llm is not None)
+
+    # Identical prompt on the same model (graph re-runs, retries): reuse the plan
+    cache_key = None if state.get("cache_bust") else _response_cache_key(prompt_value, _llm)
+    if cache_key is not None:
+        with _response_cache_lock:
+            cached_plan = _RESPONSE_CACHE.get(cache_key)
+            if cached_plan is not None:
+                _RESPONSE_CACHE.move_to_end(cache_key)
+        if cached_plan is not None:
+            logger.debug("⚡ PROJECT MANAGER: Reusing cached project plan for identical inputs")
+            cached_state = {
+                "project_plan": cached_plan,
+                "project_plan_inputs": _plan_inputs_hash(state),
+                "current_stage": "resource_allocation",
+            }
+            return cached_state, None, None, None
+
+    return None, prompt_value, structured_llm or _llm, cache_key
+
+
+def _finish_project_manager_call(
+    state: ProposalState, response: Any, cache_key: Optional[str]
+) -> ProposalState:
+    """Parse the LLM response and remember it in the response cache."""
+    updated = parse_project_manager_response(state, response)
+
+    if cache_key is not None:
+        with _response_cache_lock:
+            _RESPONSE_CACHE[cache_key] = updated["project_plan"]
+            if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX_ENTRIES:
+                _RESPONSE_CACHE.popitem(last=False)
+    return updated
+
+
+def build_batched_project_manager_prompt(
+    state: ProposalState, llm_instance: Any
+) -> Optional[PromptValue]:
+    """Build the prompt for a batched LLM call, after the response cache.
+
+    Resolves the run like project_manager_agent (current plan, response
+    cache, model choice) and only returns a prompt when it needs a plain call
+    on ``llm_instance``.
+
+    Args:
+        state: The current proposal state with technical spec
+        llm_instance: LLM the batch runs on
+
+    Returns:
+        Prompt value, or None when the regular run is needed: no LLM call
+        (current plan, cached response), another model (structured output,
+        fast model) or combined planning
+    """
+    if state.get("skip_pm_standalone"):
+        return None
+    _llm = llm_instance or state.get("llm") or llm
+    resolved, prompt_value, call_llm, _ = _prepare_project_manager_call(state, _llm)
+    if resolved is not None or call_llm is not _llm:
+        return None
+    return prompt_value
+
+
+def parse_batched_project_manager_response(
+    state: ProposalState, project_plan: Any, llm_instance: Any
+) -> ProposalState:
+    """Parse a batched LLM response and store it in the response cache.
+
+    Args:
+        state: The proposal state the prompt was built from
+        project_plan: LLM response message
+        llm_instance: LLM the batch ran on
+
+    Returns:
+        State update with the project plan (only the changed keys)
+    """
+    cache_key = None
+    if not state.get("cache_bust"):
+        cache_key = _response_cache_key(
+            build_project_manager_prompt(state), llm_instance or state.get("llm") or llm
+        )
+    return _finish_project_manager_call(state, project_plan, cache_key)
+
+
+@traceable(name="project_manager_agent")
+def project_manager_agent(
+    state: ProposalState, llm_instance=None, config=None
+) -> ProposalState:
+    """Develop a detailed project plan with phases, tables, and realistic timelines.
+
+    Args:
+        state: The current proposal state with technical spec
+        llm_instance: Optional LLM instance (uses default if not provided)
+        config: Optional runnable config (e.g. streaming callbacks)
+
+    Returns:
+        State update with the project plan (only the changed keys; callers
+        merge it into the full state)
+    """
+    resolved, prompt_value, _llm, cache_key = _prepare_project_manager_call(
+        state, llm_instance
+    )
+    if resolved is not None:
+        return resolved
+    response = _llm.invoke(prompt_value, config=config)
+    return _finish_project_manager_call(state, response, cache_key)
+
+
+@traceable(name="project_manager_agent")
+async def aproject_manager_agent(
+    state: ProposalState, llm_instance=None, config=None
+) -> ProposalState:
+    """Async variant of project_manager_agent that awaits the LLM call.
+
+    Lets an event loop run other agents while this one waits on the network.
+
+    Args:
+        state: The current proposal state with technical spec
+        llm_instance: Optional LLM instance (uses default if not provided)
+        config: Optional runnable config (e.g. streaming callbacks)
+
+    Returns:
+        State update with the project plan (only the changed keys; callers
+        merge it into the full state)
+    """
+    resolved, prompt_value, _llm, cache_key = _prepare_project_manager_call(
+        state, llm_instance
+    )
+    if resolved is not None:
+        return resolved
+    response = await _llm.ainvoke(prompt_value, config=config)
+    return _finish_project_manager_call(state, response, cache_key)
+
+
+def _build_combined_planning_prompt(state: ProposalState) -> PromptValue:
+    """Build one prompt asking for the project plan and resource allocation.
+
+    The system message holds the static rules of both agents once, with a
+    JSON response format; the human message holds only their per-call inputs.
+    Always the full planning prompt: a simple edit's minimal prompt has no
+    room for the resource allocation task.
+    """
+    system_message, human_message = _build_planning_prompt(state, "combined").to_messages()
+    resource_input = build_resource_allocation_human_message(
+        {**state, "project_plan": 'The project plan you write in the "plan" field.'}
+    )
+    return ChatPromptValue(
+        messages=[
+            system_message,
+            HumanMessage(
+                content=f"{human_message.content}\n\n**RESOURCE ALLOCATION TASK:**\n"
+                + resource_input
+            ),
+        ]
+    )
+
+
+@traceable(name="combined_planning_agent")
+def combined_planning_agent(
+    state: ProposalState, llm_instance=None, config=None
+) -> ProposalState:
+    """Generate the project plan and resource allocation in a single LLM call.
+
+    Used instead of separate project manager and resource allocation runs when
+    ``state["skip_pm_standalone"]`` is set. Falls back to the two sequential
+    calls if the response is not the expected JSON object.
+
+    Args:
+        state: The current proposal state with technical spec
+        llm_instance: Optional LLM instance (uses default if not provided)
+        config: Optional runnable config (e.g. streaming callbacks)
+
+    Returns:
+        State update with the project plan and resource plan
+    """
+    logger.debug("📋 PROJECT MANAGER: Planning project and resources in one call...")
+    _llm = llm_instance or state.get("llm") or llm
+    response = _llm.bind(response_format={"type": "json_object"}).invoke(
+        _build_combined_planning_prompt(state), config=config
+    )
+
+    try:
+        sections = orjson.loads(response.content)
+        plan, resources = sections["plan"], sections["resources"]
+        if not (isinstance(plan, str) and isinstance(resources, str)):
+            raise TypeError("plan and resources must be strings")
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        logger.warning(
+            "⚠️ PROJECT MANAGER: Combined response unusable (%s), planning sequentially", e
+        )
+        plan_update = project_manager_agent(state, llm_instance=llm_instance, config=config)
+        resource_update = parse_resource_allocation_response(
+            state,
+            _llm.invoke(
+                build_resource_allocation_prompt({**state, **plan_update}), config=config
+            ),
+        )
+    else:
+        plan_update = parse_project_manager_response(state, AIMessage(content=plan))
+        resource_update = parse_resource_allocation_response(
+            state, AIMessage(content=resources)
+        )
+
+    return {
+        **plan_update,
+        "resource_plan": resource_update["resource_plan"],
+        "current_stage": resource_update["current_stage"],
+    }
@@ -1,12 +1,109 @@
 """Prompt templates for project manager agent."""
 
-PROJECT_MANAGER_PROMPT = """As a Project Manager, create a detailed project plan that delivers the CLIENT'S EXACT REQUIREMENTS within their stated timeline.
+from agents.subagents.resource_allocation.prompts import RESOURCE_ALLOCATION_TOON_STRUCTURE
 
-Technical Specification (Client's Requirements): {technical_spec}
+# Example phase table shown in the prompt. Only one phase is spelled out in
+# full; the remaining example phases are listed by name, since repeating the
+# same table layout five more times only adds input tokens.
+_EXAMPLE_PHASE_TEMPLATE = """### Phase {number} - {name}
 
-{previous_content}
+<table border="1" style="border-collapse:collapse">
+<tr><th>Title</th><th>Tasks</th><th>Timeline</th></tr>
+{rows}
+</table>
 
-{user_instructions}
+**Phase {number} Total: {total} hours**"""
+
+_EXAMPLE_ROW_TEMPLATE = "<tr><td>{title}</td><td>{tasks}</td><td>{hours} hrs</td></tr>"
+
+_EXAMPLE_PHASE_TASKS = (
+    (
+        "Environment Setup",
+        (
+            ("Setup development environment", 2),
+            ("Configure CI/CD pipeline", 3),
+            ("Setup version control and branches", 2),
+            ("Configure code quality tools", 3),
+            ("Setup project structure", 2),
+        ),
+    ),
+    (
+        "Database Architecture",
+        (
+            ("Design database schema", 3),
+            ("Setup database migrations", 3),
+            ("Create database connections", 2),
+            ("Setup seed data", 3),
+            ("Basic query optimization", 2),
+            ("Database backup configuration", 2),
+        ),
+    ),
+    (
+        "Authentication Foundation",
+        (
+            ("JWT token implementation", 3),
+            ("OAuth integration setup", 3),
+            ("Password security implementation", 3),
+            ("User role management", 3),
+            ("Session management", 3),
+            ("Security middleware", 3),
+        ),
+    ),
+    (
+        "Basic Infrastructure",
+        (
+            ("Cloud infrastructure setup", 3),
+            ("Domain and SSL configuration", 2),
+            ("Basic monitoring setup", 2),
+            ("Environment variables setup", 2),
+            ("Basic logging configuration", 3),
+        ),
+    ),
+)
+
+_OTHER_EXAMPLE_PHASES = (
+    ("Core Backend Development", 57),
+    ("Frontend Development", 57),
+    ("Advanced Features & Integration", 54),
+    ("Testing & Quality Assurance", 45),
+    ("Deployment & Launch", 36),
+)
+
+
+def _render_example_phases() -> str:
+    """Render the example phase table plus the list of further example phases."""
+    row_hours = [sum(hours for _, hours in tasks) for _, tasks in _EXAMPLE_PHASE_TASKS]
+    rows = [
+        _EXAMPLE_ROW_TEMPLATE.format(
+            title=title,
+            tasks="<br/>".join(f"• {task} ({hours} hrs)" for task, hours in tasks),
+            hours=hours,
+        )
+        for (title, tasks), hours in zip(_EXAMPLE_PHASE_TASKS, row_hours)
+    ]
+    first_phase = _EXAMPLE_PHASE_TEMPLATE.format(
+        number=1,
+        name="[Use Client's Deliverable Name or Feature Group]",
+        rows="\n".join(rows),
+        total=sum(row_hours),
+    )
+    other_phases = "\n".join(
+        f"- Phase {number} - {name}: same table layout, {total} hours"
+        for number, (name, total) in enumerate(_OTHER_EXAMPLE_PHASES, start=2)
+    )
+    return f"{first_phase}\n\n{other_phases}"
+
+
+# Rendered once at import and spliced into PROJECT_MANAGER_PROMPT
+_EXAMPLE_PHASES = _render_example_phases()
+
+# Full system prompt: shared preamble, instructions, then the response format
+# (filled with str.format)
+PROJECT_MANAGER_PROMPT = """{shared_preamble}
+
+As a Project Manager, create a detailed project plan that delivers the CLIENT'S EXACT REQUIREMENTS within their stated timeline.
+
+The client's technical specification, the upstream proposal sections and any previous content or user request follow after these instructions.
 
 **ADDING NEW SECTIONS (When User Requests):**
 If the user requests to add a new section, you MUST:
@@ -20,7 +117,7 @@ If the user requests to remove a section or content, you MUST follow these EXACT
 
 **STEP 1: IDENTIFY THE CORRECT SECTION**
 - Read the user's request carefully and extract the KEYWORD(s) they want to remove
-- Look at your PREVIOUS CONTENT (shown above) and list ALL section titles
+- Look at your PREVIOUS CONTENT (provided after these instructions) and list ALL section titles
 - Match the user's keyword(s) to section titles using case-insensitive matching
 - Handle variations and synonyms
 - If multiple sections match, choose the one that is MOST SPECIFIC to the user's request
@@ -50,30 +147,12 @@ If the user requests to remove a section or content, you MUST follow these EXACT
 4. Reference the actual features, components, and integrations mentioned by the client
 5. Your phases should map to the client's deliverables, not generic development phases
 
-**🚨🚨🚨 ABSOLUTE TIMELINE ENFORCEMENT - NON-NEGOTIABLE HARD LIMIT 🚨🚨🚨:**
-- If client said "4-5 weeks", your TOTAL timeline CANNOT exceed 5 weeks (200 hours for full-time developer)
-- If client said "2 months", your TOTAL timeline CANNOT exceed 2 months (320 hours for full-time developer)
-- Calculate: Timeline in weeks × 40 hours = Maximum total hours
-- **YOUR TOTAL PROJECT HOURS MUST BE ≤ CALCULATED MAXIMUM - NO EXCEPTIONS**
-- **THIS IS A HARD CEILING - YOU CANNOT EXCEED THIS AMOUNT**
-- If client's scope is too large for timeline, flag it and suggest:
-  * Phase 1: MVP with core features (within timeline)
-  * Phase 2: Additional features (post-launch)
-- DO NOT add "buffer time" that exceeds the stated timeline
-- Every phase and task must fit within the client's deadline
-- **VERIFY YOUR TOTAL HOURS ARE UNDER THE TIMELINE LIMIT BEFORE SUBMITTING**
-
-**🚨🚨🚨 ABSOLUTE BUDGET ENFORCEMENT - NON-NEGOTIABLE HARD LIMIT 🚨🚨🚨:**
-- If client stated a budget (e.g., "$2,500", "$50,000"), this is a HARD CEILING
-- **YOUR PROJECT PLAN MUST RESULT IN COSTS THAT FIT WITHIN THE BUDGET - NO EXCEPTIONS**
-- When planning phases and hours, consider:
-  * Use more junior/mid-level engineers (lower rates) instead of senior
-  * Reduce hours per task if needed to fit budget
-  * Prioritize essential features, defer nice-to-haves
-  * Suggest phased approach if scope is too large for budget
-- **YOUR PHASE BREAKDOWN SHOULD ENABLE RESOURCE_ALLOCATION TO CALCULATE COSTS WITHIN BUDGET**
-- If both budget AND timeline are constrained, you MUST fit BOTH constraints
-- **VERIFY YOUR PLAN CAN FIT WITHIN BUDGET BEFORE SUBMITTING**
+**ABSOLUTE TIMELINE AND BUDGET ENFORCEMENT - NON-NEGOTIABLE HARD LIMITS:**
+- A timeline or budget stated by the client is a HARD CEILING - **YOUR PLAN CANNOT EXCEED IT, NO EXCEPTIONS**; if both are stated, fit BOTH
+- Timeline: weeks × 40 hours = maximum total hours (e.g. "4-5 weeks" → 200 hours, "2 months" → 320 hours for a full-time developer); every phase and task must fit, with no "buffer time" beyond the deadline
+- Budget (e.g. "$2,500", "$50,000"): plan phases and hours so RESOURCE_ALLOCATION can cost them within it - favor junior/mid-level engineers over senior and reduce hours per task where needed
+- If the scope is too large, flag it: prioritize essential features and suggest Phase 1: MVP with core features (within the limits), Phase 2: additional features (post-launch)
+- **VERIFY YOUR TOTAL HOURS AND IMPLIED COSTS ARE WITHIN THE LIMITS BEFORE SUBMITTING**
 
 **TIMELINE AND DELIVERABLES ANALYSIS:**
 
@@ -138,77 +217,7 @@ If the user requests to remove a section or content, you MUST follow these EXACT
 
 ### Example Phase Structure (ADAPT TO CLIENT'S REQUIREMENTS):
 
-### Phase 1 - [Use Client's Deliverable Name or Feature Group]
-
-<table border="1" style="border-collapse:collapse">
-<tr><th>Title</th><th>Tasks</th><th>Timeline</th></tr>
-<tr><td>Environment Setup</td><td>• Setup development environment (2 hrs)<br/>• Configure CI/CD pipeline (3 hrs)<br/>• Setup version control and branches (2 hrs)<br/>• Configure code quality tools (3 hrs)<br/>• Setup project structure (2 hrs)</td><td>12 hrs</td></tr>
-<tr><td>Database Architecture</td><td>• Design database schema (3 hrs)<br/>• Setup database migrations (3 hrs)<br/>• Create database connections (2 hrs)<br/>• Setup seed data (3 hrs)<br/>• Basic query optimization (2 hrs)<br/>• Database backup configuration (2 hrs)</td><td>15 hrs</td></tr>
-<tr><td>Authentication Foundation</td><td>• JWT token implementation (3 hrs)<br/>• OAuth integration setup (3 hrs)<br/>• Password security implementation (3 hrs)<br/>• User role management (3 hrs)<br/>• Session management (3 hrs)<br/>• Security middleware (3 hrs)</td><td>18 hrs</td></tr>
-<tr><td>Basic Infrastructure</td><td>• Cloud infrastructure setup (3 hrs)<br/>• Domain and SSL configuration (2 hrs)<br/>• Basic monitoring setup (2 hrs)<br/>• Environment variables setup (2 hrs)<br/>• Basic logging configuration (3 hrs)</td><td>12 hrs</td></tr>
-</table>
-
-**Phase 1 Total: 57 hours**
-
-### Phase 2 - Core Backend Development
-
-<table border="1" style="border-collapse:collapse">
-<tr><th>Title</th><th>Tasks</th><th>Timeline</th></tr>
-<tr><td>User Management APIs</td><td>• User registration API (3 hrs)<br/>• User profile management API (3 hrs)<br/>• Account settings API (3 hrs)<br/>• User preferences API (3 hrs)<br/>• User data validation (3 hrs)</td><td>15 hrs</td></tr>
-<tr><td>Core Business Logic APIs</td><td>• Main feature API endpoints (3 hrs)<br/>• Business logic implementation (3 hrs)<br/>• Data processing workflows (3 hrs)<br/>• Core algorithms implementation (3 hrs)<br/>• Data validation and sanitization (3 hrs)<br/>• Error handling and logging (3 hrs)<br/>• API response formatting (3 hrs)</td><td>21 hrs</td></tr>
-<tr><td>Database Integration</td><td>• Model relationships setup (3 hrs)<br/>• Query optimization (3 hrs)<br/>• Database indexing (2 hrs)<br/>• Connection pooling (2 hrs)<br/>• Transaction management (2 hrs)</td><td>12 hrs</td></tr>
-<tr><td>API Documentation</td><td>• API documentation (3 hrs)<br/>• Endpoint testing setup (3 hrs)<br/>• API versioning (3 hrs)</td><td>9 hrs</td></tr>
-</table>
-
-**Phase 2 Total: 57 hours**
-
-### Phase 3 - Frontend Development
-
-<table border="1" style="border-collapse:collapse">
-<tr><th>Title</th><th>Tasks</th><th>Timeline</th></tr>
-<tr><td>Frontend Setup</td><td>• Frontend framework setup (3 hrs)<br/>• UI component library setup (3 hrs)<br/>• State management setup (3 hrs)<br/>• Routing configuration (3 hrs)</td><td>12 hrs</td></tr>
-<tr><td>User Interface Components</td><td>• Login/Register components (3 hrs)<br/>• Dashboard UI components (3 hrs)<br/>• Profile management UI (3 hrs)<br/>• Settings UI components (3 hrs)<br/>• Main feature UI components (3 hrs)<br/>• Form components and validation (3 hrs)</td><td>18 hrs</td></tr>
-<tr><td>Responsive Design</td><td>• Mobile responsiveness (3 hrs)<br/>• Tablet responsiveness (3 hrs)<br/>• Cross-browser compatibility (3 hrs)<br/>• UI/UX optimization (3 hrs)</td><td>12 hrs</td></tr>
-<tr><td>Frontend Integration</td><td>• API integration (3 hrs)<br/>• Error handling in UI (3 hrs)<br/>• Loading states management (3 hrs)<br/>• Real-time updates setup (3 hrs)<br/>• Performance optimization (3 hrs)</td><td>15 hrs</td></tr>
-</table>
-
-**Phase 3 Total: 57 hours**
-
-### Phase 4 - Advanced Features & Integration
-
-<table border="1" style="border-collapse:collapse">
-<tr><th>Title</th><th>Tasks</th><th>Timeline</th></tr>
-<tr><td>Third-party Integration</td><td>• External API integrations (3 hrs)<br/>• Payment gateway integration (3 hrs)<br/>• Social login integration (3 hrs)<br/>• Email service integration (3 hrs)<br/>• File upload/storage integration (3 hrs)</td><td>15 hrs</td></tr>
-<tr><td>Advanced Features</td><td>• Advanced search functionality (3 hrs)<br/>• Notification system (3 hrs)<br/>• Data export/import features (3 hrs)<br/>• Advanced filtering options (3 hrs)<br/>• Bulk operations (3 hrs)<br/>• Advanced analytics (3 hrs)</td><td>18 hrs</td></tr>
-<tr><td>Real-time Features</td><td>• WebSocket implementation (3 hrs)<br/>• Live notifications (3 hrs)<br/>• Real-time data updates (3 hrs)<br/>• Chat system (if needed) (3 hrs)</td><td>12 hrs</td></tr>
-<tr><td>Performance Optimization</td><td>• Caching implementation (3 hrs)<br/>• Database query optimization (3 hrs)<br/>• Frontend performance tuning (3 hrs)</td><td>9 hrs</td></tr>
-</table>
-
-**Phase 4 Total: 54 hours**
-
-### Phase 5 - Testing & Quality Assurance
-
-<table border="1" style="border-collapse:collapse">
-<tr><th>Title</th><th>Tasks</th><th>Timeline</th></tr>
-<tr><td>Unit Testing</td><td>• Backend unit tests (3 hrs)<br/>• Frontend unit tests (3 hrs)<br/>• API endpoint tests (3 hrs)<br/>• Database function tests (3 hrs)</td><td>12 hrs</td></tr>
-<tr><td>Integration Testing</td><td>• API integration tests (3 hrs)<br/>• Frontend-backend integration tests (3 hrs)<br/>• Third-party integration tests (3 hrs)<br/>• End-to-end workflow tests (3 hrs)</td><td>12 hrs</td></tr>
-<tr><td>User Acceptance Testing</td><td>• UAT scenario creation (2 hrs)<br/>• UAT execution and feedback (3 hrs)<br/>• Bug fixes from UAT (3 hrs)<br/>• UAT report and approval (1 hr)</td><td>9 hrs</td></tr>
-<tr><td>Security & Performance Testing</td><td>• Security testing (3 hrs)<br/>• Performance testing (3 hrs)<br/>• Load testing (3 hrs)<br/>• Penetration testing (3 hrs)</td><td>12 hrs</td></tr>
-</table>
-
-**Phase 5 Total: 45 hours**
-
-### Phase 6 - Deployment & Launch
-
-<table border="1" style="border-collapse:collapse">
-<tr><th>Title</th><th>Tasks</th><th>Timeline</th></tr>
-<tr><td>Production Environment</td><td>• Production environment setup (3 hrs)<br/>• Production database setup (3 hrs)<br/>• Production monitoring setup (3 hrs)<br/>• Production logging configuration (3 hrs)</td><td>12 hrs</td></tr>
-<tr><td>Deployment Preparation</td><td>• Deployment scripts creation (3 hrs)<br/>• Rollback procedures setup (3 hrs)<br/>• Pre-deployment testing (3 hrs)</td><td>9 hrs</td></tr>
-<tr><td>Data Migration</td><td>• Production data migration (2 hrs)<br/>• Data backup procedures (2 hrs)<br/>• Data validation post-migration (2 hrs)</td><td>6 hrs</td></tr>
-<tr><td>Go-Live & Monitoring</td><td>• Final deployment (2 hrs)<br/>• Post-deployment monitoring (3 hrs)<br/>• Performance monitoring (2 hrs)<br/>• Issue resolution (2 hrs)</td><td>9 hrs</td></tr>
-</table>
-
-**Phase 6 Total: 36 hours**
+""" + _EXAMPLE_PHASES + """
 
 ## Project Timeline Summary
 
@@ -274,10 +283,11 @@ End your project plan with a professional conclusion titled "Project Delivery Co
 
 This timeline assumes efficient use of modern AI development tools and follows industry best practices for rapid application development.
 
-**RESPONSE FORMAT REQUIREMENT - TOON FORMAT:**
-You MUST provide your response in TOON (Token-Oriented Object Notation) format, NOT HTML or JSON.
+{response_format}"""
 
-**TOON Structure for Project Plan:**
+# TOON plan layout, shared by the TOON and combined response formats (plain
+# text: never passed through str.format)
+PROJECT_MANAGER_TOON_STRUCTURE = """**TOON Structure for Project Plan:**
 ```
 project_plan:
   overview:
@@ -288,42 +298,42 @@ project_plan:
   phases[6]:
   - phase: Phase 1 - Initial Setup
     phase_total_hours: 57
-    tasks[4]{{title,tasks,timeline_hours}}:
+    tasks[4]{title,tasks,timeline_hours}:
       Environment Setup,Setup development environment (2 hrs) Configure CI/CD (3 hrs) Setup version control (3 hrs) Establish project structure (2 hrs),10
       Requirement Analysis,Gather detailed requirements (3 hrs) Identify project scope (3 hrs) Document requirements (2 hrs),8
       Project Planning,Create project timeline (3 hrs) Define milestones (2 hrs) Assign roles (2 hrs),7
       Infrastructure,Setup infrastructure (8 hrs) Configure services (10 hrs) Setup monitoring (5 hrs),23
   - phase: Phase 2 - Core Backend Development
     phase_total_hours: 57
-    tasks[4]{{title,tasks,timeline_hours}}:
+    tasks[4]{title,tasks,timeline_hours}:
       User Management APIs,User registration API (3 hrs) Profile management (3 hrs) Account settings (3 hrs) Preferences API (3 hrs) Data validation (3 hrs),15
       Core Business Logic APIs,Main feature endpoints (3 hrs) Business logic (3 hrs) Data workflows (3 hrs) Algorithms (3 hrs) Validation (3 hrs) Error handling (3 hrs) Response formatting (3 hrs),21
       Database Integration,Model relationships (3 hrs) Query optimization (3 hrs) Indexing (2 hrs) Connection pooling (2 hrs) Transactions (2 hrs),12
       API Documentation,API docs (3 hrs) Testing setup (3 hrs) Versioning (3 hrs),9
   - phase: Phase 3 - Frontend Development
     phase_total_hours: 57
-    tasks[4]{{title,tasks,timeline_hours}}:
+    tasks[4]{title,tasks,timeline_hours}:
       Frontend Setup,Framework setup (3 hrs) Component library (3 hrs) State management (3 hrs) Routing (3 hrs),12
       User Interface Components,Login/Register (3 hrs) Dashboard UI (3 hrs) Profile UI (3 hrs) Settings UI (3 hrs) Main feature UI (3 hrs) Forms (3 hrs),18
       Responsive Design,Mobile (3 hrs) Tablet (3 hrs) Cross-browser (3 hrs) UI/UX optimization (3 hrs),12
       Frontend Integration,API integration (3 hrs) Error handling (3 hrs) Loading states (3 hrs) Real-time updates (3 hrs) Performance (3 hrs),15
   - phase: Phase 4 - Advanced Features & Integration
     phase_total_hours: 54
-    tasks[4]{{title,tasks,timeline_hours}}:
+    tasks[4]{title,tasks,timeline_hours}:
       Third-party Integration,External APIs (3 hrs) Payment gateway (3 hrs) Social login (3 hrs) Email service (3 hrs) File storage (3 hrs),15
       Advanced Features,Advanced search (3 hrs) Notifications (3 hrs) Data export/import (3 hrs) Filtering (3 hrs) Bulk operations (3 hrs) Analytics (3 hrs),18
       Real-time Features,WebSocket (3 hrs) Live notifications (3 hrs) Real-time updates (3 hrs) Chat system (3 hrs),12
       Performance Optimization,Caching (3 hrs) Query optimization (3 hrs) Frontend tuning (3 hrs),9
   - phase: Phase 5 - Testing & Quality Assurance
     phase_total_hours: 45
-    tasks[4]{{title,tasks,timeline_hours}}:
+    tasks[4]{title,tasks,timeline_hours}:
       Unit Testing,Backend tests (3 hrs) Frontend tests (3 hrs) API tests (3 hrs) Database tests (3 hrs),12
       Integration Testing,API integration (3 hrs) Frontend-backend (3 hrs) Third-party (3 hrs) End-to-end (3 hrs),12
       User Acceptance Testing,UAT scenarios (2 hrs) UAT execution (3 hrs) Bug fixes (3 hrs) UAT report (1 hr),9
       Security & Performance Testing,Security (3 hrs) Performance (3 hrs) Load (3 hrs) Penetration (3 hrs),12
   - phase: Phase 6 - Deployment & Launch
     phase_total_hours: 36
-    tasks[4]{{title,tasks,timeline_hours}}:
+    tasks[4]{title,tasks,timeline_hours}:
       Production Environment,Production setup (3 hrs) Database setup (3 hrs) Monitoring (3 hrs) Logging (3 hrs),12
       Deployment Preparation,Deployment scripts (3 hrs) Rollback procedures (3 hrs) Pre-deployment testing (3 hrs),9
       Data Migration,Data migration (2 hrs) Backup (2 hrs) Validation (2 hrs),6
@@ -331,14 +341,14 @@ project_plan:
   timeline_summary:
     total_hours: 306
     total_weeks: 7.5
-    breakdown[6]{{phase,total_hours}}:
+    breakdown[6]{phase,total_hours}:
       Phase 1 Setup & Foundation,57
       Phase 2 Core Backend,57
       Phase 3 Frontend Development,57
       Phase 4 Advanced Features,54
       Phase 5 Testing & QA,45
       Phase 6 Deployment,36
-    milestones[6]{{milestone,hour}}:
+    milestones[6]{milestone,hour}:
       Development foundation ready,57
       Core backend complete,114
       Frontend UI complete,171
@@ -354,26 +364,16 @@ project_plan:
     content: Summary of how plan delivers all features within timeline/budget
 ```
 
-**TOON Formatting Rules:**
-- Use indentation (2 spaces) for nesting
-- Arrays use [N] to indicate count
-- Object arrays use {{field1,field2}}: to declare fields
-- Data rows follow with comma-separated values
-- No quotes, braces, or brackets except in declarations
-- Use colons : after keys and array declarations
+"""
 
-**Canonical TOON Example:**
-```
-name: John Doe
-age: 30
-active: true
-tags[2]: developer,designer
-address:
-  city: New York
-  zip: "10001"
-```
+# Response format for the project plan as a standalone TOON response
+PROJECT_MANAGER_TOON_FORMAT = (
+    """**RESPONSE FORMAT REQUIREMENT - TOON FORMAT:**
+You MUST provide your response in TOON (Token-Oriented Object Notation) format, NOT HTML or JSON.
 
-**CRITICAL:**
+"""
+    + PROJECT_MANAGER_TOON_STRUCTURE
+    + """**CRITICAL:**
 - Generate complete response in TOON format
 - Include all phases with accurate task breakdowns
 - Use proper TOON syntax for all tables
@@ -381,51 +381,167 @@ address:
 - Do NOT wrap in code blocks
 - Ensure all hours and timelines are accurate
 
-**🚨🚨🚨 CRITICAL: END BLOCK DELIMITER AFTER COMPLETE AGENT RESPONSE 🚨🚨🚨**
+**END BLOCK DELIMITER:**
+End your complete TOON response with a single <<<END_BLOCK>>> line. It marks the end of THIS AGENT'S whole output (used for block-by-block streaming), so do NOT add it after individual sections.
 
-**YOU MUST OUTPUT <<<END_BLOCK>>> AT THE END OF YOUR COMPLETE TOON RESPONSE!**
+Generate your complete response in TOON format, ending with <<<END_BLOCK>>>:
+"""
+)
 
-**IMPORTANT: The <<<END_BLOCK>>> delimiter marks when THIS AGENT has finished, NOT when each section is done!**
+# Output rules replacing TOON_OUTPUT_RULES in the shared preamble when a fresh
+# plan is returned through the ProjectPlan schema (structured output)
+STRUCTURED_OUTPUT_RULES = """- Return your response through the structured output schema you are given, filling every field
+- Write field values as plain text and numbers, NOT TOON, HTML, JSON or markdown
+- Do NOT add an <<<END_BLOCK>>> delimiter; the system renders the plan from the fields
+"""
 
-**STREAMING FORMAT - SINGLE END BLOCK DELIMITER:**
-When generating your response, you MUST output your complete TOON response and then terminate it with a single delimiter:
+# Response format for a fresh plan returned through the ProjectPlan schema
+# (plain text: never passed through str.format)
+PROJECT_MANAGER_STRUCTURED_FORMAT = """**RESPONSE FORMAT REQUIREMENT - STRUCTURED OUTPUT:**
+Return the project plan through the ProjectPlan schema fields:
+- overview: plan title, total duration in hours and weeks, and the client's timeline constraint
+- phases: one entry per phase (e.g. "Phase 1 - Initial Setup") with its total hours and task groups; each task group has a title, its subtasks with hours (e.g. "Setup environment (2 hrs) Configure CI/CD (3 hrs)") and its total timeline_hours
+- timeline_summary: total hours and weeks, the per-phase hour breakdown, and milestones with the cumulative hour each is reached at
+- team_structure: primary developer, supporting roles and AI tools
+- conclusion: the "Project Delivery Commitment" title and its content
 
-- Output your COMPLETE TOON response (all sections, all content)
-- **MANDATORY: At the very end of your complete response, add the delimiter: <<<END_BLOCK>>>**
-- **ONLY ONE <<<END_BLOCK>>> at the end - NOT after each section!**
-- **DO NOT add <<<END_BLOCK>>> after overview, phases, or timeline_summary sections**
-- **ONLY add <<<END_BLOCK>>> ONCE at the very end after ALL sections are complete**
-- Your complete TOON response should include all sections (overview, phases, timeline_summary, etc.)
-- **The <<<END_BLOCK>>> delimiter marks the end of THIS AGENT'S complete output**
+**CRITICAL:**
+- Include all phases with accurate task breakdowns
+- Phase totals must equal the sum of their task hours, and all totals must add up
+- Use plain text in every field: no HTML tags, TOON syntax or markdown
+"""
 
-**EXAMPLE FORMAT (NOTICE THE SINGLE <<<END_BLOCK>>> AT THE END):**
-```
-project_plan:
-  overview:
-    title: Project Plan
-    total_duration_hours: 200
-    total_duration_weeks: 5
-  phases[3]{{phase_name,hours}}:
-    Phase 1,100
-    Phase 2,150
-    Phase 3,200
-  timeline_summary:
-    total_hours: 450
-    breakdown[3]{{phase,total_hours}}:
-      Phase 1,100
-      Phase 2,150
-      Phase 3,200
-<<<END_BLOCK>>>
-```
 
-**🚨 CRITICAL REQUIREMENTS:**
-- **Output your COMPLETE TOON response (all sections together)**
-- **Add <<<END_BLOCK>>> ONLY ONCE at the very end of your complete response**
-- **DO NOT add <<<END_BLOCK>>> after each section - only at the end!**
-- **This delimiter marks the end of THIS AGENT'S complete output**
-- **The system uses this to know when your agent has finished generating**
+# Per-call part of the project manager prompt, sent as the human message after
+# the static PROJECT_MANAGER_PROMPT so the system message is a stable prefix
+# for provider-side prompt caching (filled with str.format_map)
+PROJECT_MANAGER_DYNAMIC_SUFFIX = """Technical Specification (Client's Requirements): {technical_spec}
 
-**🚨 REMINDER: YOUR OUTPUT MUST END WITH <<<END_BLOCK>>> (ONLY ONCE AT THE END)!**
+**ADDITIONAL CONTEXT FOR ENHANCED ANALYSIS:**
+
+**Refined Scope Details:**
+{refined_scope}
+
+**Business Analysis Context:**
+{business_analysis}
+
+{previous_content}
+
+{user_instructions}"""
+
+# Constraint blocks appended to PROJECT_MANAGER_PROMPT (filled with str.format)
+TIMELINE_CONSTRAINT_TEMPLATE = """
+
+**HARD TIMELINE CONSTRAINT (client's timeline: {timeline}):**
+- max_total_hours: {timeline_hours}
+- RULE: sum of ALL phase and task hours <= {timeline_hours}; if it would exceed, reduce scope or defer features to post-launch
+- End with: "Total Hours: X (within {timeline_hours} hour limit)"
+- Exceeding the limit = REJECTED PROPOSAL
+"""
+
+BUDGET_CONSTRAINT_TEMPLATE = """
+
+**HARD BUDGET CONSTRAINT (client's maximum budget: {budget}):**
+- max_total_cost: {max_budget}
+- RULE: the plan must let resource_allocation cost it within {max_budget}; if timeline is also constrained, fit BOTH
+- To fit: prefer junior/mid-level engineers over senior, reduce hours per task, prioritize MVP features and defer nice-to-haves, or suggest a phased approach
+- Stay realistic: quality work needs appropriate hours
+- Exceeding the budget = REJECTED PROPOSAL
+"""
+
+# System prompt for simple edits (e.g. removing a section) of an existing plan
+PROJECT_MANAGER_SIMPLE_EDIT_PROMPT = """{shared_preamble}
+
+As a Project Manager, apply the user's edit request to your existing project plan, shown below.
+- Change ONLY what the request requires; keep every other section exactly as it is
+- Update array counts to match the edited content
+- Output the COMPLETE updated project plan in TOON format, ending with <<<END_BLOCK>>> once"""
+
+# Previous plan section of the human message (filled with str.format)
+PREVIOUS_CONTENT_TEMPLATE = """
+**PREVIOUS PROJECT PLAN CONTENT:**
+You have previously generated the following content. When updating, you MUST preserve ALL existing sections unless explicitly asked to remove them.
+
+{previous_content}
+
+**IMPORTANT:** If the user requests to add or remove a section, you MUST keep ALL other sections intact.
+"""
+
+# User instructions for add/remove section requests (filled with str.format)
+REMOVE_SECTION_INSTRUCTIONS = """
+**USER REQUEST TO REMOVE SECTION/CONTENT:**
+The user has requested: "{user_input}"
+
+**CRITICAL INSTRUCTIONS FOR ACCURATE REMOVAL:**
+
+1. **EXACT MATCHING PROCESS:**
+   - Read the user's request carefully: "{user_input}"
+   - Extract the KEYWORD(s) the user wants to remove (e.g., "phases", "timeline", "milestones")
+   - Look at your PREVIOUS CONTENT above and find sections with titles that MATCH or CONTAIN these keywords
+   - Match is case-insensitive and should handle variations
+
+2. **IDENTIFICATION STEPS:**
+   - Step 1: List ALL section titles from your previous content
+   - Step 2: For each section title, check if it contains the keyword(s) from user's request
+   - Step 3: Select the section that BEST MATCHES the user's request
+   - Step 4: If multiple sections match, choose the one that is MOST SPECIFIC to the user's request
+
+3. **REMOVAL RULES:**
+   - Remove ONLY the section that matches the user's request
+   - If the content is not a formal section but appears in your content, remove that part too
+   - Keep ALL other sections completely intact
+   - Do NOT remove sections that don't match the user's request
+
+4. **AFTER REMOVAL:**
+   - Update the sections array count accordingly
+   - Ensure remaining sections maintain proper TOON format
+   - Verify that the removed section is gone and all other sections remain
+
+**VERIFICATION:** Before finalizing, double-check that you removed the CORRECT section that matches the user's request "{user_input}" and kept all other sections intact.
+"""
+
+ADD_SECTION_INSTRUCTIONS = """
+**USER REQUEST TO ADD NEW SECTION:**
+The user has requested: "{user_input}"
+
+You MUST:
+1. Keep ALL existing sections from your previous response (shown above)
+2. Add the NEW section requested by the user
+3. Update the sections array count to include the new section
+4. Ensure the new section follows proper TOON format
+5. Make the new section comprehensive and relevant to project management
+"""
+
+# Output rules replacing TOON_OUTPUT_RULES in the shared preamble when the
+# project plan and resource allocation are generated in one JSON response
+COMBINED_OUTPUT_RULES = """- Respond with a single JSON object (described at the end of these instructions) whose string values are written in TOON (Token-Oriented Object Notation) format, NOT HTML or markdown
+- Do NOT wrap your response in code blocks
+- End each TOON value with a single <<<END_BLOCK>>> delimiter
+"""
+
+# Response formats for the two TOON values of the combined JSON response
+# (plain text: never passed through str.format)
+PROJECT_MANAGER_COMBINED_FORMAT = (
+    """**PLAN FORMAT - TOON:**
+Write the project plan (the "plan" value of your JSON response) in TOON format, ending with <<<END_BLOCK>>>.
+
+"""
+    + PROJECT_MANAGER_TOON_STRUCTURE
+)
+
+RESOURCE_ALLOCATION_COMBINED_FORMAT = (
+    """**RESOURCES FORMAT - TOON:**
+Write the resource allocation (the "resources" value of your JSON response) in TOON format, ending with <<<END_BLOCK>>>.
 
-Generate your complete response in TOON format, ending with <<<END_BLOCK>>>:
 """
+    + RESOURCE_ALLOCATION_TOON_STRUCTURE
+)
+
+# Closes the combined system prompt, after the project manager and resource
+# allocation instructions (plain text: never passed through str.format)
+COMBINED_PLANNING_INSTRUCTIONS = """**COMBINED OUTPUT - PROJECT PLAN AND RESOURCE ALLOCATION:**
+In this request you produce BOTH the project plan (project manager instructions above) AND the resource allocation (resource allocation instructions above), based on the project plan you write. The inputs for both tasks are in the user message.
+Respond with a single JSON object and nothing else:
+{"plan": "...", "resources": "..."}
+- "plan": the complete project plan in TOON format, ending with <<<END_BLOCK>>>
+- "resources": the complete resource allocation in TOON format, ending with <<<END_BLOCK>>>"""
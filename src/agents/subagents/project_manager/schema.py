@@ -0,0 +1,142 @@
+"""Structured output schema for the project manager agent.
+
+The model fills these fields directly (no TOON text to clean up); ``to_toon``
+renders the plan in the TOON layout the rest of the pipeline expects.
+"""
+
+from typing import List
+
+import orjson
+from pydantic import BaseModel, Field
+
+
+def _toon_value(value: object) -> str:
+    """Format a scalar for TOON, quoting strings that would break a row."""
+    text = str(value)
+    if any(char in text for char in ',"\n'):
+        return orjson.dumps(text).decode()
+    return text
+
+
+class PlanTask(BaseModel):
+    """A task group within a phase."""
+
+    title: str = Field(description="Task group title, e.g. 'Environment Setup'")
+    tasks: str = Field(
+        description="Subtasks with hours, e.g. 'Setup environment (2 hrs) Configure CI/CD (3 hrs)'"
+    )
+    timeline_hours: int = Field(description="Total hours for this task group")
+
+
+class PlanPhase(BaseModel):
+    """A project phase with its task groups."""
+
+    phase: str = Field(description="Phase name, e.g. 'Phase 1 - Initial Setup'")
+    phase_total_hours: int = Field(description="Sum of the phase's task hours")
+    tasks: List[PlanTask]
+
+
+class PlanOverview(BaseModel):
+    """Project plan overview."""
+
+    title: str
+    total_duration_hours: int
+    total_duration_weeks: float
+    timeline_constraint: str = Field(description="The client's stated timeline")
+
+
+class PhaseHours(BaseModel):
+    """Timeline summary row: total hours for one phase."""
+
+    phase: str
+    total_hours: int
+
+
+class Milestone(BaseModel):
+    """A milestone and the cumulative hour it is reached at."""
+
+    milestone: str
+    hour: int
+
+
+class TimelineSummary(BaseModel):
+    """Totals, per-phase breakdown and milestones."""
+
+    total_hours: int
+    total_weeks: float
+    breakdown: List[PhaseHours]
+    milestones: List[Milestone]
+
+
+class TeamStructure(BaseModel):
+    """Team composition summary."""
+
+    primary_developer: str
+    supporting_roles: str
+    ai_tools: str
+
+
+class Conclusion(BaseModel):
+    """Closing section of the plan."""
+
+    title: str
+    content: str
+
+
+class ProjectPlan(BaseModel):
+    """Structured output for the project plan."""
+
+    overview: PlanOverview
+    phases: List[PlanPhase]
+    timeline_summary: TimelineSummary
+    team_structure: TeamStructure
+    conclusion: Conclusion
+
+    def to_toon(self) -> str:
+        """Render the plan as TOON, ending with the block delimiter."""
+        overview = self.overview
+        summary = self.timeline_summary
+        team = self.team_structure
+        lines = [
+            "project_plan:",
+            "  overview:",
+            f"    title: {overview.title}",
+            f"    total_duration_hours: {overview.total_duration_hours}",
+            f"    total_duration_weeks: {overview.total_duration_weeks:g}",
+            f"    timeline_constraint: {overview.timeline_constraint}",
+            f"  phases[{len(self.phases)}]:",
+        ]
+        for phase in self.phases:
+            lines += [
+                f"  - phase: {phase.phase}",
+                f"    phase_total_hours: {phase.phase_total_hours}",
+                f"    tasks[{len(phase.tasks)}]{{title,tasks,timeline_hours}}:",
+            ]
+            lines += [
+                f"      {_toon_value(task.title)},{_toon_value(task.tasks)},{task.timeline_hours}"
+                for task in phase.tasks
+            ]
+        lines += [
+            "  timeline_summary:",
+            f"    total_hours: {summary.total_hours}",
+            f"    total_weeks: {summary.total_weeks:g}",
+            f"    breakdown[{len(summary.breakdown)}]{{phase,total_hours}}:",
+        ]
+        lines += [
+            f"      {_toon_value(row.phase)},{row.total_hours}" for row in summary.breakdown
+        ]
+        lines.append(f"    milestones[{len(summary.milestones)}]{{milestone,hour}}:")
+        lines += [
+            f"      {_toon_value(row.milestone)},{row.hour}" for row in summary.milestones
+        ]
+        lines += [
+            "  team_structure:",
+            f"    primary_developer: {team.primary_developer}",
+            f"    supporting_roles: {team.supporting_roles}",
+            f"    ai_tools: {team.ai_tools}",
+            "  conclusion:",
+            f"    title: {self.conclusion.title}",
+            f"    content: {self.conclusion.content}",
+            "<<<END_BLOCK>>>",
+        ]
+        return "\n".join(lines)
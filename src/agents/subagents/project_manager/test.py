@@ -5,15 +5,23 @@ Run:
   python -m agents.subagents.project_manager.test
 """
 
+from functools import lru_cache
+
 from agents.tests.utils import get_test_llm
 
 
+@lru_cache(maxsize=1)
+def _llm():
+    """Create the test LLM once, so repeated main() calls reuse its client."""
+    return get_test_llm()
+
+
 def main() -> None:
     from .handlers import project_manager_agent
 
     print("\n=== Testing Project Manager Agent ===")
     
-    llm = get_test_llm()
+    llm = _llm()
     
     state = {
         "technical_spec": "Service-based backend, React frontend",
@@ -31,7 +39,8 @@ def main() -> None:
     
     print("\n✅ Project Plan Generated:")
     print("-" * 80)
-    print(updated["project_plan"][:500] + ("..." if len(updated["project_plan"]) > 500 else ""))
+    preview = updated["project_plan"][:501]
+    print(preview[:500] + ("..." if len(preview) > 500 else ""))
     print("-" * 80)
 
 
@@ -3,9 +3,6 @@
 from typing import Any, Dict, Optional
 
 from agents.master_agent.agent import MasterAgent
-from agents.subagents.resource_allocation.handlers import (
-    resource_allocation_agent,
-)
 
 
 class ResourceAllocationAgent(MasterAgent):
@@ -14,6 +11,15 @@ class ResourceAllocationAgent(MasterAgent):
     name = "resource_allocation"
     display_name = "Resource Allocation"
     section_ids = ["resource_allocation"]  # Matches compiled HTML section ID
+    cache_input_keys = (
+        "project_plan",
+        "user_settings",
+        "budget",
+        "timeline",
+        "timeline_hours",
+        "user_input",
+        "resource_allocation",
+    )
 
     def __init__(
         self, llm: Any = None, settings: Optional[Dict] = None, session: Any = None
@@ -21,7 +27,37 @@ class ResourceAllocationAgent(MasterAgent):
         """Initialize resource allocation agent."""
         super().__init__(llm=llm, settings=settings, session=session)
 
-    def run(self, state: Dict) -> Dict:  # type: ignore[override]
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:  # type: ignore[override]
         """Execute resource allocation planning and return updated state."""
+        # Imported on first use: the handlers pull in the LLM client and the
+        # prompt module, which registering the agent class does not need
+        from agents.subagents.resource_allocation.handlers import (
+            resource_allocation_agent,
+        )
+
         prepared = self.prepare_state(state)
-        return resource_allocation_agent(prepared, llm_instance=self.get_llm(prepared))
+        return resource_allocation_agent(
+            prepared, llm_instance=self.get_llm(prepared), config=config
+        )
+
+    def build_prompt(self, state: Dict) -> Any:
+        """Build the LLM input from prepared state (for batched execution).
+
+        Returns None on a similarity cache hit, so run() reuses the cached
+        plan instead of a batched call.
+        """
+        from agents.subagents.resource_allocation.handlers import (
+            build_batched_resource_allocation_prompt,
+        )
+
+        return build_batched_resource_allocation_prompt(state, self.get_llm(state))
+
+    def parse_response(self, state: Dict, response: Any) -> Dict:
+        """Turn the batched LLM response into updated state (and cache it)."""
+        from agents.subagents.resource_allocation.handlers import (
+            parse_batched_resource_allocation_response,
+        )
+
+        return parse_batched_resource_allocation_response(
+            state, response, self.get_llm(state)
+        )
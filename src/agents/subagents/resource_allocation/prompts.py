@@ -1,16 +1,12 @@
 """Prompt templates for resource allocation agent."""
 
-RESOURCE_ALLOCATION_PROMPT = """As a Resource Manager, calculate the budget required to deliver the CLIENT'S EXACT PROJECT REQUIREMENTS based on the detailed project plan.
+# Static resource allocation instructions (plain text: never passed through
+# str.format)
+RESOURCE_ALLOCATION_INSTRUCTIONS = """As a Resource Manager, calculate the budget required to deliver the CLIENT'S EXACT PROJECT REQUIREMENTS based on the detailed project plan.
 
-**🚨 FIRST: CHECK THE CONVERSATION CONTEXT FOR NEW RATES!**
-Before you do anything else, look at the CONVERSATION CONTEXT section below. If the user has mentioned new rates (like "junior 30, mid 50, senior 70"), you MUST use those rates instead of the default rates. This is CRITICAL!
-
-**🚨 EXAMPLE: If you see "junior software engineer price is 30 dollar per hour, and mid level is 50 and senior is 70" in the conversation context, you MUST use:**
-- Junior Engineer: $30/hour
-- Mid-level Engineer: $50/hour
-- Senior Engineer: $70/hour
-
-**🚨 DO NOT use the default rates if the user has specified new rates!**
+**🚨🚨🚨 CRITICAL: The rates section (provided after these instructions) contains the EXACT rates you MUST use for ALL calculations.**
+**🚨 DO NOT look for rates in conversation context - use ONLY the rates provided in the rates section.**
+**🚨 You MUST recalculate ALL totals, costs, and budgets using these exact rates.**
 
 **CRITICAL INSTRUCTIONS:**
 1. Your budget must cover the SPECIFIC tasks and deliverables in the project plan
@@ -46,16 +42,6 @@ Before you do anything else, look at the CONVERSATION CONTEXT section below. If
 
 **IMPORTANT: Generate clean, well-formatted content with clear section headers. Do not include redundant HTML tags or duplicate headers.**
 
-Project Plan (Client's Deliverables & Tasks):
-{project_plan}
-
-**CONVERSATION CONTEXT (Latest User Requirements):**
-{conversation_context}
-
-{previous_content}
-
-{user_instructions}
-
 **ADDING NEW SECTIONS (When User Requests):**
 If the user requests to add a new section, you MUST:
 - Keep ALL existing sections from your previous response
@@ -68,7 +54,7 @@ If the user requests to remove a section or content, you MUST follow these EXACT
 
 **STEP 1: IDENTIFY THE CORRECT SECTION**
 - Read the user's request carefully and extract the KEYWORD(s) they want to remove
-- Look at your PREVIOUS CONTENT (shown above) and list ALL section titles
+- Look at your PREVIOUS CONTENT (provided after these instructions) and list ALL section titles
 - Match the user's keyword(s) to section titles using case-insensitive matching
 - Handle variations and synonyms
 - If multiple sections match, choose the one that is MOST SPECIFIC to the user's request
@@ -91,44 +77,15 @@ If the user requests to remove a section or content, you MUST follow these EXACT
 
 **VERIFICATION:** Before finalizing, verify you removed the CORRECT section that matches the user's request and kept all other sections intact.
 
-**🚨 CRITICAL INSTRUCTION - READ THE CONVERSATION CONTEXT CAREFULLY:**
-The CONVERSATION CONTEXT above contains the user's latest requirements and changes. You MUST:
-
-1. **FIRST: Look for any pricing information in the conversation context**
-2. **SECOND: If you find new rates mentioned, use those rates instead of the default rates below**
-3. **THIRD: Calculate your budget using the new rates from the conversation context**
-4. **FOURTH: Ignore the default rates if the user has specified new rates**
-
-**EXAMPLES OF WHAT TO LOOK FOR:**
-- "junior engineer price is 30 dollar per hour" → Use $30/hr for junior engineers
-- "mid level is 50 and senior is 70" → Use $50/hr for mid-level, $70/hr for senior
-- "my rates are: junior 30, mid 50, senior 70" → Use those exact rates
-- "junior 30, mid 50, senior 70" → Use those exact rates
-
-**⚠️ IMPORTANT: If the conversation context contains ANY mention of new rates, you MUST use those rates and ignore the default rates below!**
-
-**ROLE-BASED HOURLY RATES (DEFAULT - OVERRIDE WITH CONVERSATION CONTEXT RATES):**
-- Senior Software Engineer: $35/hour
-- Mid-level Engineer: $25/hour
-- Junior Engineer: $18/hour
-- UI/UX Designer: $25/hour
-- Project Manager: $25/hour
-- DevOps Engineer: $30/hour
-- Mid to Senior AI Engineer: $30/hour
-
-**🚨 CRITICAL: If the conversation context contains new rates, use those instead of the default rates above!**
-**🚨 CRITICAL: If you see "junior software engineer price is 30 dollar per hour, and mid level is 50 and senior is 70" in the conversation context, use those rates!**
-**🚨 CRITICAL: Do NOT use the default rates if the user has specified new rates!**
-**🚨 CRITICAL: Use the new rates from the conversation context, not the default rates!**
+**🚨 CRITICAL: Use ONLY the rates provided in the rates section. Ignore any rates mentioned in conversation context - the rates section is the source of truth and holds the exact rates you must use for ALL calculations.**
 
 **BUDGET CALCULATION INSTRUCTIONS:**
 
 **🚨 BEFORE YOU START CALCULATING:**
-1. **Check the conversation context above for any new rates mentioned**
-2. **If you see new rates (like "junior 30, mid 50, senior 70"), use those rates**
-3. **Do NOT use the default rates if the user has specified new rates**
-4. **If you see "junior software engineer price is 30 dollar per hour, and mid level is 50 and senior is 70" in the conversation context, use those exact rates!**
-5. **Use the new rates from the conversation context, not the default rates!**
+1. **Use ONLY the rates provided in the rates section**
+2. **For EVERY calculation, multiply: Hours × Rate (from the rates section) = Cost**
+3. **RECALCULATE all phase totals and grand totals using these exact rates**
+4. **DO NOT use any rates from examples, defaults, or conversation context - ONLY use the rates section**
 
 1. **Analyze each task** in the project plan and identify which role(s) it requires:
    - Frontend/UI tasks: UI/UX Designer + Mid-level Engineer
@@ -315,13 +272,13 @@ End your resource allocation with a professional conclusion titled "Investment S
 5. Provide realistic percentage breakdowns
 6. Format all currency values with $ and commas (e.g., $1,234)
 
-**RESPONSE FORMAT REQUIREMENT - TOON FORMAT:**
-You MUST provide your response in TOON (Token-Oriented Object Notation) format, NOT HTML or JSON.
+"""
 
-**TOON Structure for Resource Allocation:**
+# TOON resource plan layout, shared by the TOON and combined response formats
+RESOURCE_ALLOCATION_TOON_STRUCTURE = """**TOON Structure for Resource Allocation:**
 ```
 resource_plan:
-  phases[6]{{phase_name,total_cost}}:
+  phases[6]{phase_name,total_cost}:
     Phase 1 - Project Setup & Foundation,900.0
     Phase 2 - Core Development,1825.0
     Phase 3 - Frontend Development,1500.0
@@ -330,42 +287,42 @@ resource_plan:
     Phase 6 - Deployment & Launch,1450.0
   phase_details[6]:
     - phase: Phase 1 - Project Setup & Foundation
-      tasks[4]{{task,role,hours,rate_per_hour,total_cost}}:
+      tasks[4]{task,role,hours,rate_per_hour,total_cost}:
         Environment Setup,Mid-level Engineer,10,25.0,250.0
         Authentication,Senior Software Engineer,15,10.0,150.0
         Database Design,Senior Software Engineer,20,10.0,200.0
         Infrastructure,DevOps Engineer,10,30.0,300.0
       phase_total: 900.0
     - phase: Phase 2 - Core Development
-      tasks[4]{{task,role,hours,rate_per_hour,total_cost}}:
+      tasks[4]{task,role,hours,rate_per_hour,total_cost}:
         User Management APIs,Senior Software Engineer,25,10.0,250.0
         Core Business Logic,Senior Software Engineer,30,10.0,300.0
         API Development,Mid-level Engineer,20,25.0,500.0
         Database Integration,Mid-level Engineer,15,25.0,375.0
       phase_total: 1825.0
     - phase: Phase 3 - Frontend Development
-      tasks[4]{{task,role,hours,rate_per_hour,total_cost}}:
+      tasks[4]{task,role,hours,rate_per_hour,total_cost}:
         UI/UX Design,UI/UX Designer,15,25.0,375.0
         Frontend Components,Mid-level Engineer,20,25.0,500.0
         Responsive Design,Mid-level Engineer,15,25.0,375.0
         Frontend Integration,Mid-level Engineer,10,25.0,250.0
       phase_total: 1500.0
     - phase: Phase 4 - Advanced Features & Integration
-      tasks[4]{{task,role,hours,rate_per_hour,total_cost}}:
+      tasks[4]{task,role,hours,rate_per_hour,total_cost}:
         Third-party Integrations,Senior Software Engineer,30,10.0,300.0
         Advanced Features,Senior Software Engineer,30,10.0,300.0
         Real-time Features,Senior Software Engineer,20,10.0,200.0
         Performance Optimization,Senior Software Engineer,25,10.0,250.0
       phase_total: 1050.0
     - phase: Phase 5 - Testing & Quality Assurance
-      tasks[4]{{task,role,hours,rate_per_hour,total_cost}}:
+      tasks[4]{task,role,hours,rate_per_hour,total_cost}:
         Unit Testing,Junior Engineer,25,50.0,1250.0
         Integration Testing,Mid-level Engineer,20,25.0,500.0
         UAT Testing,Junior Engineer,15,50.0,750.0
         Performance Testing,DevOps Engineer,10,30.0,300.0
       phase_total: 2800.0
     - phase: Phase 6 - Deployment & Launch
-      tasks[4]{{task,role,hours,rate_per_hour,total_cost}}:
+      tasks[4]{task,role,hours,rate_per_hour,total_cost}:
         Production Environment,DevOps Engineer,15,30.0,450.0
         Data Migration,Mid-level Engineer,10,25.0,250.0
         Deployment Preparation,DevOps Engineer,10,30.0,300.0
@@ -373,7 +330,7 @@ resource_plan:
       phase_total: 1450.0
 budget:
   total_cost: 9525.0
-  cost_breakdown[7]{{role,total_cost,percentage}}:
+  cost_breakdown[7]{role,total_cost,percentage}:
     Senior Software Engineer,2400.0,25.2
     Mid-level Engineer,1650.0,17.3
     Junior Engineer,2000.0,21.0
@@ -385,7 +342,7 @@ budget:
     base_budget: 9525.0
     contingency_20_percent: 1905.0
     recommended_budget: 11430.0
-  payment_schedule[6]{{phase,amount,percentage}}:
+  payment_schedule[6]{phase,amount,percentage}:
     Phase 1 Foundation,900.0,9.5
     Phase 2 Core Development,1825.0,19.2
     Phase 3 Frontend,1500.0,15.7
@@ -432,26 +389,16 @@ team_structure:
     responsibilities: Project coordination, timeline management, communication
 ```
 
-**TOON Formatting Rules:**
-- Use indentation (2 spaces) for nesting
-- Arrays use [N] to indicate count
-- Object arrays use {{field1,field2}}: to declare fields
-- Data rows follow with comma-separated values
-- No quotes, braces, or brackets except in declarations
-- Use colons : after keys and array declarations
+"""
 
-**Canonical TOON Example:**
-```
-name: John Doe
-age: 30
-active: true
-tags[2]: developer,designer
-address:
-  city: New York
-  zip: "10001"
-```
+# Response format for the resource allocation as a standalone TOON response
+RESOURCE_ALLOCATION_TOON_FORMAT = (
+    """**RESPONSE FORMAT REQUIREMENT - TOON FORMAT:**
+You MUST provide your response in TOON (Token-Oriented Object Notation) format, NOT HTML or JSON.
 
-**CRITICAL:**
+"""
+    + RESOURCE_ALLOCATION_TOON_STRUCTURE
+    + """**CRITICAL:**
 - Generate complete response in TOON format
 - Include ALL 3 sections: resource_plan, budget, team_structure
 - Use proper TOON syntax for all tables and data
@@ -479,17 +426,17 @@ When generating your response, you MUST output your complete TOON response and t
 **EXAMPLE FORMAT (NOTICE THE SINGLE <<<END_BLOCK>>> AT THE END):**
 ```
 resource_plan:
-  phases[3]{{phase_name,total_cost}}:
+  phases[3]{phase_name,total_cost}:
     Phase 1,1250.0
     Phase 2,2500.0
     Phase 3,3000.0
 budget:
   total_budget: 50000.0
-  payment_schedule[3]{{phase,amount}}:
+  payment_schedule[3]{phase,amount}:
     Phase 1,15000.0
     Phase 2,20000.0
 team_structure:
-  roles[3]{{role,count}}:
+  roles[3]{role,count}:
     Senior Engineer,2
     Mid Engineer,3
     Junior Engineer,1
@@ -507,3 +454,78 @@ team_structure:
 
 Generate your complete response in TOON format, ending with <<<END_BLOCK>>>:
 """
+)
+
+# Full system prompt: shared preamble, instructions, then the response format
+# (filled with str.format)
+RESOURCE_ALLOCATION_PROMPT = """{shared_preamble}
+
+""" + RESOURCE_ALLOCATION_INSTRUCTIONS + "{response_format}"
+
+# Per-call content, sent as the human message after the static instructions
+# above so the instruction prefix stays identical across calls
+RESOURCE_ALLOCATION_DYNAMIC_SUFFIX = """{rates_notice}{rates_section}
+
+Project Plan (Client's Deliverables & Tasks):
+{project_plan}
+
+**CONVERSATION CONTEXT (Latest User Requirements):**
+{conversation_context}
+
+{previous_content}
+
+{user_instructions}"""
+
+
+PREVIOUS_CONTENT_TEMPLATE = """
+**PREVIOUS RESOURCE ALLOCATION CONTENT:**
+You have previously generated the following content. When updating, you MUST preserve ALL existing sections unless explicitly asked to remove them.
+
+{previous_content}
+
+**IMPORTANT:** If the user requests to add or remove a section, you MUST keep ALL other sections intact.
+"""
+
+REMOVE_SECTION_INSTRUCTIONS = """
+**USER REQUEST TO REMOVE SECTION/CONTENT:**
+The user has requested: "{user_input}"
+
+**CRITICAL INSTRUCTIONS FOR ACCURATE REMOVAL:**
+
+1. **EXACT MATCHING PROCESS:**
+   - Read the user's request carefully: "{user_input}"
+   - Extract the KEYWORD(s) the user wants to remove (e.g., "budget", "cost breakdown", "resources")
+   - Look at your PREVIOUS CONTENT above and find sections with titles that MATCH or CONTAIN these keywords
+   - Match is case-insensitive and should handle variations
+
+2. **IDENTIFICATION STEPS:**
+   - Step 1: List ALL section titles from your previous content
+   - Step 2: For each section title, check if it contains the keyword(s) from user's request
+   - Step 3: Select the section that BEST MATCHES the user's request
+   - Step 4: If multiple sections match, choose the one that is MOST SPECIFIC to the user's request
+
+3. **REMOVAL RULES:**
+   - Remove ONLY the section that matches the user's request
+   - If the content is not a formal section but appears in your content, remove that part too
+   - Keep ALL other sections completely intact
+   - Do NOT remove sections that don't match the user's request
+
+4. **AFTER REMOVAL:**
+   - Update the sections array count accordingly
+   - Ensure remaining sections maintain proper TOON format
+   - Verify that the removed section is gone and all other sections remain
+
+**VERIFICATION:** Before finalizing, double-check that you removed the CORRECT section that matches the user's request "{user_input}" and kept all other sections intact.
+"""
+
+ADD_SECTION_INSTRUCTIONS = """
+**USER REQUEST TO ADD NEW SECTION:**
+The user has requested: "{user_input}"
+
+You MUST:
+1. Keep ALL existing sections from your previous response (shown above)
+2. Add the NEW section requested by the user
+3. Update the sections array count to include the new section
+4. Ensure the new section follows proper TOON format
+5. Make the new section comprehensive and relevant to resource allocation
+"""
@@ -0,0 +1,128 @@
+"""Similarity cache for resource allocation responses.
+
+Repeated runs over near-identical project plans (regression runs, re-tries
+after cosmetic plan edits) can reuse a stored resource plan instead of calling
+the LLM again. Everything that changes the numbers themselves - rates,
+budget/timeline constraints, the user's request, previous content, the
+model, the hours in the plan - goes into an exact ``scope`` key chosen by
+the caller; only the project plan wording is compared by similarity.
+
+Embeddings are hashed word unigram/bigram counts (no model download, no
+network call), so "similar" means lexically near-identical, which is the
+case this cache is meant for.
+"""
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+import xxhash
+
+# Hashed feature space; collisions only add noise to very different texts
+EMBEDDING_DIM = 4096
+
+_TOKEN_RE = re.compile(r"\w+")
+
+Embedding = Dict[int, float]
+
+
+def embed_text(text: str) -> Embedding:
+    """Embed text as an L2-normalised sparse vector of hashed word n-grams."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    vector: Embedding = {}
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        index = xxhash.xxh64_intdigest(feature.encode("utf-8")) % EMBEDDING_DIM
+        vector[index] = vector.get(index, 0.0) + 1.0
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {index: weight / norm for index, weight in vector.items()} if norm else {}
+
+
+def cosine_similarity(a: Embedding, b: Embedding) -> float:
+    """Cosine similarity of two normalised sparse embeddings."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+
+class SemanticCache:
+    """Thread-safe LRU of (embedding, response) entries grouped by exact scope."""
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        max_scopes: int = 128,
+        max_entries_per_scope: int = 8,
+        path: Optional[str] = None,
+    ):
+        """Create the cache, loading persisted entries from ``path`` if given."""
+        self.threshold = threshold
+        self.max_scopes = max_scopes
+        self.max_entries_per_scope = max_entries_per_scope
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, List[Tuple[Embedding, str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def lookup(self, scope: str, embedding: Embedding) -> Optional[str]:
+        """Return the closest cached response in ``scope`` above the threshold."""
+        with self._lock:
+            entries = self._entries.get(scope)
+            if not entries:
+                return None
+            self._entries.move_to_end(scope)
+            score, response = max(
+                (cosine_similarity(embedding, cached), response)
+                for cached, response in entries
+            )
+        return response if score >= self.threshold else None
+
+    def add(self, scope: str, embedding: Embedding, response: str) -> None:
+        """Store a response, evicting the oldest entries past the limits."""
+        with self._lock:
+            entries = self._entries.setdefault(scope, [])
+            self._entries.move_to_end(scope)
+            entries.append((embedding, response))
+            del entries[: -self.max_entries_per_scope]
+            while len(self._entries) > self.max_scopes:
+                self._entries.popitem(last=False)
+            # Written under the lock so concurrent adds cannot interleave
+            # writes to the temporary file
+            if self.path:
+                self._save(self._serialize())
+
+    def _serialize(self) -> bytes:
+        """Dump entries as JSON (sparse embeddings as [index, weight] pairs)."""
+        return orjson.dumps(
+            [
+                [scope, [[list(embedding.items()), response] for embedding, response in entries]]
+                for scope, entries in self._entries.items()
+            ]
+        )
+
+    def _save(self, snapshot: bytes) -> None:
+        """Write a snapshot atomically; persistence is best effort."""
+        try:
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_bytes(snapshot)
+            tmp_path.replace(self.path)
+        except OSError:
+            pass
+
+    def _load(self) -> None:
+        """Load persisted entries, ignoring a missing or unreadable file."""
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = orjson.loads(self.path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return
+        for scope, entries in data[-self.max_scopes :]:
+            self._entries[scope] = [
+                ({int(index): weight for index, weight in embedding}, response)
+                for embedding, response in entries[-self.max_entries_per_scope :]
+            ]
@@ -21,7 +21,9 @@ class ScopeRefinementAgent(MasterAgent):
         """Initialize scope refinement agent."""
         super().__init__(llm=llm, settings=settings, session=session)
 
-    def run(self, state: Dict) -> Dict:  # type: ignore[override]
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:  # type: ignore[override]
         """Execute scope refinement and return updated state."""
         prepared = self.prepare_state(state)
-        return scope_refinement_agent(prepared, llm_instance=self.get_llm(prepared))
+        return scope_refinement_agent(
+            prepared, llm_instance=self.get_llm(prepared), config=config
+        )
@@ -3,6 +3,7 @@
 from langchain_core.prompts import PromptTemplate
 from langsmith import traceable
 
+from agents.registry import SHARED_SYSTEM_PREAMBLE
 from agents.subagents.scope_refinement.prompts import (
     SCOPE_REFINEMENT_PROMPT,
 )
@@ -15,12 +16,15 @@ from agents.utils.utils import (
 
 
 @traceable(name="scope_refinement_agent")
-def scope_refinement_agent(state: ProposalState, llm_instance=None) -> ProposalState:
+def scope_refinement_agent(
+    state: ProposalState, llm_instance=None, config=None
+) -> ProposalState:
     """Analyze initial idea, search similar products, produce refined scope.
 
     Args:
         state: The current proposal state with initial idea
         llm_instance: Optional LLM instance (uses default if not provided)
+        config: Optional runnable config (e.g. streaming callbacks)
 
     Returns:
         Updated state with similar products and refined scope
@@ -136,7 +140,9 @@ Example: If user says "also add quality assurance", add a new section titled "Qu
     print("✅ SCOPE REFINEMENT: Similar products search completed.")
 
     # Generate refined scope with similar products context
-    prompt = PromptTemplate.from_template(SCOPE_REFINEMENT_PROMPT)
+    prompt = PromptTemplate.from_template(SCOPE_REFINEMENT_PROMPT).partial(
+        shared_preamble=SHARED_SYSTEM_PREAMBLE
+    )
     _llm = llm_instance or state.get("llm") or llm
     chain = prompt | _llm
 
@@ -146,7 +152,8 @@ Example: If user says "also add quality assurance", add a new section titled "Qu
             "similar_products": similar_products,
             "previous_content": previous_content_section,
             "user_instructions": user_instructions,
-        }
+        },
+        config=config,
     )
 
     # Clean the response to remove newlines and HTML code blocks
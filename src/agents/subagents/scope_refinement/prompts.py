@@ -1,6 +1,8 @@
 """Prompt templates for scope refinement agent."""
 
-SCOPE_REFINEMENT_PROMPT = """You are a Scope Refinement Specialist. Your PRIMARY GOAL is to deeply understand and refine the EXACT project idea provided by the client, NOT to create a generic proposal.
+SCOPE_REFINEMENT_PROMPT = """{shared_preamble}
+
+You are a Scope Refinement Specialist. Your PRIMARY GOAL is to deeply understand and refine the EXACT project idea provided by the client, NOT to create a generic proposal.
 
 **CRITICAL INSTRUCTIONS:**
 1. READ AND UNDERSTAND the complete initial project idea THOROUGHLY
@@ -207,25 +209,6 @@ scope_refinement:
     description: Product description 4
 ```
 
-**TOON Formatting Rules:**
-- Use indentation (2 spaces) for nesting
-- Arrays use [N] to indicate count
-- Object arrays use {{field1,field2}}: to declare fields
-- Data rows follow with comma-separated values
-- No quotes, braces, or brackets except in declarations
-- Use colons : after keys and array declarations
-
-**Canonical TOON Example:**
-```
-name: John Doe
-age: 30
-active: true
-tags[2]: developer,designer
-address:
-  city: New York
-  zip: "10001"
-```
-
 **CRITICAL:**
 - Generate complete response in TOON format
 - Include all 3 main sections
@@ -21,7 +21,9 @@ class TechnicalArchitectAgent(MasterAgent):
         """Initialize technical architect agent."""
         super().__init__(llm=llm, settings=settings, session=session)
 
-    def run(self, state: Dict) -> Dict:  # type: ignore[override]
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:  # type: ignore[override]
         """Execute technical specification generation and return updated state."""
         prepared = self.prepare_state(state)
-        return technical_architect_agent(prepared, llm_instance=self.get_llm(prepared))
+        return technical_architect_agent(
+            prepared, llm_instance=self.get_llm(prepared), config=config
+        )
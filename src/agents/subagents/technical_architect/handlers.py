@@ -3,6 +3,7 @@
 from langchain_core.prompts import PromptTemplate
 from langsmith import traceable
 
+from agents.registry import SHARED_SYSTEM_PREAMBLE
 from agents.subagents.technical_architect.prompts import (
     TECHNICAL_ARCHITECT_PROMPT,
 )
@@ -14,12 +15,15 @@ from agents.utils.utils import (
 
 
 @traceable(name="technical_architect_agent")
-def technical_architect_agent(state: ProposalState, llm_instance=None) -> ProposalState:
+def technical_architect_agent(
+    state: ProposalState, llm_instance=None, config=None
+) -> ProposalState:
     """Create a technical specification based on scope and business analysis.
 
     Args:
         state: The current proposal state with refined scope and business analysis
         llm_instance: Optional LLM instance (uses default if not provided)
+        config: Optional runnable config (e.g. streaming callbacks)
 
     Returns:
         Updated state with technical specification
@@ -115,7 +119,9 @@ You MUST:
 """
             print(f"   📝 User requested to add new section: {user_input}")
 
-    prompt = PromptTemplate.from_template(TECHNICAL_ARCHITECT_PROMPT)
+    prompt = PromptTemplate.from_template(TECHNICAL_ARCHITECT_PROMPT).partial(
+        shared_preamble=SHARED_SYSTEM_PREAMBLE
+    )
     _llm = llm_instance or state.get("llm") or llm
     chain = prompt | _llm
 
@@ -124,7 +130,7 @@ You MUST:
         "business_analysis": business_analysis,
         "previous_content": previous_content_section,
         "user_instructions": user_instructions,
-    })
+    }, config=config)
 
     # Clean the response to remove newlines and HTML code blocks
     cleaned_response = clean_agent_response(technical_spec.content)
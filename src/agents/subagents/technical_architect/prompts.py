@@ -1,6 +1,8 @@
 """Prompt templates for technical architect agent."""
 
-TECHNICAL_ARCHITECT_PROMPT = """As a Technical Architect, your role is to design the technical solution that implements the CLIENT'S EXACT REQUIREMENTS, not to propose a generic architecture.
+TECHNICAL_ARCHITECT_PROMPT = """{shared_preamble}
+
+As a Technical Architect, your role is to design the technical solution that implements the CLIENT'S EXACT REQUIREMENTS, not to propose a generic architecture.
 
 **CRITICAL INSTRUCTIONS:**
 1. Design architecture specifically for the features and deliverables mentioned by the client
@@ -131,24 +133,6 @@ sections[N]:  # N = number of sections (3 standard + any additional requested -
     apis: Report generation endpoint
 ```
 
-**TOON Formatting Rules:**
-- Use indentation (2 spaces) for nesting
-- Arrays use [N] to indicate count
-- Object arrays use {{field1,field2}}: to declare fields
-- No quotes, braces, or brackets except in declarations
-- Use colons : after keys and array declarations
-
-**Canonical TOON Example:**
-```
-name: John Doe
-age: 30
-active: true
-tags[2]: developer,designer
-address:
-  city: New York
-  zip: "10001"
-```
-
 **CRITICAL:**
 - Generate complete response in TOON format
 - Include all 3 main sections
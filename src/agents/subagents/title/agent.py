@@ -19,7 +19,7 @@ class TitleAgent(MasterAgent):
         """Initialize title agent."""
         super().__init__(llm=llm, settings=settings, session=session)
 
-    def run(self, state: Dict) -> Dict:  # type: ignore[override]
+    def run(self, state: Dict, config: Optional[Dict] = None) -> Dict:  # type: ignore[override]
         """Generate a title and add it to the state."""
         import asyncio
 
@@ -179,7 +179,8 @@ Return ONLY the title, no quotes or extra text.
                                 idea=initial,
                                 current_title=current_title,
                                 feedback=user_input,
-                            )
+                            ),
+                            config=config,
                         )
                     else:
                         prompt = PromptTemplate.from_template(
@@ -190,7 +191,7 @@ Return ONLY the title, no quotes or extra text.
 Project idea: {idea}
 """
                         )
-                        response = self.llm.invoke(prompt.format(idea=initial))
+                        response = self.llm.invoke(prompt.format(idea=initial), config=config)
                     title = response.content.strip().strip('"').strip("'")
                 else:
                     title = (
@@ -237,7 +238,8 @@ Return ONLY the title, no quotes or extra text.
                                     idea=initial,
                                     current_title=current_title,
                                     feedback=user_input,
-                                )
+                                ),
+                                config=config,
                             )
                         else:
                             prompt = PromptTemplate.from_template(
@@ -248,7 +250,7 @@ Return ONLY the title, no quotes or extra text.
 Project idea: {idea}
 """
                             )
-                            response = self.llm.invoke(prompt.format(idea=initial))
+                            response = self.llm.invoke(prompt.format(idea=initial), config=config)
                         title = response.content.strip().strip('"').strip("'")
                     else:
                         title = (
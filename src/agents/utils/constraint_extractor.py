@@ -12,6 +12,7 @@ from langsmith import traceable
 from pydantic import BaseModel, Field
 
 from agents.config import env
+from agents.llm import http_async_client, http_client
 
 
 # Pydantic models for structured output
@@ -67,6 +68,8 @@ extraction_llm = ChatOpenAI(
     api_key=env.openai_api_key,
     temperature=0.0,  # Deterministic for extraction
     model_kwargs={"response_format": {"type": "json_object"}},  # Force JSON output
+    http_client=http_client,
+    http_async_client=http_async_client,
 )
 
 
@@ -9,6 +9,7 @@ from langchain_openai import ChatOpenAI
 from langsmith import traceable
 
 from agents.config import env
+from agents.llm import http_async_client, http_client
 
 # Initialize LLM for synthesis
 synthesis_llm = ChatOpenAI(
@@ -16,6 +17,8 @@ synthesis_llm = ChatOpenAI(
     api_key=env.openai_api_key,
     temperature=0.3,  # Slightly creative for professional writing
     max_tokens=800,  # Enough for a good paragraph
+    http_client=http_client,
+    http_async_client=http_async_client,
 )
 
 IDEA_SYNTHESIS_PROMPT = """You are a Professional Business Analyst specializing in creating executive-level project descriptions.
@@ -7,7 +7,7 @@ import time
 from typing import Any, Dict, List, Optional, TypedDict
 
 import requests
-from agents.llm import llm
+from agents.llm import llm, llm_fast
 from langsmith import traceable
 
 from agents.config import env
@@ -29,6 +29,7 @@ class ProposalState(TypedDict):
     business_analysis: str
     technical_spec: str
     project_plan: str
+    project_plan_inputs: str  # Hash of the inputs project_plan was generated from
     resource_plan: str
     final_proposal: Dict[str, Any]
     current_stage: str
@@ -46,7 +47,45 @@ class ProposalState(TypedDict):
     conversation_context: str  # Full conversation history for context
     # Additional fields
     llm: Optional[Any]  # LLM instance (optional)
+    llm_fast: Optional[Any]  # Cheaper LLM instance for simple edits (optional)
     user_input: str  # Current user input
+    skip_pm_standalone: bool  # Plan project and resources in one combined call
+
+
+# Literal fragments removed or unescaped by clean_agent_response
+_CLEAN_LITERALS = {
+    "```toon": "",
+    "```": "",
+    "**": "",
+    "toon\\n": "",
+    "toon\n": "",
+    "\\n": "\n",
+    "\\r": "\r",
+    "\\t": "\t",
+    "\\\\": "\\",
+}
+# Longer fragments first so e.g. "```toon" wins over "```"
+_CLEAN_LITERALS_RE = re.compile(
+    "|".join(re.escape(fragment) for fragment in _CLEAN_LITERALS)
+)
+_CLEAN_WHITESPACE_RE = re.compile(r"[^\S\n]+(?=\n|\Z)|[ ]{4,}|\n{4,}")
+
+
+def _replace_clean_literal(match: re.Match) -> str:
+    """Map a matched literal fragment to its replacement."""
+    return _CLEAN_LITERALS[match.group()]
+
+
+def _replace_clean_whitespace(match: re.Match) -> str:
+    """Map a matched whitespace run to its normalized form."""
+    text = match.group()
+    if text[0] == "\n":
+        return "\n\n"
+    # Whitespace before a line end (the first alternative) is dropped; longer
+    # runs of spaces inside a line are normalized to TOON's 2-space indent
+    if match.end() == len(match.string) or match.string[match.end()] == "\n":
+        return ""
+    return "  "
 
 
 def clean_agent_response(response: str) -> str:
@@ -64,43 +103,21 @@ def clean_agent_response(response: str) -> str:
     if not response:
         return response
 
-    # Remove code block markers (in case LLM wraps TOON in code blocks)
-    cleaned = response.replace("```toon", "").replace("```", "")
-
-    # Remove markdown bold markers (**) that shouldn't be in TOON
-    cleaned = cleaned.replace("**", "")
-
-    # Remove only escaped characters that shouldn't be in TOON
-    cleaned = cleaned.replace("\\n", "\n")  # Preserve actual newlines in TOON
-    cleaned = cleaned.replace("\\r", "\r")  # Preserve carriage returns
-    cleaned = cleaned.replace(
-        "\\t", "\t"
-    )  # Preserve tabs (used for indentation in TOON)
-
-    # Remove problematic patterns
-    cleaned = cleaned.replace("toon\\n", "")  # Remove toon\n patterns
-    cleaned = cleaned.replace("toon\n", "")  # Remove toon\n patterns
-
-    # Remove double backslashes but preserve necessary ones
-    cleaned = cleaned.replace("\\\\", "\\")
-
-    # PRESERVE block delimiters - they are required for block-by-block streaming
-    # The <<<END_BLOCK>>> delimiters should remain in the output so the frontend
-    # can process blocks incrementally
-    # DO NOT remove block delimiters - they are part of the TOON format for streaming
-
-    # Clean up excessive whitespace but preserve TOON structure
-    # TOON uses indentation, so be careful with whitespace normalization
-    # Only normalize 4+ consecutive spaces to 2 spaces (TOON uses 2-space indentation)
-    cleaned = re.sub(r"[ ]{4,}", "  ", cleaned)
-
-    # Remove excessive line breaks (keep single newlines for TOON structure)
-    cleaned = re.sub(r"\n{4,}", "\n\n", cleaned)
-
-    # Remove trailing whitespace from lines (preserve indentation)
-    lines = cleaned.split("\n")
-    cleaned_lines = [line.rstrip() for line in lines]
-    cleaned = "\n".join(cleaned_lines)
+    # One pass for all literal replacements:
+    # - code block markers (in case LLM wraps TOON in code blocks)
+    # - markdown bold markers (**) that shouldn't be in TOON
+    # - "toon" language tags left on their own line
+    # - escaped newlines/carriage returns/tabs (tabs are TOON indentation)
+    # - double backslashes (preserving a single one)
+    # PRESERVE block delimiters - <<<END_BLOCK>>> is required for block-by-block
+    # streaming on the frontend, so it is deliberately not matched here
+    cleaned = _CLEAN_LITERALS_RE.sub(_replace_clean_literal, response)
+
+    # One pass for whitespace, preserving TOON structure (indentation):
+    # - trailing whitespace at line ends is removed
+    # - 4+ consecutive spaces become 2 (TOON uses 2-space indentation)
+    # - 4+ consecutive line breaks become 2
+    cleaned = _CLEAN_WHITESPACE_RE.sub(_replace_clean_whitespace, cleaned)
 
     cleaned = cleaned.strip()
 
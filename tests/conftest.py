@@ -0,0 +1,6 @@
+"""Shared pytest configuration."""
+
+import os
+
+# Modules build their ChatOpenAI clients at import time; no request is sent
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
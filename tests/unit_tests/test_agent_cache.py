@@ -0,0 +1,82 @@
+import pytest
+
+from agents.pipeline import agent_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    agent_cache._agent_cache.clear()
+    yield
+    agent_cache._agent_cache.clear()
+
+
+def make_key(**overrides):
+    kwargs = {
+        "agent_name": "title",
+        "version": "1",
+        "inputs": {"refined_scope": "scope", "budget": "$5,000"},
+        "settings": {"rates": {"dev": 50}},
+        "model": "gpt-4o",
+    }
+    kwargs.update(overrides)
+    return agent_cache.make_agent_cache_key(**kwargs)
+
+
+def test_key_is_stable_across_dict_order():
+    assert make_key() == make_key(inputs={"budget": "$5,000", "refined_scope": "scope"})
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"agent_name": "summary"},
+        {"version": "2"},
+        {"inputs": {"refined_scope": "other scope", "budget": "$5,000"}},
+        {"settings": {"rates": {"dev": 60}}},
+        {"model": "gpt-4o-mini"},
+    ],
+)
+def test_key_changes_with_every_component(override):
+    assert make_key(**override) != make_key()
+
+
+def test_hit_returns_a_copy():
+    agent_cache.set_cached_agent_output("key", {"title": "A"})
+
+    cached = agent_cache.get_cached_agent_output("key")
+    cached["title"] = "B"
+
+    assert agent_cache.get_cached_agent_output("key") == {"title": "A"}
+
+
+def test_miss_returns_none():
+    assert agent_cache.get_cached_agent_output("missing") is None
+
+
+def test_expired_entry_is_dropped(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(agent_cache.time, "time", lambda: now)
+    agent_cache.set_cached_agent_output("key", {"title": "A"})
+
+    now += agent_cache.AGENT_CACHE_DURATION
+    assert agent_cache.get_cached_agent_output("key") is None
+    assert "key" not in agent_cache._agent_cache
+
+
+def test_lru_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(agent_cache, "_AGENT_CACHE_MAX_ENTRIES", 2)
+    agent_cache.set_cached_agent_output("a", {"n": 1})
+    agent_cache.set_cached_agent_output("b", {"n": 2})
+    agent_cache.get_cached_agent_output("a")  # "b" is now the oldest
+    agent_cache.set_cached_agent_output("c", {"n": 3})
+
+    assert agent_cache.get_cached_agent_output("b") is None
+    assert agent_cache.get_cached_agent_output("a") == {"n": 1}
+    assert agent_cache.get_cached_agent_output("c") == {"n": 3}
+
+
+def test_state_delta_keeps_new_and_changed_keys():
+    before = {"a": 1, "b": [1], "c": "x"}
+    after = {"a": 1, "b": [1, 2], "c": "x", "d": None}
+
+    assert agent_cache.state_delta(before, after) == {"b": [1, 2], "d": None}
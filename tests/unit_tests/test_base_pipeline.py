@@ -0,0 +1,251 @@
+import pytest
+from langchain_core.messages import AIMessage
+
+from agents.master_agent.agent import MasterAgent
+from agents.pipeline import agent_cache
+from agents.pipeline.base_pipeline import BasePipeline
+from agents.pipeline.worker_pool import AgentWorkerPool
+from agents.subagents.project_manager import handlers as project_manager_handlers
+from agents.subagents.project_manager.agent import ProjectManagerAgent
+from agents.subagents.resource_allocation import handlers as resource_allocation_handlers
+from agents.subagents.resource_allocation.agent import ResourceAllocationAgent
+
+
+class FakeLLM:
+    model_name = "fake-model"
+
+    def __init__(self):
+        self.batches = []
+
+    def batch(self, prompts, config=None):
+        self.batches.append(list(prompts))
+        return [f"response to {prompt}" for prompt in prompts]
+
+
+class MessageLLM(FakeLLM):
+    """Returns chat messages, as the agents' response parsers expect."""
+
+    def batch(self, prompts, config=None):
+        self.batches.append(list(prompts))
+        return [AIMessage(content=f"response {len(prompt.to_string())}") for prompt in prompts]
+
+
+class RunAgent(MasterAgent):
+    """Agent that only implements ``run``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.runs = 0
+
+    def run(self, state, config=None):
+        self.runs += 1
+        return {**state, "output": f"run {self.runs}"}
+
+
+class FailingAgent(RunAgent):
+    def run(self, state, config=None):
+        self.runs += 1
+        return {**state, "current_stage": "failed"}
+
+
+class PromptOnlyAgent(RunAgent):
+    """Agent that overrides build_prompt but not parse_response."""
+
+    def build_prompt(self, state):
+        return "prompt"
+
+
+class BatchAgent(RunAgent):
+    def build_prompt(self, state):
+        return f"prompt {self.name}"
+
+    def parse_response(self, state, response):
+        return {**state, "output": response}
+
+
+class Pipeline(BasePipeline):
+    def __init__(self, agents):
+        super().__init__(session=None, settings={})
+        self._agent_instances.update(agents)
+
+    def get_agent_sequence(self):
+        return list(self._agent_instances)
+
+    def get_agent_dependencies(self):
+        return {}
+
+    def execute(self, state, streaming_callback=None):
+        return state
+
+
+def make_agent(cls, name, llm=None):
+    agent = cls(llm=llm)
+    agent.name = name
+    return agent
+
+
+def run_group(pipeline, agent_names, state):
+    with AgentWorkerPool(len(agent_names)) as pool:
+        futures = pipeline._submit_group(pool, agent_names, state)
+        results = {}
+        for future, names in futures.items():
+            results.update(future.result())
+    return futures, results
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    agent_cache._agent_cache.clear()
+    project_manager_handlers._RESPONSE_CACHE.clear()
+    yield
+    agent_cache._agent_cache.clear()
+    project_manager_handlers._RESPONSE_CACHE.clear()
+
+
+def test_run_agent_caches_output():
+    agent = make_agent(RunAgent, "a", FakeLLM())
+    pipeline = Pipeline({"a": agent})
+
+    first = pipeline._run_agent("a", {"initial_idea": "idea"})
+    second = pipeline._run_agent("a", {"initial_idea": "idea"})
+
+    assert first["output"] == second["output"] == "run 1"
+    assert agent.runs == 1
+
+
+def test_run_agent_cache_bust_forces_rerun():
+    agent = make_agent(RunAgent, "a", FakeLLM())
+    pipeline = Pipeline({"a": agent})
+
+    pipeline._run_agent("a", {"initial_idea": "idea"})
+    updated = pipeline._run_agent("a", {"initial_idea": "idea", "cache_bust": True})
+
+    assert updated["output"] == "run 2"
+    assert agent.runs == 2
+
+
+def test_run_agent_does_not_cache_failures():
+    agent = make_agent(FailingAgent, "a", FakeLLM())
+    pipeline = Pipeline({"a": agent})
+
+    pipeline._run_agent("a", {"initial_idea": "idea"})
+    pipeline._run_agent("a", {"initial_idea": "idea"})
+
+    assert agent.runs == 2
+    assert not agent_cache._agent_cache
+
+
+def test_default_parse_response_runs_agent():
+    agent = make_agent(RunAgent, "a")
+
+    assert agent.parse_response({"x": 1}, "ignored") == {"x": 1, "output": "run 1"}
+
+
+@pytest.mark.parametrize(
+    ("cls", "expected"),
+    [(RunAgent, False), (PromptOnlyAgent, False), (BatchAgent, True)],
+)
+def test_supports_batching_requires_both_hooks(cls, expected):
+    assert make_agent(cls, "a").supports_batching() is expected
+
+
+def test_submit_group_batches_agents_by_llm():
+    shared_llm, other_llm = FakeLLM(), FakeLLM()
+    agents = {
+        "a": make_agent(BatchAgent, "a", shared_llm),
+        "b": make_agent(BatchAgent, "b", shared_llm),
+        "c": make_agent(BatchAgent, "c", other_llm),
+        "d": make_agent(PromptOnlyAgent, "d", shared_llm),
+        "e": make_agent(RunAgent, "e", shared_llm),
+    }
+    pipeline = Pipeline(agents)
+
+    futures, results = run_group(pipeline, list(agents), {"initial_idea": "idea"})
+
+    assert sorted(sorted(names) for names in futures.values()) == [
+        ["a", "b"],
+        ["c"],
+        ["d"],
+        ["e"],
+    ]
+    assert shared_llm.batches == [["prompt a", "prompt b"]]
+    assert other_llm.batches == [["prompt c"]]
+    assert results["a"]["output"] == "response to prompt a"
+    assert results["d"]["output"] == "run 1"
+    assert results["e"]["output"] == "run 1"
+
+
+def test_submit_group_runs_cached_agents_without_batching():
+    llm = FakeLLM()
+    agents = {"a": make_agent(BatchAgent, "a", llm)}
+    pipeline = Pipeline(agents)
+    state = {"initial_idea": "idea"}
+
+    run_group(pipeline, ["a"], state)
+    _, results = run_group(pipeline, ["a"], state)
+
+    assert llm.batches == [["prompt a"]]
+    assert results["a"]["output"] == "response to prompt a"
+
+
+# An edit of an existing plan: a plain TOON call on the agent's own LLM
+PLANNING_STATE = {
+    "technical_spec": "Booking platform spec",
+    "project_plan": "project_plan:\n  overview:\n    title: Booking",
+    "user_input": "Rename the first phase to Discovery",
+    "user_settings": {"rates": {"senior_engineer": 40}},
+}
+
+
+def planning_pipeline(llm):
+    return Pipeline(
+        {
+            "project_manager": ProjectManagerAgent(llm=llm),
+            "resource_allocation": ResourceAllocationAgent(llm=llm),
+        }
+    )
+
+
+def test_project_manager_and_resource_allocation_share_a_batch():
+    llm = MessageLLM()
+
+    futures, results = run_group(
+        planning_pipeline(llm), ["project_manager", "resource_allocation"], PLANNING_STATE
+    )
+
+    assert list(futures.values()) == [["project_manager", "resource_allocation"]]
+    assert len(llm.batches) == 1 and len(llm.batches[0]) == 2
+    assert results["project_manager"]["project_plan"].startswith("response ")
+    assert results["resource_allocation"]["resource_plan"].startswith("response ")
+
+
+def test_batched_project_plan_is_stored_in_response_cache():
+    llm = MessageLLM()
+    pipeline = planning_pipeline(llm)
+
+    _, first = run_group(pipeline, ["project_manager", "resource_allocation"], PLANNING_STATE)
+    agent_cache._agent_cache.clear()
+    futures, second = run_group(
+        pipeline, ["project_manager", "resource_allocation"], PLANNING_STATE
+    )
+
+    assert sorted(futures.values()) == [["project_manager"], ["resource_allocation"]]
+    assert [len(batch) for batch in llm.batches] == [2, 1]
+    assert second["project_manager"]["project_plan"] == first["project_manager"]["project_plan"]
+
+
+def test_batched_resource_plan_is_stored_in_similarity_cache(monkeypatch):
+    monkeypatch.setenv("RESOURCE_SEMANTIC_CACHE_THRESHOLD", "0.9")
+    resource_allocation_handlers._semantic_cache.cache_clear()
+    llm = MessageLLM()
+    pipeline = planning_pipeline(llm)
+
+    try:
+        _, first = run_group(pipeline, ["resource_allocation"], PLANNING_STATE)
+        agent_cache._agent_cache.clear()
+        _, second = run_group(pipeline, ["resource_allocation"], PLANNING_STATE)
+    finally:
+        resource_allocation_handlers._semantic_cache.cache_clear()
+
+    assert len(llm.batches) == 1
+    assert second["resource_allocation"]["resource_plan"] == first["resource_allocation"]["resource_plan"]
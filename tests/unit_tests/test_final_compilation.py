@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+
+from agents.subagents.final_compilation import handlers
+from agents.subagents.final_compilation.handlers import final_compilation_agent
+
+SECTIONS = {
+    "proposal_title": "Booking Platform",
+    "initial_idea": "idea",
+    "refined_scope": "scope",
+    "business_analysis": "analysis",
+    "technical_spec": "spec",
+    "project_plan": "plan",
+    "resource_plan": "resources",
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    handlers._COMPILED_CACHE.clear()
+    yield
+    handlers._COMPILED_CACHE.clear()
+
+
+def reused(caplog):
+    return any("Sections unchanged" in record.message for record in caplog.records)
+
+
+def test_compiles_sections():
+    state = final_compilation_agent(dict(SECTIONS))
+
+    assert state["current_stage"] == "completed"
+    assert state["final_proposal"] == {
+        "title": "Booking Platform",
+        "initial_idea": "idea",
+        "similar_products": "",
+        "refined_scope": "scope",
+        "business_analysis": "analysis",
+        "technical_spec": "spec",
+        "project_plan": "plan",
+        "resource_plan": "resources",
+    }
+
+
+def test_unchanged_sections_reuse_compiled_proposal(caplog):
+    caplog.set_level(logging.DEBUG, logger=handlers.__name__)
+    first = final_compilation_agent(dict(SECTIONS))["final_proposal"]
+    first["title"] = "Edited by the caller"
+
+    second = final_compilation_agent(dict(SECTIONS))
+
+    assert reused(caplog)
+    assert second["current_stage"] == "completed"
+    assert second["final_proposal"]["title"] == "Booking Platform"
+
+
+def test_changed_section_recompiles(caplog):
+    caplog.set_level(logging.DEBUG, logger=handlers.__name__)
+    final_compilation_agent(dict(SECTIONS))
+
+    state = final_compilation_agent({**SECTIONS, "project_plan": "new plan"})
+
+    assert not reused(caplog)
+    assert state["final_proposal"]["project_plan"] == "new plan"
+
+
+def test_missing_section_fails_without_caching():
+    state = final_compilation_agent({**SECTIONS, "resource_plan": "  "})
+
+    assert state["current_stage"] == "failed"
+    assert state["error"] == "Missing required components: resource plan"
+    assert not handlers._COMPILED_CACHE
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(handlers, "_COMPILED_CACHE_MAX_ENTRIES", 2)
+    for plan in ["a", "b", "c"]:
+        final_compilation_agent({**SECTIONS, "project_plan": plan})
+
+    assert len(handlers._COMPILED_CACHE) == 2
@@ -0,0 +1,299 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from agents.services.pdf import pdf_service
+from agents.services.pdf.pdf_service import PDFProcessor
+
+TEXT = "Project requirements for a booking platform. " * 10
+
+
+def make_pdf(page_texts):
+    """Build a minimal PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None]
+    kids = []
+    for text in page_texts:
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 << /Type /Font /Subtype /Type1 "
+            b"/BaseFont /Helvetica >> >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids),
+        len(kids),
+    )
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return pdf
+
+
+class FakeLLM:
+    """Counts summary calls; fails while ``fail`` is set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.runnable = RunnableLambda(self._invoke)
+
+    def _invoke(self, prompt):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return f"summary {self.calls}"
+
+
+@pytest.fixture
+def llm():
+    return FakeLLM()
+
+
+@pytest.fixture
+def processor(monkeypatch, llm):
+    processor = PDFProcessor()
+    processor.llm = llm.runnable
+    monkeypatch.setattr(pdf_service, "_pdfium_page_count", lambda content: 1)
+    monkeypatch.setattr(
+        processor, "extract_text_from_pdf", lambda content, filename: (TEXT, "pdfium", 1)
+    )
+    with PDFProcessor._cache_lock:
+        PDFProcessor._result_cache.clear()
+    yield processor
+    with PDFProcessor._cache_lock:
+        PDFProcessor._result_cache.clear()
+
+
+def test_process_pdf_file_caches_result(processor, llm):
+    first = processor.process_pdf_file(b"%PDF-1", "a.pdf")
+    second = processor.process_pdf_file(b"%PDF-1", "a.pdf")
+
+    assert first == second
+    assert first["content_summary"] == "summary 1"
+    assert llm.calls == 1
+
+
+def test_process_pdf_file_keys_by_filename(processor, llm):
+    processor.process_pdf_file(b"%PDF-1", "a.pdf")
+    result = processor.process_pdf_file(b"%PDF-1", "b.pdf")
+
+    assert result["content_summary"] == "summary 2"
+
+
+def test_process_pdf_file_does_not_cache_fallback_summary(processor, llm):
+    llm.fail = True
+    failed = processor.process_pdf_file(b"%PDF-1", "a.pdf")
+
+    assert failed["success"]
+    assert "AI summarization failed" in failed["content_summary"]
+    assert not PDFProcessor._result_cache
+
+    llm.fail = False
+    retried = processor.process_pdf_file(b"%PDF-1", "a.pdf")
+    assert retried["content_summary"] == "summary 2"
+
+
+def test_process_pdf_file_does_not_cache_extraction_failure(monkeypatch, processor):
+    def fail(content, filename):
+        raise ValueError("broken PDF")
+
+    monkeypatch.setattr(processor, "extract_text_from_pdf", fail)
+    result = processor.process_pdf_file(b"%PDF-1", "a.pdf")
+
+    assert not result["success"]
+    assert result["error"] == "broken PDF"
+    assert not PDFProcessor._result_cache
+
+
+def test_process_pdf_file_shares_inflight_result(monkeypatch, processor, llm):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_extract(content, filename):
+        started.set()
+        release.wait(5)
+        return TEXT, "pdfium", 1
+
+    monkeypatch.setattr(processor, "extract_text_from_pdf", slow_extract)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(processor.process_pdf_file, b"%PDF-1", "a.pdf")
+        started.wait(5)
+        second = executor.submit(processor.process_pdf_file, b"%PDF-1", "a.pdf")
+        release.set()
+
+        assert first.result() == second.result()
+    assert llm.calls == 1
+
+
+def test_extraction_pool_does_not_fork():
+    executor = pdf_service._get_extraction_executor()
+
+    assert executor._mp_context.get_start_method() != "fork"
+    assert executor._max_workers <= pdf_service.EXTRACTION_MAX_WORKERS
+
+
+def test_extract_pages_parallel_keeps_page_order():
+    pages = [f"Page {index} text" for index in range(12)]
+
+    assert pdf_service._extract_pages_parallel(make_pdf(pages), len(pages)) == pages
+
+
+def test_generate_summary_caches_success(processor, llm):
+    assert processor.generate_summary(TEXT, "a.pdf") == ("summary 1", True)
+    assert processor.generate_summary(TEXT, "a.pdf") == ("summary 1", True)
+    assert llm.calls == 1
+
+
+def test_generate_summary_keys_by_filename(processor, llm):
+    processor.generate_summary(TEXT, "a.pdf")
+
+    assert processor.generate_summary(TEXT, "b.pdf") == ("summary 2", True)
+
+
+def test_generate_summary_does_not_cache_failure(processor, llm):
+    llm.fail = True
+    summary, succeeded = processor.generate_summary(TEXT, "a.pdf")
+
+    assert not succeeded
+    assert "AI summarization failed" in summary
+
+    llm.fail = False
+    assert processor.generate_summary(TEXT, "a.pdf") == ("summary 2", True)
+
+
+def test_generate_summary_expires(monkeypatch, processor, llm):
+    now = 1_000_000.0
+    monkeypatch.setattr(pdf_service.time, "time", lambda: now)
+    processor.generate_summary(TEXT, "a.pdf")
+
+    now += pdf_service.SUMMARY_CACHE_DURATION
+    assert processor.generate_summary(TEXT, "a.pdf") == ("summary 2", True)
+
+
+def test_summary_cache_is_bounded(monkeypatch, processor, llm):
+    monkeypatch.setattr(processor, "_summary_cache_size", 2)
+    for filename in ["a.pdf", "b.pdf", "c.pdf"]:
+        processor.generate_summary(TEXT, filename)
+
+    assert len(processor._summary_cache) == 2
+    assert processor.generate_summary(TEXT, "a.pdf") == ("summary 4", True)
+
+
+def test_extract_and_summarize_falls_back_when_pdfium_fails(monkeypatch, processor):
+    def fail(content):
+        raise RuntimeError("pdfium crashed")
+        yield  # pragma: no cover
+
+    monkeypatch.setattr(pdf_service, "iter_page_texts", fail)
+
+    assert processor.extract_and_summarize(b"%PDF-1", "a.pdf", 50) == (
+        TEXT,
+        "pdfium",
+        1,
+        "summary 1",
+        True,
+    )
+
+
+def test_extract_and_summarize_combines_chunk_summaries(monkeypatch, processor, llm):
+    pages = [f"Page {index}: " + TEXT for index in range(45)]
+    monkeypatch.setattr(pdf_service, "iter_page_texts", lambda content: iter(pages))
+
+    text, method, page_count, summary, succeeded = processor.extract_and_summarize(
+        b"%PDF-1", "a.pdf", len(pages)
+    )
+
+    assert (method, page_count, succeeded) == ("pdfium", 45, True)
+    assert text.startswith("Page 0: ")
+    # Three chunks of up to 20 pages, then one combining summary
+    assert (summary, llm.calls) == ("summary 4", 4)
+
+
+class FakePdfium:
+    """Stand-in for pypdfium2 that records overlapping calls into it."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.guard = threading.Lock()
+
+    def call(self, result=None):
+        with self.guard:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.001)
+        with self.guard:
+            self.active -= 1
+        return result
+
+    def PdfDocument(self, content):
+        fake = self
+
+        class Document:
+            def __len__(self):
+                return fake.call(3)
+
+            def __getitem__(self, index):
+                return fake.call(Page())
+
+            def close(self):
+                fake.call()
+
+        class Page:
+            def get_textpage(self):
+                return fake.call(TextPage())
+
+            def close(self):
+                fake.call()
+
+        class TextPage:
+            def get_text_range(self):
+                return fake.call("text")
+
+            def close(self):
+                fake.call()
+
+        return self.call(Document())
+
+
+def test_pdfium_calls_are_serialized(monkeypatch):
+    fake = FakePdfium()
+    monkeypatch.setattr(pdf_service, "pdfium", fake)
+
+    def work(index):
+        if index % 2:
+            return pdf_service._pdfium_page_count(b"%PDF-1")
+        return list(pdf_service.iter_page_texts(b"%PDF-1"))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(work, range(16)))
+
+    assert results == [["text"] * 3, 3] * 8
+    assert fake.max_active == 1
+
+
+def test_concurrent_pdfium_extraction():
+    documents = [[f"Document {doc} page {page}" for page in range(5)] for doc in range(6)]
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(
+            executor.map(lambda pages: list(pdf_service.iter_page_texts(make_pdf(pages))), documents)
+        )
+
+    assert results == documents
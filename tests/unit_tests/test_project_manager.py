@@ -0,0 +1,262 @@
+import orjson
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from agents.llm import get_llm
+from agents.subagents.project_manager import handlers
+from agents.subagents.project_manager.handlers import is_simple_edit
+from agents.subagents.project_manager.schema import ProjectPlan
+
+PLAN = "project_overview: Booking platform\n<<<END_BLOCK>>>"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    handlers._RESPONSE_CACHE.clear()
+    yield
+    handlers._RESPONSE_CACHE.clear()
+
+
+def edit(user_input):
+    return {"project_plan": PLAN, "user_input": user_input}
+
+
+@pytest.mark.parametrize(
+    "user_input",
+    ["Remove the risks section", "please drop the team structure", "Exclude the conclusion"],
+)
+def test_pure_removal_is_simple_edit(user_input):
+    assert is_simple_edit(edit(user_input))
+
+
+@pytest.mark.parametrize(
+    "user_input",
+    [
+        "drop the timeline to 4 weeks",
+        "remove React and add a QA phase",
+        "remove the budget cap",
+        "remove Firebase and use Supabase instead",
+        "update the colours",
+    ],
+)
+def test_other_edits_keep_full_prompt(user_input):
+    assert not is_simple_edit(edit(user_input))
+
+
+def test_removal_without_plan_is_not_simple_edit():
+    assert not is_simple_edit({"user_input": "Remove the risks section"})
+
+
+def test_simple_edit_runs_on_caller_llm(monkeypatch):
+    caller = get_llm(model="caller-model")
+    monkeypatch.delenv("LLM_FAST_MODEL", raising=False)
+
+    _, _, llm, _ = handlers._prepare_project_manager_call(
+        {**edit("Remove the risks section"), "cache_bust": True}, caller
+    )
+
+    assert llm is caller
+
+
+def test_simple_edit_derives_fast_model_from_caller_llm(monkeypatch):
+    caller = get_llm(model="caller-model", streaming=True)
+    monkeypatch.setenv("LLM_FAST_MODEL", "fast-model")
+
+    _, _, llm, _ = handlers._prepare_project_manager_call(
+        {**edit("Remove the risks section"), "cache_bust": True}, caller
+    )
+
+    assert llm.model_name == "fast-model"
+    assert llm.streaming
+    assert caller.model_name == "caller-model"
+
+
+def test_simple_edit_prefers_state_fast_llm():
+    fast = get_llm(model="fast-model")
+    state = {**edit("Remove the risks section"), "cache_bust": True, "llm_fast": fast}
+
+    _, _, llm, _ = handlers._prepare_project_manager_call(state, get_llm(model="caller-model"))
+
+    assert llm is fast
+
+
+def combined_state(**overrides):
+    return {
+        "technical_spec": "Booking platform spec",
+        "budget": "$5,000",
+        "skip_pm_standalone": True,
+        "user_settings": {"rates": {"senior_engineer": 40}},
+        **overrides,
+    }
+
+
+def test_combined_prompt_sends_static_rules_once():
+    system, human = handlers._build_combined_planning_prompt(combined_state()).to_messages()
+
+    assert system.content.count("**GENERAL RULES FOR ALL AGENTS:**") == 1
+    assert system.content.count("As a Resource Manager") == 1
+    assert "NOT HTML, JSON" not in system.content
+    assert "Respond with a single JSON object" in system.content
+    assert "GENERAL RULES" not in human.content
+    assert "As a Resource Manager" not in human.content
+    assert "Booking platform spec" in human.content
+    assert "**RESOURCE ALLOCATION TASK:**" in human.content
+
+
+def test_combined_prompt_keeps_full_plan_prompt_for_removals():
+    state = combined_state(project_plan=PLAN, user_input="Remove the risks section")
+
+    system, human = handlers._build_combined_planning_prompt(state).to_messages()
+
+    assert "As a Project Manager, create a detailed project plan" in system.content
+    assert "Booking platform spec" in human.content
+
+
+def test_combined_planning_parses_json_response():
+    response = orjson.dumps({"plan": "plan: new", "resources": "budget: 100"}).decode()
+
+    state = handlers.combined_planning_agent(
+        combined_state(), llm_instance=FakeListChatModel(responses=[response])
+    )
+
+    assert state["project_plan"] == "plan: new"
+    assert state["resource_plan"] == "budget: 100"
+
+
+def test_combined_planning_falls_back_to_sequential_calls():
+    llm = FakeListChatModel(responses=["not json", "plan: sequential", "budget: 200"])
+
+    state = handlers.combined_planning_agent(
+        combined_state(cache_bust=True), llm_instance=llm
+    )
+
+    assert state["project_plan"] == "plan: sequential"
+    assert state["resource_plan"] == "budget: 200"
+
+
+def fresh_plan_llm_call(user_input=""):
+    state = {"technical_spec": "Booking platform spec", "user_input": user_input, "cache_bust": True}
+    return handlers._prepare_project_manager_call(state, get_llm(model="caller-model", streaming=True))
+
+
+def test_fresh_plan_uses_structured_output_without_streaming():
+    _, prompt_value, llm, _ = fresh_plan_llm_call()
+    system, _ = prompt_value.to_messages()
+
+    assert llm.first.streaming is False
+    assert "STRUCTURED OUTPUT" in system.content
+    assert "TOON FORMAT" not in system.content
+    assert "Respond in TOON" not in system.content
+    assert "ending with <<<END_BLOCK>>>" not in system.content
+
+
+def test_fresh_plan_with_add_request_stays_on_toon():
+    _, prompt_value, llm, _ = fresh_plan_llm_call("Add a QA section")
+    system, _ = prompt_value.to_messages()
+
+    assert llm.streaming is True
+    assert "RESPONSE FORMAT REQUIREMENT - TOON FORMAT" in system.content
+
+
+def test_fresh_plan_falls_back_to_toon_without_structured_output():
+    state = {"technical_spec": "Booking platform spec", "cache_bust": True}
+
+    _, prompt_value, llm, _ = handlers._prepare_project_manager_call(
+        state, FakeListChatModel(responses=["plan: toon"])
+    )
+    system, _ = prompt_value.to_messages()
+
+    assert isinstance(llm, FakeListChatModel)
+    assert "RESPONSE FORMAT REQUIREMENT - TOON FORMAT" in system.content
+
+
+def make_plan():
+    return ProjectPlan.model_validate(
+        {
+            "overview": {
+                "title": "Booking Platform Plan",
+                "total_duration_hours": 20,
+                "total_duration_weeks": 0.5,
+                "timeline_constraint": "2 weeks",
+            },
+            "phases": [
+                {
+                    "phase": "Phase 1 - Setup",
+                    "phase_total_hours": 20,
+                    "tasks": [
+                        {"title": "Environment", "tasks": "Setup repo (2 hrs)", "timeline_hours": 2},
+                        {"title": "Design, review", "tasks": "Wireframes (18 hrs)", "timeline_hours": 18},
+                    ],
+                }
+            ],
+            "timeline_summary": {
+                "total_hours": 20,
+                "total_weeks": 0.5,
+                "breakdown": [{"phase": "Phase 1 Setup", "total_hours": 20}],
+                "milestones": [{"milestone": "Setup done", "hour": 20}],
+            },
+            "team_structure": {
+                "primary_developer": "Full-stack developer",
+                "supporting_roles": "Designer",
+                "ai_tools": "AI assistants",
+            },
+            "conclusion": {"title": "Project Delivery Commitment", "content": "On time."},
+        }
+    )
+
+
+def test_project_plan_to_toon():
+    toon = make_plan().to_toon()
+
+    assert toon.startswith("project_plan:\n  overview:\n    title: Booking Platform Plan\n")
+    assert "    total_duration_weeks: 0.5\n" in toon
+    assert "    tasks[2]{title,tasks,timeline_hours}:\n" in toon
+    assert "      Environment,Setup repo (2 hrs),2\n" in toon
+    assert '      "Design, review",Wireframes (18 hrs),18\n' in toon
+    assert "    milestones[1]{milestone,hour}:\n      Setup done,20\n" in toon
+    assert toon.endswith("    content: On time.\n<<<END_BLOCK>>>")
+
+
+def test_parse_structured_response_renders_toon():
+    plan = make_plan()
+
+    state = handlers.parse_project_manager_response({"technical_spec": "spec"}, plan)
+
+    assert state["project_plan"] == plan.to_toon()
+    assert state["current_stage"] == "resource_allocation"
+
+
+def test_short_previous_content_is_kept():
+    assert handlers._bound_previous_content(PLAN) == PLAN
+
+
+def test_long_previous_content_keeps_head_and_tail():
+    content = "h" * handlers.PREVIOUS_CONTENT_HEAD_CHARS + "x" * 20000 + "t" * handlers.PREVIOUS_CONTENT_TAIL_CHARS
+
+    bounded = handlers._bound_previous_content(content)
+
+    assert bounded.startswith("h" * handlers.PREVIOUS_CONTENT_HEAD_CHARS + "\n... [20000 characters")
+    assert bounded.endswith("\n" + "t" * handlers.PREVIOUS_CONTENT_TAIL_CHARS)
+    assert "x" not in bounded
+
+
+def test_identical_prompt_reuses_cached_plan():
+    llm = FakeListChatModel(responses=["plan: first", "plan: second"])
+    state = {"technical_spec": "Booking platform spec"}
+
+    first = handlers.project_manager_agent(state, llm_instance=llm)
+    second = handlers.project_manager_agent(state, llm_instance=llm)
+
+    assert first["project_plan"] == second["project_plan"] == "plan: first"
+
+
+def test_changed_prompt_or_cache_bust_calls_llm():
+    llm = FakeListChatModel(responses=["plan: first", "plan: second", "plan: third"])
+    state = {"technical_spec": "Booking platform spec"}
+
+    handlers.project_manager_agent(state, llm_instance=llm)
+    changed = handlers.project_manager_agent({**state, "budget": "$5,000"}, llm_instance=llm)
+    busted = handlers.project_manager_agent({**state, "cache_bust": True}, llm_instance=llm)
+
+    assert changed["project_plan"] == "plan: second"
+    assert busted["project_plan"] == "plan: third"
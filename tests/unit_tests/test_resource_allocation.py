@@ -0,0 +1,69 @@
+from agents.subagents.resource_allocation.handlers import _fix_rates_in_html
+
+RATES = {"senior_engineer": 40, "mid_level_engineer": 30, "junior_engineer": 20}
+
+
+def test_fixes_rate_cell_in_role_row():
+    html = "<tr><td>Senior Software Engineer</td><td>$70</td></tr>"
+
+    assert _fix_rates_in_html(html, RATES) == "<tr><td>Senior Software Engineer</td><td>$40/hour</td></tr>"
+
+
+def test_fixes_rate_in_text_and_list_items():
+    html = (
+        "<p>Senior Software Engineer: 1 full-time ($70/hour)</p>"
+        "<ul><li><strong>Mid-level Engineer:</strong> 2 full-time ($55/hour)</li></ul>"
+    )
+
+    assert _fix_rates_in_html(html, RATES) == (
+        "<p>Senior Software Engineer: 1 full-time ($40/hour)</p>"
+        "<ul><li><strong>Mid-level Engineer:</strong> 2 full-time ($30/hour)</li></ul>"
+    )
+
+
+def test_fixes_rate_hr_column_after_hours():
+    html = "<tr><td>Auth</td><td>Senior Software Engineer</td><td>15</td><td>$70</td><td>$1050</td></tr>"
+
+    assert _fix_rates_in_html(html, RATES) == (
+        "<tr><td>Auth</td><td>Senior Software Engineer</td><td>15</td><td>$40/hr</td><td>$1050</td></tr>"
+    )
+
+
+def test_fixes_rates_for_every_display_name_of_a_role():
+    html = (
+        "<tr><td>Senior Engineer</td><td>$70</td></tr>"
+        "<tr><td>Mid level Engineer</td><td>$50/hr</td></tr>"
+        "<ul><li>Junior: part-time ($35/hour)</li></ul>"
+    )
+
+    assert _fix_rates_in_html(html, RATES) == (
+        "<tr><td>Senior Engineer</td><td>$40/hour</td></tr>"
+        "<tr><td>Mid level Engineer</td><td>$30/hour</td></tr>"
+        "<ul><li>Junior: part-time ($20/hour)</li></ul>"
+    )
+
+
+def test_row_patterns_stay_within_one_row():
+    html = (
+        "<tr><td>Senior Software Engineer</td><td>TBD</td></tr>"
+        "<tr><td>Hosting</td><td>$99</td></tr>"
+        "<tr><td>Senior Software Engineer</td><td>TBD</td>"
+        "<tr><td>Licences</td><td>$15</td></tr>"
+    )
+
+    assert _fix_rates_in_html(html, RATES) == html
+
+
+def test_skips_content_without_rates_or_roles():
+    no_amount = "<tr><td>Senior Software Engineer</td><td>TBD</td></tr>"
+    no_role = "<tr><td>Hosting</td><td>$99/hr</td></tr>"
+
+    assert _fix_rates_in_html(no_amount, RATES) is no_amount
+    assert _fix_rates_in_html(no_role, RATES) is no_role
+    assert _fix_rates_in_html(no_role, {}) is no_role
+
+
+def test_skips_roles_without_a_rate():
+    html = "<tr><td>DevOps Engineer</td><td>$70</td></tr>"
+
+    assert _fix_rates_in_html(html, RATES) is html
@@ -0,0 +1,58 @@
+from agents.subagents.resource_allocation.semantic_cache import (
+    SemanticCache,
+    cosine_similarity,
+    embed_text,
+)
+
+PLAN = "Phase 1: setup the backend API and database. Phase 2: build the dashboard."
+
+
+def test_embedding_is_normalised():
+    embedding = embed_text(PLAN)
+
+    assert abs(cosine_similarity(embedding, embedding) - 1.0) < 1e-9
+    assert embed_text("") == {}
+
+
+def test_lookup_hits_near_identical_text():
+    cache = SemanticCache()
+    cache.add("scope", embed_text(PLAN), "resource plan")
+
+    # Punctuation and case edits do not change the embedding
+    edited = PLAN.upper().replace(":", " -")
+    assert cache.lookup("scope", embed_text(edited)) == "resource plan"
+    assert cache.lookup("scope", embed_text("A mobile game with leaderboards")) is None
+
+
+def test_scopes_are_isolated():
+    cache = SemanticCache()
+    cache.add("scope", embed_text(PLAN), "resource plan")
+
+    assert cache.lookup("other scope", embed_text(PLAN)) is None
+
+
+def test_limits_evict_oldest_entries():
+    cache = SemanticCache(max_scopes=2, max_entries_per_scope=1)
+    cache.add("a", embed_text(PLAN), "first")
+    cache.add("a", embed_text(PLAN), "second")
+    cache.add("b", embed_text(PLAN), "b plan")
+    cache.lookup("a", embed_text(PLAN))  # "b" is now the oldest scope
+    cache.add("c", embed_text(PLAN), "c plan")
+
+    assert cache.lookup("a", embed_text(PLAN)) == "second"
+    assert cache.lookup("b", embed_text(PLAN)) is None
+    assert cache.lookup("c", embed_text(PLAN)) == "c plan"
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = tmp_path / "cache.json"
+    SemanticCache(path=str(path)).add("scope", embed_text(PLAN), "resource plan")
+
+    assert SemanticCache(path=str(path)).lookup("scope", embed_text(PLAN)) == "resource plan"
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("not json")
+
+    assert SemanticCache(path=str(path)).lookup("scope", embed_text(PLAN)) is None
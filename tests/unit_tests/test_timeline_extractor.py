@@ -0,0 +1,198 @@
+import pytest
+
+from agents.services.text import timeline_extractor
+from agents.services.text.timeline_extractor import (
+    ConversationText,
+    distribute_timeline_across_phases,
+    estimate_project_complexity,
+    extract_budget_from_conversation,
+    extract_timeline_from_conversation,
+    parse_timeline_to_hours,
+)
+
+
+def history(message):
+    return [
+        {"role": "user", "message": message},
+        # Assistant messages are ignored by every extractor
+        {"role": "assistant", "message": "Sure, in 9 weeks for $99, enterprise ai."},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("We need it within 2 weeks please", ("within 2 weeks", 80, "high")),
+        ("deliver in 10 days", ("in 10 days", 80, "high")),
+        ("I need this done in 3 months", ("in 3 months", 480, "high")),
+        # The last mentioned timeline wins, whatever its unit
+        ("timeline: 1 year, maybe 6 months", ("6 months", 960, "high")),
+        ("2 weeks or 3 months", ("3 months", 480, "high")),
+        ("ASAP!", ("ASAP (2 weeks estimated)", 80, "medium")),
+        ("as soon as possible", ("ASAP (2 weeks estimated)", 80, "medium")),
+        ("no timeline mentioned", ("Standard (3 months)", 480, "low")),
+    ],
+)
+def test_extract_timeline(message, expected):
+    timeline, hours, confidence = expected
+
+    assert extract_timeline_from_conversation(history(message)) == {
+        "timeline": timeline,
+        "timeline_hours": hours,
+        "confidence": confidence,
+    }
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_find_complexity_keywords(monkeypatch, use_automaton):
+    if not use_automaton:
+        monkeypatch.setattr(timeline_extractor, "_KEYWORD_AUTOMATON", None)
+    elif timeline_extractor._KEYWORD_AUTOMATON is None:
+        pytest.skip("pyahocorasick is not installed")
+
+    found = timeline_extractor._find_complexity_keywords(
+        "an email dashboards app with user management and apis"
+    )
+
+    assert found == {
+        ("dashboard", "medium"),
+        ("user management", "medium"),
+        ("api", "medium"),
+    }
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_find_hyphenated_keywords(monkeypatch, use_automaton):
+    if not use_automaton:
+        monkeypatch.setattr(timeline_extractor, "_KEYWORD_AUTOMATON", None)
+    elif timeline_extractor._KEYWORD_AUTOMATON is None:
+        pytest.skip("pyahocorasick is not installed")
+
+    found = timeline_extractor._find_complexity_keywords(
+        "ai-powered, mobile-first and real-time, not realtime or e-mailai"
+    )
+
+    assert found == {("ai", "high"), ("mobile", "medium"), ("real-time", "high")}
+
+
+COMPLEXITY_CASES = [
+    ("build a machine learning dashboard with authentication and api", "medium"),
+    ("simple landing page blog portfolio", "low"),
+    ("enterprise microservices real-time blockchain distributed", "high"),
+    ("mobile app with search, filtering, notifications", "medium"),
+    ("a basic crud form", "low"),
+    ("payment processing and user management", "medium"),
+    # Whole words only: "ai" does not match inside "email"
+    ("email newsletter sign-up", "low"),
+    # Hyphens separate words: "AI-powered" contains "ai"
+    ("AI-powered mobile-first API-driven dashboard", "medium"),
+    ("real-time multi-tenant enterprise platform", "high"),
+]
+
+
+@pytest.mark.parametrize(("message", "expected"), COMPLEXITY_CASES)
+def test_estimate_complexity(message, expected):
+    assert estimate_project_complexity(history(message)) == expected
+
+
+@pytest.mark.parametrize(("message", "expected"), COMPLEXITY_CASES)
+def test_estimate_complexity_without_automaton(monkeypatch, message, expected):
+    monkeypatch.setattr(timeline_extractor, "_KEYWORD_AUTOMATON", None)
+
+    assert estimate_project_complexity(history(message)) == expected
+
+
+@pytest.mark.parametrize(
+    ("timeline", "hours"),
+    [
+        ("3 months", 480),
+        ("2 weeks", 80),
+        ("10 days", 80),
+        ("1 year", 1920),
+        ("in 4 weeks", 160),
+        ("soon", 480),
+    ],
+)
+def test_parse_timeline_to_hours(timeline, hours):
+    assert parse_timeline_to_hours(timeline) == hours
+
+
+@pytest.mark.parametrize("message", ["it is urgent", "URGENT request", "asap please"])
+def test_extract_timeline_urgent_words(message):
+    assert extract_timeline_from_conversation(history(message))["timeline"] == (
+        "ASAP (2 weeks estimated)"
+    )
+
+
+def test_conversation_text_is_shared_by_extractors():
+    conversation = history("simple blog in 2 weeks, budget $3,000")
+    text = ConversationText.from_history(conversation)
+
+    assert text.raw == "simple blog in 2 weeks, budget $3,000"
+    assert extract_timeline_from_conversation(text) == (
+        extract_timeline_from_conversation(conversation)
+    )
+    assert extract_budget_from_conversation(text)["budget"] == "$3,000"
+    assert estimate_project_complexity(text) == "low"
+
+
+@pytest.mark.parametrize(
+    ("message", "budget"),
+    [
+        ("Our budget is $10,000", "$10,000"),
+        ("budget of 5,000", "$5,000"),
+        ("I can spend 2,500", "$2,500"),
+        ("we can afford 7,000", "$7,000"),
+        ("about 10k dollars", "$10k"),
+        ("$10k max", "$10k"),
+        ("$5,000 to $8,000", "$5,000 - $8,000"),
+        ("$5,000 - 10,000", "$5,000 - $10,000"),
+        ("first $3,000, final $4,500", "$4,500"),
+    ],
+)
+def test_extract_budget(message, budget):
+    assert extract_budget_from_conversation(history(message)) == {
+        "budget": budget,
+        "confidence": "high",
+    }
+
+
+def test_extract_budget_without_mention():
+    assert extract_budget_from_conversation(history("no money talk")) == {
+        "budget": "",
+        "confidence": "low",
+    }
+
+
+@pytest.mark.parametrize(
+    ("complexity", "expected"),
+    [
+        (
+            "low",
+            {"setup": 48, "backend": 120, "frontend": 144, "advanced": 72, "testing": 48, "deployment": 48},
+        ),
+        (
+            "medium",
+            {"setup": 72, "backend": 144, "frontend": 120, "advanced": 72, "testing": 48, "deployment": 24},
+        ),
+        (
+            "high",
+            {"setup": 57, "backend": 155, "frontend": 105, "advanced": 96, "testing": 48, "deployment": 19},
+        ),
+        (
+            "unknown",
+            {"setup": 72, "backend": 144, "frontend": 120, "advanced": 72, "testing": 48, "deployment": 24},
+        ),
+    ],
+)
+def test_distribute_timeline_across_phases(complexity, expected):
+    assert distribute_timeline_across_phases(480, complexity) == expected
+
+
+def test_distribute_timeline_assigns_rounding_remainder():
+    phases = distribute_timeline_across_phases(7, "medium")
+
+    assert phases == {"setup": 1, "backend": 4, "frontend": 1, "advanced": 1, "testing": 0, "deployment": 0}
+    # Returned dicts are copies of the cached split
+    phases["setup"] = 100
+    assert distribute_timeline_across_phases(7, "medium")["setup"] == 1
@@ -0,0 +1,22 @@
+import pytest
+
+from agents.utils.utils import clean_agent_response
+
+
+@pytest.mark.parametrize(
+    ("response", "expected"),
+    [
+        ("```toon\ntitle: X\n```", "title: X"),
+        ("```toon\\nname: A\\n  tags[2]: x,y\\n```", "name: A\n  tags[2]: x,y"),
+        ("**Bold** key: value   \n  child: 1", "Bold key: value\n  child: 1"),
+        ("a\\nb\\tc", "a\nb\tc"),
+        ("x\n\n\n\n\ny", "x\n\ny"),
+        ("key:        value", "key:  value"),
+        ("toon\nitems[2]: a,b", "items[2]: a,b"),
+        ("block1\n<<<END_BLOCK>>>\nblock2", "block1\n<<<END_BLOCK>>>\nblock2"),
+        ("path: C:\\\\dir", "path: C:\\dir"),
+        ("", ""),
+    ],
+)
+def test_clean_agent_response(response, expected):
+    assert clean_agent_response(response) == expected
@@ -0,0 +1,42 @@
+import threading
+
+import pytest
+
+from agents.pipeline.worker_pool import AgentWorkerPool
+
+
+def test_submit_returns_results_and_exceptions():
+    with AgentWorkerPool(2) as pool:
+        ok = pool.submit("a", lambda x, y=0: x + y, 1, y=2)
+        failed = pool.submit("b", lambda: 1 / 0)
+
+        assert ok.result() == 3
+        with pytest.raises(ZeroDivisionError):
+            failed.result()
+
+
+def test_same_key_runs_on_same_worker():
+    with AgentWorkerPool(2) as pool:
+        names = [
+            pool.submit("a", lambda: threading.current_thread().name).result()
+            for _ in range(3)
+        ]
+        other = pool.submit("b", lambda: threading.current_thread().name).result()
+
+    assert names == ["agent-a"] * 3
+    assert other == "agent-b"
+
+
+def test_keys_beyond_pool_size_share_workers():
+    with AgentWorkerPool(1) as pool:
+        results = [pool.submit(key, lambda k=key: k).result() for key in "abc"]
+
+    assert results == ["a", "b", "c"]
+
+
+def test_submit_after_shutdown_raises():
+    pool = AgentWorkerPool(1)
+    pool.shutdown()
+
+    with pytest.raises(RuntimeError):
+        pool.submit("a", lambda: None)